@@ -0,0 +1,176 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.tail_stats import tail_var_es
+
+
+@dataclass(frozen=True)
+class AttributionResult:
+    var: float
+    es: float
+    table: pd.DataFrame  # index: ticker; marginal / component / pct / incremental VaR and ES
+
+
+def _finish_table(
+    tickers,
+    w: np.ndarray,
+    mvar: np.ndarray,
+    mes: np.ndarray,
+    cvar: np.ndarray,
+    ces: np.ndarray,
+    ivar: np.ndarray,
+    ies: np.ndarray,
+    var: float,
+    es: float,
+) -> pd.DataFrame:
+    df = pd.DataFrame(
+        {
+            "weight": w,
+            "marginal_VaR": mvar,
+            "component_VaR": cvar,
+            "pct_VaR": cvar / var if var != 0 else np.nan,
+            "incremental_VaR": ivar,
+            "marginal_ES": mes,
+            "component_ES": ces,
+            "pct_ES": ces / es if es != 0 else np.nan,
+            "incremental_ES": ies,
+        },
+        index=pd.Index(tickers, name="ticker"),
+    )
+    return df.sort_values("component_ES", ascending=False)
+
+
+# ============================================================
+# 1. Scenario-based (HS / MC) attribution
+# ============================================================
+
+def scenario_attribution(
+    scenarios: pd.DataFrame,
+    weights: pd.Series,
+    alpha: float = 0.99,
+    var_neighbors: Optional[int] = None,
+    incremental: bool = True,
+) -> AttributionResult:
+    """
+    Euler VaR/ES attribution from an asset-level scenario matrix (S x N).
+    Use the historical return panel for HS or an mc_scenarios_* matrix for MC,
+    i.e. the same matrix that produced the portfolio number.
+
+    ES_i  = -w_i * E[r_i | r_p <= q]   (tail scenarios; sums to ES exactly)
+    VaR_i = -w_i * E[r_i | r_p ~= q]   (average over the +/- var_neighbors order
+                                        statistics around the VaR scenario, rescaled
+                                        so components sum to VaR)
+    Incremental = risk(w) - risk(w without position i), on the same scenarios.
+    """
+    cols = list(scenarios.columns)
+    w = weights.reindex(cols).fillna(0.0).values.astype(np.float64)
+    X = scenarios.values
+    rp = (X @ w.astype(X.dtype, copy=False)).astype(np.float64)
+    n = len(rp)
+
+    # same quantile / tail definition as the portfolio-level estimators
+    var, es = tail_var_es(rp, alpha)
+    tail = rp <= -var
+
+    # ES: average asset P&L over the tail scenarios
+    tail_mean = X[tail].mean(axis=0, dtype=np.float64)
+    mes = -tail_mean
+    ces = w * mes
+
+    # VaR: average asset P&L over scenarios ranked next to the VaR scenario
+    if var_neighbors is None:
+        var_neighbors = max(1, int(np.sqrt(n * (1 - alpha))))
+    k = int(np.floor((n - 1) * (1 - alpha)))
+    lo, hi = max(0, k - var_neighbors), min(n, k + var_neighbors + 1)
+    order = np.argpartition(rp, [lo, hi - 1])
+    band = order[lo:hi]
+    mvar = -X[band].mean(axis=0, dtype=np.float64)
+    cvar = w * mvar
+    if cvar.sum() != 0:
+        scale = var / cvar.sum()
+        cvar = cvar * scale
+        mvar = mvar * scale
+
+    ivar = np.zeros_like(w)
+    ies = np.zeros_like(w)
+    held = np.flatnonzero(w != 0)
+    if incremental and len(held) > 0:
+        # portfolio P&L with each held position removed: (S x held)
+        rp_minus = rp[:, None] - X[:, held].astype(np.float64) * w[held]
+        var_minus, es_minus = tail_var_es(rp_minus, alpha, axis=0)
+        ivar[held] = var - var_minus
+        ies[held] = es - es_minus
+
+    table = _finish_table(cols, w, mvar, mes, cvar, ces, ivar, ies, var, es)
+    return AttributionResult(var=var, es=es, table=table)
+
+
+def hs_attribution(
+    returns: pd.DataFrame,
+    weights: pd.Series,
+    alpha: float = 0.99,
+    var_neighbors: Optional[int] = None,
+) -> AttributionResult:
+    """
+    Historical-simulation attribution: the asset return panel is the scenario matrix.
+    """
+    return scenario_attribution(returns.dropna(how="any"), weights, alpha=alpha, var_neighbors=var_neighbors)
+
+
+# ============================================================
+# 2. Gaussian (closed-form) attribution
+# ============================================================
+
+def gaussian_attribution(
+    returns: pd.DataFrame,
+    weights: pd.Series,
+    alpha: float = 0.99,
+    Sigma: Optional[np.ndarray] = None,
+) -> AttributionResult:
+    """
+    Closed-form Gaussian attribution from Sigma w.
+
+    VaR = -(w'mu + z sigma_p),  dVaR/dw_i = -(mu_i + z (Sigma w)_i / sigma_p)
+    ES  = -(w'mu - sigma_p phi(z)/(1-alpha)),  dES/dw_i = -(mu_i - (Sigma w)_i / sigma_p * phi(z)/(1-alpha))
+
+    Sigma defaults to the sample covariance of `returns` (matches var_parametric_gaussian
+    on the portfolio series); pass e.g. a Ledoit-Wolf estimate to override.
+    """
+    from scipy.stats import norm
+
+    cols = list(returns.columns)
+    r64 = returns.astype(np.float64)
+    w = weights.reindex(cols).fillna(0.0).values
+    mu = r64.mean().values
+    S = r64.cov().values if Sigma is None else np.asarray(Sigma, dtype=np.float64)
+
+    z = norm.ppf(1 - alpha)  # negative
+    k_es = norm.pdf(z) / (1 - alpha)
+
+    Sw = S @ w
+    var_p = float(w @ Sw)
+    sig = np.sqrt(var_p)
+    mu_p = float(w @ mu)
+
+    var = -(mu_p + z * sig)
+    es = -(mu_p - sig * k_es)
+
+    mvar = -(mu + z * Sw / sig)
+    mes = -(mu - Sw / sig * k_es)
+    cvar = w * mvar
+    ces = w * mes
+
+    # removing position i: sigma^2 - 2 w_i (Sigma w)_i + w_i^2 Sigma_ii
+    var_minus = np.clip(var_p - 2.0 * w * Sw + w ** 2 * np.diag(S), 0.0, None)
+    sig_minus = np.sqrt(var_minus)
+    mu_minus = mu_p - w * mu
+    ivar = var - (-(mu_minus + z * sig_minus))
+    ies = es - (-(mu_minus - sig_minus * k_es))
+    ivar[w == 0] = 0.0
+    ies[w == 0] = 0.0
+
+    table = _finish_table(cols, w, mvar, mes, cvar, ces, ivar, ies, float(var), float(es))
+    return AttributionResult(var=float(var), es=float(es), table=table)
@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
-from scipy.stats import chi2
+
+from src.tail_stats import sliding_var_es
 
 
 def compute_exceptions(port_ret: pd.Series, var_series: pd.Series) -> pd.Series:
@@ -20,6 +21,8 @@ def kupiec_pof_test(exceptions: pd.Series, alpha: float) -> dict:
     H0: exception probability = (1-alpha)
     Returns LR statistic and p-value.
     """
+    from scipy.stats import chi2
+
     exc = exceptions.dropna().astype(int)
     n = len(exc)
     x = int(exc.sum())
@@ -91,10 +94,9 @@ def rolling_historical_var(port_ret: pd.Series, alpha: float = 0.99, window: int
     """
     r = port_ret.dropna()
     var = pd.Series(index=r.index, dtype=float)
-
-    for i in range(window, len(r)):
-        sample = r.iloc[i - window:i]  # up to t-1
-        var.iloc[i] = -sample.quantile(1 - alpha)
+    if len(r) > window:
+        # window i covers returns i .. i+window-1, the forecast is for day i+window
+        var.iloc[window:] = sliding_var_es(r.values[:-1], alpha, window, es=False)[0]
 
     var.name = f"VaR_HS_roll_{window}"
     return var
@@ -0,0 +1,240 @@
+from dataclasses import dataclass
+from typing import Literal, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.tail_stats import Alphas, tail_var_es
+
+
+BootstrapMethod = Literal["iid", "stationary", "circular"]
+BOOTSTRAP_METHODS = ("iid", "stationary", "circular")
+BOOTSTRAP_MODELS = ("HS", "Gaussian", "Cornish-Fisher", "FHS")
+
+
+# ============================================================
+# 1. Resample indices (drawn once, shared by every model)
+# ============================================================
+
+def default_block_length(T: int) -> int:
+    """
+    Mean block length T^(1/3) (the usual rate for block bootstraps of smooth statistics).
+    """
+    return max(1, int(round(T ** (1 / 3))))
+
+
+def bootstrap_indices(
+    T: int,
+    n_boot: int = 10_000,
+    method: BootstrapMethod = "iid",
+    block_length: Optional[float] = None,
+    seed: int = 42,
+    chunk: int = 1024,
+) -> np.ndarray:
+    """
+    (n_boot x T) int32 row indices into a length-T sample.
+
+    iid:        independent uniform draws.
+    stationary: Politis-Romano stationary bootstrap; blocks start at uniform positions,
+                have geometric lengths with mean block_length and wrap around the sample.
+    circular:   fixed-length blocks (block_length) at uniform starts, wrapping around.
+
+    Block indices are built without a loop over time: a new-block flag per cell, the
+    position of the last block start by a running maximum, and idx = start + offset mod T.
+    Rows are generated `chunk` at a time from one generator, so memory stays bounded.
+    """
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(f"Unknown bootstrap method {method!r}; choose from {BOOTSTRAP_METHODS}")
+    rng = np.random.default_rng(seed)
+    if method == "iid":
+        return rng.integers(0, T, (n_boot, T), dtype=np.int32)
+
+    L = float(block_length or default_block_length(T))
+    t = np.arange(T)
+    out = np.empty((n_boot, T), dtype=np.int32)
+    for s in range(0, n_boot, chunk):
+        b = min(chunk, n_boot - s)
+        if method == "stationary":
+            new = rng.random((b, T)) < 1.0 / L
+            new[:, 0] = True
+        else:
+            new = np.broadcast_to(t % max(1, int(L)) == 0, (b, T))
+        last = np.maximum.accumulate(np.where(new, t, 0), axis=1)
+        start = rng.integers(0, T, (b, T), dtype=np.int64)
+        out[s:s + b] = (np.take_along_axis(start, last, axis=1) + (t - last)) % T
+    return out
+
+
+# ============================================================
+# 2. Vectorised VaR / ES over a block of resamples
+# ============================================================
+
+def _resample_var_es(
+    x: np.ndarray,
+    z: np.ndarray,
+    sig_today: float,
+    idx: np.ndarray,
+    alphas: list[float],
+    models: list[str],
+) -> np.ndarray:
+    """
+    (B x models x 2 x alphas) VaR / ES for every row of idx: HS and FHS by one row-wise
+    partition (all alphas at once), Gaussian and Cornish-Fisher from per-row moments
+    (same formulas as var_models / rolling_moments).
+    """
+    from scipy.stats import norm
+    from src.rolling_moments import _cf_quantile, _cf_tail_mean
+
+    out = np.empty((len(idx), len(models), 2, len(alphas)))
+    R = x[idx] if {"HS", "Gaussian", "Cornish-Fisher"} & set(models) else None
+
+    if R is not None and ({"Gaussian", "Cornish-Fisher"} & set(models)):
+        n = R.shape[1]
+        mu = R.mean(axis=1)
+        D = R - mu[:, None]
+        D2 = D * D
+        # row-wise dot products: no (B x T) temporaries for the third and fourth powers
+        m2 = D2.mean(axis=1)
+        m3 = np.einsum("ij,ij->i", D2, D) / n
+        m4 = np.einsum("ij,ij->i", D2, D2) / n
+        sd = np.sqrt(m2 * n / (n - 1))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            S = m3 / m2 ** 1.5
+            K = m4 / m2 ** 2 - 3.0
+
+    for m, model in enumerate(models):
+        if model == "HS":
+            out[:, m, 0], out[:, m, 1] = tail_var_es(R, alphas, axis=1)
+        elif model == "FHS":
+            var_z, es_z = tail_var_es(z[idx], alphas, axis=1)
+            out[:, m, 0], out[:, m, 1] = var_z * sig_today, es_z * sig_today
+        else:
+            for k, a in enumerate(alphas):
+                p = 1 - a
+                q = norm.ppf(p)
+                if model == "Gaussian":
+                    out[:, m, 0, k] = -(mu + q * sd)
+                    out[:, m, 1, k] = -(mu - sd * norm.pdf(q) / p)
+                else:
+                    out[:, m, 0, k] = -(mu + _cf_quantile(q, S, K) * sd)
+                    out[:, m, 1, k] = -(mu + _cf_tail_mean(q, p, S, K) * sd)
+    return out
+
+
+# ============================================================
+# 3. Bootstrap driver and confidence intervals
+# ============================================================
+
+@dataclass(frozen=True)
+class BootstrapResult:
+    """
+    Point estimates and bootstrap replicates of VaR / ES per (model, measure, alpha).
+    All models are evaluated on the same resamples, so replicate differences between
+    models are paired.
+    """
+    point: pd.Series          # index (model, measure, alpha)
+    samples: pd.DataFrame     # (n_boot x len(point)), same columns
+    method: str
+    block_length: Optional[float]
+
+    @property
+    def n_boot(self) -> int:
+        return len(self.samples)
+
+    def ci(self, level: float = 0.90) -> pd.DataFrame:
+        """
+        Percentile intervals with bootstrap mean and standard error, one row per
+        (model, measure, alpha).
+        """
+        lo, hi = np.nanquantile(self.samples.values, [(1 - level) / 2, (1 + level) / 2], axis=0)
+        return pd.DataFrame({
+            "point": self.point.values,
+            "boot_mean": np.nanmean(self.samples.values, axis=0),
+            "std_err": np.nanstd(self.samples.values, axis=0, ddof=1),
+            "lo": lo,
+            "hi": hi,
+        }, index=self.point.index)
+
+    def differences(self, measure: str = "VaR", alpha: Optional[float] = None, level: float = 0.90) -> pd.DataFrame:
+        """
+        Paired model differences (row model minus column model) for one measure and alpha:
+        point difference, percentile interval and two-sided bootstrap p-value
+        2 min(P(d <= 0), P(d >= 0)). An interval excluding zero means the two models
+        disagree by more than sampling noise.
+        """
+        alphas = self.point.index.get_level_values("alpha").unique()
+        alpha = alphas[0] if alpha is None else alpha
+        models = list(self.point.index.get_level_values("model").unique())
+        rows = []
+        for i, m1 in enumerate(models):
+            for m2 in models[i + 1:]:
+                d = (self.samples[(m1, measure, alpha)] - self.samples[(m2, measure, alpha)]).values
+                lo, hi = np.nanquantile(d, [(1 - level) / 2, (1 + level) / 2])
+                p = 2 * min(np.nanmean(d <= 0), np.nanmean(d >= 0))
+                rows.append({
+                    "model": m1, "vs": m2,
+                    "difference": self.point[(m1, measure, alpha)] - self.point[(m2, measure, alpha)],
+                    "lo": lo, "hi": hi, "p_value": min(p, 1.0),
+                })
+        cols = ["model", "vs", "difference", "lo", "hi", "p_value"]
+        return pd.DataFrame(rows, columns=cols).set_index(["model", "vs"])
+
+
+def bootstrap_var_es(
+    port_ret: pd.Series,
+    alpha: Alphas = 0.99,
+    models: Sequence[str] = BOOTSTRAP_MODELS,
+    n_boot: int = 10_000,
+    method: BootstrapMethod = "iid",
+    block_length: Optional[float] = None,
+    lam: float = 0.94,
+    seed: int = 42,
+    chunk: Optional[int] = None,
+    max_workers: int = 1,
+) -> BootstrapResult:
+    """
+    Bootstrap distribution of HS, Gaussian, Cornish-Fisher and FHS VaR / ES.
+
+    One (n_boot x T) index matrix is drawn up front (iid, stationary or circular block
+    bootstrap) and every model is evaluated on those rows: R = r[idx] for the
+    return-based models and z[idx] for FHS, where z = r / sigma_EWMA is filtered once on
+    the observed series and rescaled by today's sigma (the filter is held fixed, as in
+    filtered historical simulation). Resamples are processed in row chunks (default
+    ~64 MB of gathered returns each); max_workers > 1 spreads chunks over a process pool.
+    """
+    from src.volatility import ewma_sigma
+
+    unknown = [m for m in models if m not in BOOTSTRAP_MODELS]
+    if unknown:
+        raise ValueError(f"Unknown bootstrap model(s) {unknown}; choose from {BOOTSTRAP_MODELS}")
+    models = list(models)
+    alphas = [float(a) for a in np.atleast_1d(alpha)]
+
+    r = port_ret.dropna()
+    x = r.values.astype(np.float64)
+    T = len(x)
+    sig = ewma_sigma(r, lam=lam).values
+    z = x / sig
+    sig_today = float(sig[-1])
+
+    cols = pd.MultiIndex.from_product([models, ["VaR", "ES"], alphas], names=["model", "measure", "alpha"])
+    point = _resample_var_es(x, z, sig_today, np.arange(T)[None, :], alphas, models)
+    point = pd.Series(point.reshape(-1), index=cols, name="point")
+
+    idx = bootstrap_indices(T, n_boot, method=method, block_length=block_length, seed=seed)
+    chunk = chunk or max(1, int(2 ** 23 // T))
+    blocks = [idx[s:s + chunk] for s in range(0, n_boot, chunk)]
+    args = (x, z, sig_today)
+
+    if max_workers > 1 and len(blocks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=max_workers) as ex:
+            futures = [ex.submit(_resample_var_es, *args, b, alphas, models) for b in blocks]
+            parts = [f.result() for f in futures]
+    else:
+        parts = [_resample_var_es(*args, b, alphas, models) for b in blocks]
+
+    samples = pd.DataFrame(np.concatenate(parts).reshape(n_boot, -1), columns=cols)
+    bl = None if method == "iid" else float(block_length or default_block_length(T))
+    return BootstrapResult(point=point, samples=samples, method=method, block_length=bl)
@@ -0,0 +1,228 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+
+def load_run_config(path: Optional[str] = None) -> dict:
+    """
+    Load a TOML or YAML risk-pack config and merge it over RISK_PACK_DEFAULTS.
+    """
+    from src.config import RISK_PACK_DEFAULTS
+
+    cfg = dict(RISK_PACK_DEFAULTS)
+    if path is None:
+        return cfg
+
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix == ".toml":
+        try:
+            import tomllib
+        except ModuleNotFoundError:  # Python < 3.11
+            import tomli as tomllib
+        with open(p, "rb") as f:
+            user = tomllib.load(f)
+    elif suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ModuleNotFoundError as e:
+            raise RuntimeError("YAML configs need PyYAML: pip install pyyaml") from e
+        with open(p) as f:
+            user = yaml.safe_load(f) or {}
+    else:
+        raise ValueError("config must be a .toml, .yaml or .yml file")
+
+    unknown = set(user) - set(cfg)
+    if unknown:
+        raise ValueError(f"Unknown config keys: {sorted(unknown)}")
+
+    cfg.update(user)
+    return cfg
+
+
+def _write_tables(tables: dict, out_dir: Path) -> list[str]:
+    import pandas as pd
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for fname, df in tables.items():
+        path = out_dir / fname
+        keep_index = not isinstance(df.index, pd.RangeIndex)
+        df.to_csv(path, index=keep_index)
+        written.append(str(path))
+    return written
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    from src.config import RISK_PACK_SECTIONS
+    from src.risk_pack import build_risk_pack_pipeline
+
+    cfg = load_run_config(args.config)
+    if args.out is not None:
+        cfg["out_dir"] = args.out
+
+    sections = list(RISK_PACK_SECTIONS)
+    if args.only:
+        sections = [s.strip() for s in args.only.split(",") if s.strip()]
+        bad = [s for s in sections if s not in RISK_PACK_SECTIONS]
+        if bad:
+            raise SystemExit(f"Unknown section(s) {bad}; choose from {list(RISK_PACK_SECTIONS)}")
+
+    cache_dir = None if args.no_cache else cfg["cache_dir"]
+    prewarm = None
+    if args.prewarm:
+        from src.pipeline import DEFAULT_PREWARM
+
+        prewarm = DEFAULT_PREWARM
+    pipe = build_risk_pack_pipeline(cfg, max_workers=args.jobs, cache_dir=cache_dir,
+                                    executor=args.executor, prewarm=prewarm)
+
+    if prewarm:
+        print(f"Prewarmed {args.jobs} {args.executor} worker(s) in {pipe.start_workers():.2f}s")
+    t0 = time.perf_counter()
+    try:
+        results = pipe.run(sections, force=sections if args.force else ())
+    finally:
+        pipe.shutdown()
+    elapsed = time.perf_counter() - t0
+
+    out_dir = Path(cfg["out_dir"])
+    for section in sections:
+        print(f"\n=== {section} ===")
+        for path in _write_tables(results[section], out_dir):
+            print("Saved:", path)
+
+    if args.store:
+        from src.results_store import ResultsStore
+
+        store = ResultsStore(args.store)
+        run = store.new_run(params=cfg, run_date=args.run_date)
+        n = sum(len(store.write_tables(results[s], run)) for s in sections)
+        print(f"\nAppended {n} tables to {args.store} (run_id={run['run_id']}, run_date={run['run_date']})")
+
+    print(f"\n=== Stage report ({elapsed:.2f}s, jobs={args.jobs}) ===")
+    print(pipe.run_report())
+    return 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    from src.results_store import ResultsStore
+
+    store = ResultsStore(args.store)
+    tables = args.tables.split(",") if args.tables else store.tables()
+    for t in tables:
+        print("Saved:", store.export_csv(t, out_dir=args.out, run_id=args.run_id))
+    return 0
+
+
+def cmd_ingest(args: argparse.Namespace) -> int:
+    from src.ingestion import ingest_prices, make_source
+
+    cfg = load_run_config(args.config)
+    prices, report = ingest_prices(
+        cfg["tickers"], cfg["start"], cfg["end"],
+        source=make_source(args.source),
+        max_workers=args.jobs,
+        retries=args.retries,
+        checkpoint_dir=args.checkpoint_dir,
+        resume=not args.no_resume,
+    )
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    prices.to_csv(out)
+    print("Saved:", out, prices.shape)
+
+    failed = report.tickers[report.tickers["status"] == "failed"]
+    if len(failed):
+        print("\n=== Failed tickers ===")
+        print(failed[["attempts", "error"]])
+    print("\n=== Ingestion report ===")
+    for k, v in report.summary().items():
+        print(f"{k:20s} {v}")
+    return 1 if len(failed) else 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    from src.ingestion import make_source
+    from src.service import PriceLoader, RiskService
+
+    cfg = load_run_config(args.config)
+    loader = PriceLoader(cfg, source=make_source(args.source), end=args.end, garch=not args.no_garch)
+    svc = RiskService(
+        loader, host=args.host, port=args.port, max_batch=args.max_batch, max_wait=args.max_wait_ms / 1e3,
+        reload_every=args.reload_every, reload_at=args.reload_at, load_in_process=True,
+    )
+    print(f"Loading risk state ({len(cfg['tickers'])} tickers, source={args.source}) ...")
+    try:
+        svc.serve_forever(on_ready=lambda: print(
+            f"Serving on {svc.url}  (POST /var, POST /reload, GET /health)", svc.state.summary(), flush=True))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from src.config import RISK_PACK_SECTIONS
+
+    parser = argparse.ArgumentParser(prog="nifty-risk", description="NIFTY50 market risk model")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="compute the daily risk pack in one process")
+    run.add_argument("-c", "--config", default=None, help="TOML/YAML config (dates, alphas, windows, models)")
+    run.add_argument("--only", default=None,
+                     help="comma-separated subset of: " + ",".join(RISK_PACK_SECTIONS))
+    run.add_argument("-j", "--jobs", type=int, default=1, help="parallel workers for independent stages")
+    run.add_argument("--executor", choices=["thread", "process"], default="thread",
+                     help="worker pool for parallel stages")
+    run.add_argument("--prewarm", action="store_true",
+                     help="import the numerical libraries in every worker before the first stage")
+    run.add_argument("-o", "--out", default=None, help="output directory (overrides config out_dir)")
+    run.add_argument("--no-cache", action="store_true", help="do not read or write the artifact cache")
+    run.add_argument("--force", action="store_true", help="recompute the selected sections even if cached")
+    run.add_argument("--store", default=None, help="also append every table to this Parquet results store")
+    run.add_argument("--run-date", default=None, help="run date partition for --store (default: today)")
+    run.set_defaults(func=cmd_run)
+
+    exp = sub.add_parser("export", help="export tables from the Parquet results store to CSV")
+    exp.add_argument("--store", default="outputs/store", help="results store root")
+    exp.add_argument("--tables", default=None, help="comma-separated table names (default: all)")
+    exp.add_argument("--run-id", default=None, help="run to export (default: latest)")
+    exp.add_argument("-o", "--out", default="outputs", help="output directory")
+    exp.set_defaults(func=cmd_export)
+
+    ing = sub.add_parser("ingest", help="fetch prices concurrently with retries and resumable checkpoints")
+    ing.add_argument("-c", "--config", default=None, help="TOML/YAML config (tickers, start, end)")
+    ing.add_argument("--source", default="yfinance", help="yfinance | synthetic | csv:<dir> | http:<base_url>")
+    ing.add_argument("-j", "--jobs", type=int, default=8, help="concurrent requests")
+    ing.add_argument("--retries", type=int, default=3, help="retries per ticker (exponential backoff)")
+    ing.add_argument("--checkpoint-dir", default="data/.ingest", help="per-ticker checkpoints for resuming")
+    ing.add_argument("--no-resume", action="store_true", help="refetch tickers that already have a checkpoint")
+    ing.add_argument("-o", "--out", default="outputs/prices.csv", help="output price CSV")
+    ing.set_defaults(func=cmd_ingest)
+
+    srv = sub.add_parser("serve", help="long-running HTTP/JSON VaR service with in-memory state")
+    srv.add_argument("-c", "--config", default=None, help="TOML/YAML config (tickers, start, windows, MC settings)")
+    srv.add_argument("--source", default="yfinance", help="yfinance | synthetic | csv:<dir> | http:<base_url>")
+    srv.add_argument("--end", default=None, help="last price date (default: today, moving with reloads)")
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8000)
+    srv.add_argument("--max-batch", type=int, default=64, help="portfolios per micro-batch")
+    srv.add_argument("--max-wait-ms", type=float, default=2.0, help="max wait for a micro-batch to fill")
+    srv.add_argument("--reload-at", default=None, help="daily hot reload time HH:MM (e.g. 18:30)")
+    srv.add_argument("--reload-every", type=float, default=None, help="hot reload interval in seconds")
+    srv.add_argument("--no-garch", action="store_true", help="skip the per-asset GARCH fits at load")
+    srv.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
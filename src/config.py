@@ -10,3 +10,53 @@ NIFTY50_TICKERS = [
     "HEROMOTOCO.NS", "APOLLOHOSP.NS", "CIPLA.NS", "DRREDDY.NS", "SBILIFE.NS",
     "UPL.NS", "BAJAJ-AUTO.NS", "LTIM.NS", "SHRIRAMFIN.NS", "TRENT.NS"
 ]
+
+# Sections of the daily risk pack, in output order (kept here so the CLI can list them
+# without importing the numerical modules)
+RISK_PACK_SECTIONS = (
+    "var", "var_ci", "attribution", "backtest", "traffic_light", "es_backtest", "ensemble", "horizon", "stress", "dcc_stress", "stressed_window", "liquidity_es", "im",
+)
+
+# Default settings for the `nifty-risk run` daily risk pack (overridable via TOML/YAML)
+RISK_PACK_DEFAULTS = {
+    "tickers": NIFTY50_TICKERS,
+    "start": "2016-01-01",
+    "end": "2023-12-31",
+    "max_nan_frac": 0.05,
+    "est_window": 504,
+    "weight_cap": 0.05,
+    "alphas": [0.99, 0.975],
+    "models": [
+        "HS", "Gaussian", "Cornish-Fisher", "EWMA", "FHS",
+        "MC-N", "MC-t", "GARCH-N", "GARCH-t",
+    ],
+    "lam": 0.94,
+    "bootstrap_samples": 10_000,
+    "bootstrap_method": "stationary",
+    "bootstrap_level": 0.90,
+    "mc_df": 6.0,
+    "n_sims": 50_000,
+    "seed": 42,
+    "precision": None,  # None -> src.precision.DEFAULT_PRECISION
+    "backtest_window": 250,
+    "traffic_light_obs": 250,
+    "es_alpha": 0.975,
+    "es_backtest_sims": 2000,
+    "ensemble_sims": 10_000,
+    "garch_refit": 20,
+    "horizon_days": 10,
+    "mpor_days": 10,
+    "im_method": "sqrt_time",
+    "im_garch_paths": 200_000,
+    "dcc_pairs": "adjacent",
+    "stressed_alpha": 0.975,
+    "stressed_window": 250,
+    "liquidity_horizons": {},
+    "default_liquidity_horizon": 10,
+    "stress_periods": {
+        "COVID shock": ["2020-02-01", "2020-03-31"],
+        "2021-2022 regime": ["2021-01-01", "2022-12-31"],
+    },
+    "out_dir": "outputs",
+    "cache_dir": "outputs/.cache",
+}
@@ -1,14 +1,14 @@
 import numpy as np
 import pandas as pd
-from sklearn.covariance import LedoitWolf
 
 
 def sample_covariance(returns: pd.DataFrame) -> np.ndarray:
     """
     Sample covariance matrix of returns.
     returns: DataFrame (T x N)
+    Always accumulated in float64, whatever the storage precision of the panel.
     """
-    return returns.cov().values
+    return returns.astype(np.float64).cov().values
 
 
 def ledoit_wolf_covariance(returns: pd.DataFrame) -> np.ndarray:
@@ -16,5 +16,7 @@ def ledoit_wolf_covariance(returns: pd.DataFrame) -> np.ndarray:
     Ledoit–Wolf shrinkage covariance matrix of returns.
     returns: DataFrame (T x N)
     """
-    lw = LedoitWolf().fit(returns.values)
+    from sklearn.covariance import LedoitWolf
+
+    lw = LedoitWolf().fit(np.asarray(returns.values, dtype=np.float64))
     return lw.covariance_
@@ -1,4 +1,3 @@
-import yfinance as yf
 import pandas as pd
 from typing import List
 
@@ -6,6 +5,7 @@ from typing import List
 def download_price_data(tickers: List[str],
                         start: str,
                         end: str) -> pd.DataFrame:
+    import yfinance as yf
 
     data = yf.download(tickers, start=start, end=end, auto_adjust=True)
 
@@ -1,6 +1,5 @@
 import numpy as np
 import pandas as pd
-from statsmodels.stats.diagnostic import acorr_ljungbox
 
 
 def ljung_box(series: pd.Series, lags: int = 10) -> dict:
@@ -8,6 +7,8 @@ def ljung_box(series: pd.Series, lags: int = 10) -> dict:
     Ljung-Box test for autocorrelation up to a chosen lag.
     Returns a small dict (easy to print in reports).
     """
+    from statsmodels.stats.diagnostic import acorr_ljungbox
+
     s = series.dropna()
     out = acorr_ljungbox(s, lags=[lags], return_df=True)
 
@@ -45,14 +46,199 @@ def basic_moments(series: pd.Series) -> dict:
     if len(x) < 5:
         return {"mean": float("nan"), "std": float("nan"), "skew": float("nan"), "excess_kurt": float("nan")}
 
-    m = x.mean()
-    v = ((x - m) ** 2).mean()
+    m = float(x.mean())
+    d = x - m
+    d2 = d * d
+    v = d2.mean()
     s = np.sqrt(v)
 
     if s == 0:
-        return {"mean": float(m), "std": 0.0, "skew": float("nan"), "excess_kurt": float("nan")}
+        return {"mean": m, "std": 0.0, "skew": float("nan"), "excess_kurt": float("nan")}
+
+    skew = (d2 * d).mean() / (s ** 3)
+    ex_kurt = (d2 * d2).mean() / (v ** 2) - 3.0
+
+    return {"mean": m, "std": float(s), "skew": float(skew), "excess_kurt": float(ex_kurt)}
+
+
+# ============================================================
+# Panel diagnostics (all columns at once)
+# ============================================================
+
+def _panel(data) -> pd.DataFrame:
+    if isinstance(data, pd.Series):
+        return data.to_frame(data.name or "series")
+    return data
+
+
+def panel_autocorr(panel: pd.DataFrame, max_lag: int = 20) -> pd.DataFrame:
+    """
+    Sample autocorrelations rho_1..rho_max_lag of every column via one FFT per panel
+    (same estimator as statsmodels acf: lag-k cross-products / (T * c0)).
+    Rows with any NaN are dropped first.
+    """
+    df = _panel(panel).dropna(how="any")
+    X = df.values.astype(np.float64)
+    T = len(X)
+    D = X - X.mean(axis=0)
+
+    n_fft = 1 << int(np.ceil(np.log2(2 * T - 1)))
+    F = np.fft.rfft(D, n=n_fft, axis=0)
+    acov = np.fft.irfft(F * np.conj(F), n=n_fft, axis=0)[: max_lag + 1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rho = acov[1:] / acov[0]
+    return pd.DataFrame(rho, index=pd.RangeIndex(1, max_lag + 1, name="lag"), columns=df.columns)
+
+
+def _ljung_box_from_rho(rho: np.ndarray, T: int, lags: list[int]) -> dict[str, np.ndarray]:
+    from scipy.stats import chi2
+
+    k = np.arange(1, rho.shape[0] + 1)[:, None]
+    terms = np.cumsum(rho ** 2 / (T - k), axis=0) * T * (T + 2)
+    out = {}
+    for L in lags:
+        q = terms[L - 1]
+        out[f"Q_{L}"] = q
+        out[f"p_{L}"] = chi2.sf(q, L)
+    return out
+
+
+def panel_ljung_box(panel: pd.DataFrame, lags: list[int] = (5, 10, 20), squared: bool = False) -> pd.DataFrame:
+    """
+    Ljung-Box Q = T(T+2) sum_k rho_k^2 / (T-k) and chi2 p-values for several lags, every column.
+    squared=True tests the squared series (volatility clustering).
+    """
+    df = _panel(panel).dropna(how="any")
+    if squared:
+        df = df ** 2
+    lags = [int(L) for L in lags]
+    rho = panel_autocorr(df, max(lags)).values
+    return pd.DataFrame(_ljung_box_from_rho(rho, len(df), lags), index=df.columns)
+
+
+def panel_arch_lm(panel: pd.DataFrame, lags: int = 5) -> pd.DataFrame:
+    """
+    Engle ARCH-LM for every column: regress e_t^2 on a constant and e_{t-1}^2..e_{t-lags}^2,
+    LM = (T - lags) R^2 ~ chi2(lags). The normal equations of all columns are solved as one
+    batched system.
+    """
+    from scipy.stats import chi2
+
+    df = _panel(panel).dropna(how="any")
+    E2 = df.values.astype(np.float64) ** 2
+    T, N = E2.shape
+    n = T - lags
+
+    y = E2[lags:]  # (n x N)
+    Z = np.empty((N, n, lags + 1))
+    Z[:, :, 0] = 1.0
+    for j in range(1, lags + 1):
+        Z[:, :, j] = E2[lags - j:T - j].T
+    ZtZ = np.einsum("nti,ntj->nij", Z, Z)
+    Zty = np.einsum("nti,tn->ni", Z, y)
+    beta = np.linalg.solve(ZtZ, Zty[..., None])[..., 0]
 
-    skew = (((x - m) ** 3).mean()) / (s ** 3)
-    ex_kurt = excess_kurtosis(pd.Series(x))
+    resid = y - np.einsum("nti,ni->tn", Z, beta)
+    ss_res = (resid ** 2).sum(axis=0)
+    ss_tot = ((y - y.mean(axis=0)) ** 2).sum(axis=0)
+    lm = n * (1.0 - ss_res / ss_tot)
+    return pd.DataFrame({"lags": lags, "LM": lm, "p_value": chi2.sf(lm, lags)}, index=df.columns)
 
-    return {"mean": float(m), "std": float(s), "skew": float(skew), "excess_kurt": float(ex_kurt)}
+
+def panel_moments(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mean, std, skew (population), excess kurtosis and Jarque-Bera for every column
+    (same definitions as basic_moments), one pass over the centred panel.
+    """
+    from scipy.stats import chi2
+
+    df = _panel(panel)
+    X = df.values.astype(np.float64)
+    n = np.sum(~np.isnan(X), axis=0)
+    m = np.nanmean(X, axis=0)
+    d = X - m
+    d2 = d * d
+    v = np.nanmean(d2, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        skew = np.nanmean(d2 * d, axis=0) / v ** 1.5
+        kurt = np.nanmean(d2 * d2, axis=0) / v ** 2 - 3.0
+    jb = n / 6.0 * (skew ** 2 + kurt ** 2 / 4.0)
+    return pd.DataFrame({
+        "n": n, "mean": m, "std": np.sqrt(v), "skew": skew, "excess_kurt": kurt,
+        "jb_stat": jb, "jb_p_value": chi2.sf(jb, 2),
+    }, index=df.columns)
+
+
+def panel_diagnostics(panel: pd.DataFrame, lags: list[int] = (5, 10, 20), arch_lags: int = 5) -> pd.DataFrame:
+    """
+    One table per column: moments + Jarque-Bera, Ljung-Box on levels and squares, ARCH-LM.
+    Pass e.g. a (T x N) return panel or the standardized residuals of several GARCH fits.
+    """
+    lb = panel_ljung_box(panel, lags)
+    lb2 = panel_ljung_box(panel, lags, squared=True).add_prefix("sq_")
+    arch = panel_arch_lm(panel, arch_lags)[["LM", "p_value"]].add_prefix("arch_")
+    return pd.concat([panel_moments(panel), lb, lb2, arch], axis=1)
+
+
+# ============================================================
+# Rolling panel diagnostics (running sums)
+# ============================================================
+
+def rolling_panel_moments(panel: pd.DataFrame, windows: list[int]) -> dict[str, pd.DataFrame]:
+    """
+    Rolling moments (see rolling_moments) plus rolling Jarque-Bera stat and p-value.
+    """
+    from scipy.stats import chi2
+    from src.rolling_moments import rolling_moments
+
+    mom = rolling_moments(panel, windows)
+    n = np.repeat(np.asarray(windows, dtype=float), mom["skew"].shape[1] // len(windows))
+    jb = n / 6.0 * (mom["skew"] ** 2 + mom["excess_kurt"] ** 2 / 4.0)
+    mom["jb_stat"] = jb
+    mom["jb_p_value"] = pd.DataFrame(chi2.sf(jb.values, 2), index=jb.index, columns=jb.columns)
+    return mom
+
+
+def rolling_ljung_box(panel: pd.DataFrame, window: int = 250, lags: int = 10) -> dict[str, pd.DataFrame]:
+    """
+    Ljung-Box Q(lags) and p-value over every rolling window, all columns.
+
+    Lagged cross-products sum_t x_t x_{t-k} and the partial sums of x needed to demean them
+    are kept as running (cumulative) sums, so each lag costs O(T N) for all windows.
+    Row t covers observations t-window+1 .. t.
+    """
+    from scipy.stats import chi2
+
+    df = _panel(panel).dropna(how="any")
+    X = df.values.astype(np.float64)
+    T, N = X.shape
+    X = X - X[:window].mean(axis=0)  # shift for numerical stability
+
+    def csum(a):
+        c = np.zeros((len(a) + 1,) + a.shape[1:])
+        np.cumsum(a, axis=0, out=c[1:])
+        return c
+
+    c1, c2 = csum(X), csum(X * X)
+    end = np.arange(window, T + 1)           # exclusive window ends
+    start = end - window
+    n = float(window)
+    s1 = c1[end] - c1[start]
+    m = s1 / n
+    denom = c2[end] - c2[start] - n * m * m  # sum (x - m)^2
+
+    q = np.zeros_like(denom)
+    for k in range(1, lags + 1):
+        ck = csum(X[k:] * X[:-k])            # entry j: sum_{t<j} x_{t+k} x_t
+        prod = ck[end - k] - ck[start]       # pairs fully inside the window
+        head = c1[end] - c1[start + k]       # sum of x_t, t >= start+k
+        tail = c1[end - k] - c1[start]       # sum of x_t, t <  end-k
+        num = prod - m * (head + tail) + (n - k) * m * m
+        q += (num / denom) ** 2 / (n - k)
+    q *= n * (n + 2)
+
+    idx = df.index[window - 1:]
+    return {
+        "Q": pd.DataFrame(q, index=idx, columns=df.columns),
+        "p_value": pd.DataFrame(chi2.sf(q, lags), index=idx, columns=df.columns),
+    }
@@ -0,0 +1,214 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.tail_stats import sliding_var_es, tail_quantile
+
+
+ENSEMBLE_MODELS = (
+    "HS", "Gaussian", "Cornish-Fisher", "EWMA", "FHS",
+    "MC-N", "MC-t", "GARCH-N", "GARCH-t",
+)
+
+
+@dataclass(frozen=True)
+class EnsembleResult:
+    forecasts: pd.DataFrame  # date x model, 1-day VaR forecasts (positive)
+    spread: pd.DataFrame     # date x [min, median, max, spread, rel_spread]
+
+
+# ============================================================
+# 1. Shared intermediates
+# ============================================================
+
+def _ewma_sigma(x: np.ndarray, lam: float, init_var: float) -> np.ndarray:
+    """
+    sigma_t^2 = lam sigma_{t-1}^2 + (1-lam) r_{t-1}^2 as a linear filter (same recursion as ewma_variance).
+    """
+    from scipy.signal import lfilter
+
+    v = np.empty(len(x))
+    v[0] = init_var
+    zi = [lam * init_var]
+    v[1:] = lfilter([1 - lam], [1, -lam], x[:-1] ** 2, zi=zi)[0]
+    return np.sqrt(v)
+
+
+def _rolling_cov_factors(X: np.ndarray, window: int, w: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Portfolio mean and L_t' w for the window covariance Sigma_t = L_t L_t' of every window.
+    Window covariances come from cumulative cross-products of the centred panel.
+    """
+    T, N = X.shape
+    C = X - X.mean(axis=0)
+    S1 = np.zeros((T + 1, N))
+    np.cumsum(C, axis=0, out=S1[1:])
+    S2 = np.zeros((T + 1, N, N))
+    np.cumsum(C[:, :, None] * C[:, None, :], axis=0, out=S2[1:])
+
+    n_win = T - window + 1
+    mu_p = np.empty(n_win)
+    V = np.empty((n_win, N))
+    for i in range(n_win):
+        s1 = S1[i + window] - S1[i]
+        m = s1 / window
+        Sig = (S2[i + window] - S2[i] - window * np.outer(m, m)) / (window - 1)
+        try:
+            L = np.linalg.cholesky(Sig)
+        except np.linalg.LinAlgError:
+            vals, vecs = np.linalg.eigh(Sig)
+            L = vecs * np.sqrt(np.clip(vals, 0.0, None))
+        V[i] = L.T @ w
+        mu_p[i] = (m + X.mean(axis=0)) @ w
+    return mu_p, V
+
+
+def _garch_filtered_sigma(
+    x: np.ndarray,
+    index: pd.Index,
+    start: int,
+    dist: str,
+    refit_every: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    One-step GARCH(1,1) sigma forecasts for t = start..T-1, refitting every `refit_every`
+    days on data up to t-1 and filtering forward with the fixed parameters in between.
+    Returns (sigma, nu) per forecast date (nu is NaN for the normal model).
+    """
+    from src.garch_model import fit_garch11
+
+    T = len(x)
+    sig = np.full(T, np.nan)
+    nu = np.full(T, np.nan)
+    r_pct = 100.0 * x
+
+    for t0 in range(start, T, refit_every):
+        res = fit_garch11(pd.Series(x[:t0], index=index[:t0]), dist=dist)
+        omega, a, b = (float(res.params[k]) for k in ("omega", "alpha[1]", "beta[1]"))
+        h = float(np.asarray(res.conditional_volatility)[-1]) ** 2
+        for t in range(t0, min(t0 + refit_every, T)):
+            h = omega + a * r_pct[t - 1] ** 2 + b * h
+            sig[t] = np.sqrt(h) / 100.0
+        nu[t0:t0 + refit_every] = float(res.params.get("nu", np.nan))
+    return sig, nu
+
+
+# ============================================================
+# 2. Ensemble runner
+# ============================================================
+
+def model_spread(forecasts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cross-model dispersion of VaR forecasts per date (model risk through time).
+    """
+    f = forecasts.dropna(how="any")
+    out = pd.DataFrame({
+        "min": f.min(axis=1),
+        "median": f.median(axis=1),
+        "max": f.max(axis=1),
+    })
+    out["spread"] = out["max"] - out["min"]
+    out["rel_spread"] = out["spread"] / out["median"]
+    return out
+
+
+def rolling_model_ensemble(
+    returns: pd.DataFrame,
+    weights: pd.Series,
+    alpha: float = 0.99,
+    window: int = 250,
+    lam: float = 0.94,
+    n_sims: int = 10_000,
+    mc_df: float = 6.0,
+    seed: int = 42,
+    garch_refit: int = 20,
+    models: Optional[list[str]] = None,
+    chunk: int = 256,
+) -> EnsembleResult:
+    """
+    Look-ahead safe 1-day VaR forecasts for all nine models in one pass.
+
+    The forecast for day t only uses returns up to t-1. Shared work:
+      - window moments (Gaussian, Cornish-Fisher, EWMA mean) from rolling_moments
+      - one partial sort per window for HS and FHS
+      - EWMA sigma as a linear filter (initialised on the first window, not the full sample)
+      - rolling covariance factors L_t via cumulative cross-products; MC uses one fixed
+        draw Z (n_sims x N) and chi-square scale for every date, so each date's portfolio
+        scenarios are Z @ (L_t' w) (common random numbers, chunked over dates)
+      - GARCH-N / GARCH-t refitted every `garch_refit` days and filtered forward in between
+    """
+    from scipy.stats import norm, t as student_t
+
+    models = list(ENSEMBLE_MODELS) if models is None else list(models)
+    unknown = set(models) - set(ENSEMBLE_MODELS)
+    if unknown:
+        raise ValueError(f"Unknown models: {sorted(unknown)}")
+
+    cols = list(returns.columns)
+    R = returns[cols].dropna(how="any").astype(np.float64)
+    w = weights.reindex(cols).fillna(0.0).values.astype(np.float64)
+    X = R.values
+    x = X @ w
+    T = len(x)
+    if T <= window:
+        raise ValueError("sample shorter than window")
+
+    idx = R.index[window:]
+    out = pd.DataFrame(index=idx, columns=models, dtype=float)
+    z = norm.ppf(1 - alpha)
+
+    # window moments ending t-1 (compensated running power sums)
+    from src.rolling_moments import rolling_moments
+
+    mom = {k: v.values[window - 1:-1, 0] for k, v in rolling_moments(pd.Series(x), [window]).items()}
+
+    if "HS" in models:
+        out["HS"] = sliding_var_es(x[:-1], alpha, window, es=False)[0]
+
+    if "Gaussian" in models:
+        out["Gaussian"] = -(mom["mean"] + z * mom["std"])
+
+    if "Cornish-Fisher" in models:
+        S, K = mom["skew"], mom["excess_kurt"]
+        z_cf = (
+            z
+            + (1/6) * (z**2 - 1) * S
+            + (1/24) * (z**3 - 3*z) * K
+            - (1/36) * (2*z**3 - 5*z) * (S**2)
+        )
+        out["Cornish-Fisher"] = -(mom["mean"] + z_cf * mom["std"])
+
+    if "EWMA" in models or "FHS" in models:
+        sig = _ewma_sigma(x, lam, init_var=float(np.var(x[:window], ddof=1)))
+        if "EWMA" in models:
+            out["EWMA"] = -(mom["mean"] + z * sig[window:])
+        if "FHS" in models:
+            out["FHS"] = sliding_var_es((x / sig)[:-1], alpha, window, es=False)[0] * sig[window:]
+
+    if "MC-N" in models or "MC-t" in models:
+        rng = np.random.default_rng(seed)
+        Z = rng.standard_normal((n_sims, len(cols)))
+        scale = np.sqrt(mc_df / rng.chisquare(mc_df, size=n_sims))[:, None]
+        mu_p, V = _rolling_cov_factors(X[:-1], window, w)
+
+        def _q(P: np.ndarray) -> np.ndarray:
+            return tail_quantile(P, alpha, axis=0)
+
+        for s in range(0, len(V), chunk):
+            P = Z @ V[s:s + chunk].T  # (n_sims x chunk) portfolio shocks
+            m = mu_p[s:s + chunk]
+            if "MC-N" in models:
+                out.iloc[s:s + chunk, out.columns.get_loc("MC-N")] = -(m + _q(P))
+            if "MC-t" in models:
+                out.iloc[s:s + chunk, out.columns.get_loc("MC-t")] = -(m + _q(P * scale))
+
+    for name, dist in (("GARCH-N", "normal"), ("GARCH-t", "t")):
+        if name not in models:
+            continue
+        g_sig, g_nu = _garch_filtered_sigma(x, R.index, window, dist, garch_refit)
+        q = z if dist == "normal" else student_t.ppf(1 - alpha, df=g_nu[window:])
+        out[name] = -(q * g_sig[window:])
+
+    return EnsembleResult(forecasts=out, spread=model_spread(out))
@@ -0,0 +1,155 @@
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# 1. Test statistics (vectorized over simulated paths)
+# ============================================================
+
+def es_test_statistics(returns: np.ndarray, var: np.ndarray, es: np.ndarray, alpha: float) -> dict[str, np.ndarray]:
+    """
+    Acerbi-Szekely Z1 / Z2 and the exceedance-residual mean for one or many return paths.
+
+    returns: (T,) or (M x T); var / es: (T,) positive forecasts aligned with the columns.
+    With I_t = 1{r_t < -VaR_t}, N = sum I_t:
+      Z1 = sum(r_t I_t / ES_t) / N + 1
+      Z2 = sum(r_t I_t / ES_t) / (T (1-alpha)) + 1
+      ER = mean over exceedances of (L_t - ES_t) / (ES_t - VaR_t),  L_t = -r_t
+    (McNeil-Frey exceedance residuals, scaled by the model's tail width instead of sigma_t
+    so that every model can be tested from its VaR/ES forecasts alone)
+    Z1, Z2 ~ 0 and ER ~ 0 under H0; negative Z / positive ER mean ES is too low.
+    Z1 and ER are NaN on paths without exceedances.
+    """
+    R = np.atleast_2d(returns)
+    T = R.shape[1]
+    exc = R < -var
+    n_exc = exc.sum(axis=1)
+    s = np.where(exc, R / es, 0.0).sum(axis=1)
+    resid = np.where(exc, (-R - es) / (es - var), 0.0).sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z1 = np.where(n_exc > 0, s / n_exc + 1.0, np.nan)
+        er = np.where(n_exc > 0, resid / n_exc, np.nan)
+    z2 = s / (T * (1 - alpha)) + 1.0
+    return {"exceptions": n_exc, "Z1": z1, "Z2": z2, "ER": er}
+
+
+# ============================================================
+# 2. Per-model predictive quantile functions (null samplers)
+# ============================================================
+
+def model_quantile_fn(
+    model: str,
+    port_ret: pd.Series,
+    dates: pd.Index,
+    window: int = 250,
+    lam: float = 0.94,
+    res_gt=None,
+) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Q(U) for the model's 1-day predictive distribution on each date in `dates`
+    (the same one rolling_var_es forecasts from). U is (M x len(dates)) uniforms.
+    """
+    from scipy.stats import norm
+
+    r = port_ret.dropna().astype(np.float64)
+    x = r.values
+    t = r.index.get_indexer(dates)
+    if (t < window).any():
+        raise ValueError("dates must have a full estimation window before them")
+
+    if model == "HS":
+        return lambda U: x[t - window + np.minimum((U * window).astype(np.int64), window - 1)]
+
+    if model == "FHS":
+        from src.volatility import ewma_sigma
+
+        sig = ewma_sigma(r, lam=lam).values
+        z = x / sig
+        return lambda U: sig[t] * z[t - window + np.minimum((U * window).astype(np.int64), window - 1)]
+
+    if model == "Gaussian":
+        mu = r.rolling(window).mean().shift(1).values[t]
+        sig = r.rolling(window).std(ddof=1).shift(1).values[t]
+        return lambda U: mu + sig * norm.ppf(U)
+
+    if model == "GARCH-t":
+        if res_gt is None:
+            raise ValueError("GARCH-t needs a fitted result (res_gt)")
+        from scipy.stats import t as student_t
+        from src.garch_model import garch_conditional_sigma
+
+        sig = garch_conditional_sigma(res_gt).shift(1).reindex(dates).values
+        mean_cls = res_gt.model.__class__.__name__.lower()
+        mu = 0.0 if "zero" in mean_cls else float(res_gt.params.get("mu", 0.0)) / 100.0
+        nu = float(res_gt.params.get("nu", np.nan))
+        return lambda U: mu + sig * student_t.ppf(U, df=nu)
+
+    raise ValueError(f"No quantile function for model {model!r}")
+
+
+# ============================================================
+# 3. Simulated-null ES backtest
+# ============================================================
+
+def es_backtest(
+    port_ret: pd.Series,
+    forecasts: pd.DataFrame,
+    alpha: float = 0.975,
+    window: int = 250,
+    lam: float = 0.94,
+    res_gt=None,
+    n_sims: int = 2000,
+    seed: int = 42,
+    chunk: int = 500,
+    models: Optional[list[str]] = None,
+) -> pd.DataFrame:
+    """
+    Z1 / Z2 / exceedance-residual backtests for every model in a rolling_var_es frame.
+
+    Null distributions are simulated in batch: one (chunk x T) block of uniforms is drawn
+    and pushed through every model's quantile function (common random numbers), so all
+    models are tested on the same draws. p-values are left-tail for Z1/Z2 and
+    right-tail for ER (small p = ES underestimated).
+    """
+    if models is None:
+        models = [c[3:] for c in forecasts.columns if c.startswith("ES_")]
+
+    r = port_ret.dropna().astype(np.float64)
+    setup = {}
+    for m in models:
+        f = pd.concat([r.rename("r"), forecasts[[f"VaR_{m}", f"ES_{m}"]]], axis=1, join="inner").dropna()
+        q_fn = model_quantile_fn(m, r, f.index, window=window, lam=lam, res_gt=res_gt)
+        v, e = f[f"VaR_{m}"].values, f[f"ES_{m}"].values
+        obs = es_test_statistics(f["r"].values, v, e, alpha)
+        setup[m] = (f.index, q_fn, v, e, obs, {"Z1": [], "Z2": [], "ER": []})
+
+    T_max = max(len(s[0]) for s in setup.values())
+    rng = np.random.default_rng(seed)
+    for s0 in range(0, n_sims, chunk):
+        U = rng.random((min(chunk, n_sims - s0), T_max))
+        for m, (idx, q_fn, v, e, _, sims) in setup.items():
+            st = es_test_statistics(q_fn(U[:, -len(idx):]), v, e, alpha)
+            for k in sims:
+                sims[k].append(st[k])
+
+    rows = []
+    for m, (idx, _, _, _, obs, sims) in setup.items():
+        sim = {k: np.concatenate(vs) for k, vs in sims.items()}
+        row = {"model": m, "obs": len(idx), "exceptions": int(obs["exceptions"][0]),
+               "expected": len(idx) * (1 - alpha)}
+        for k in ("Z1", "Z2", "ER"):
+            o = float(obs[k][0])
+            s = sim[k][np.isfinite(sim[k])]
+            row[k] = o
+            if np.isnan(o) or len(s) == 0:
+                row[f"p_{k}"] = np.nan
+            elif k == "ER":
+                row[f"p_{k}"] = float(np.mean(s >= o))
+            else:
+                row[f"p_{k}"] = float(np.mean(s <= o))
+        rows.append(row)
+
+    return pd.DataFrame(rows).set_index("model")
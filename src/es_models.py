@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
-from scipy.stats import norm
+
+from src.tail_stats import series_var_es, sliding_var_es
 
 
 def es_historical(port_ret: pd.Series, alpha: float = 0.99) -> float:
@@ -7,9 +9,7 @@ def es_historical(port_ret: pd.Series, alpha: float = 0.99) -> float:
     Historical ES (positive number).
     ES = -E[ r | r <= q_{1-alpha} ]
     """
-    q = port_ret.quantile(1 - alpha)
-    tail = port_ret[port_ret <= q]
-    return float(-tail.mean())
+    return series_var_es(port_ret, alpha)[1]
 
 
 def es_parametric_gaussian(port_ret: pd.Series, alpha: float = 0.99) -> float:
@@ -17,9 +17,109 @@ def es_parametric_gaussian(port_ret: pd.Series, alpha: float = 0.99) -> float:
     Gaussian ES (positive number).
     ES = -(mu - sigma * phi(z)/ (1-alpha)) where z = Phi^{-1}(1-alpha)
     """
+    from scipy.stats import norm
+
     mu = port_ret.mean()
     sigma = port_ret.std(ddof=1)
     z = norm.ppf(1 - alpha)          # negative
     phi = norm.pdf(z)
     es = -(mu - sigma * (phi / (1 - alpha)))
     return float(es)
+
+
+# ============================================================
+# Rolling VaR / ES forecast series
+# ============================================================
+
+ROLLING_ES_MODELS = ("HS", "Gaussian", "FHS", "GARCH-t")
+
+
+def garch_es_series_t(res, alpha: float = 0.99) -> pd.Series:
+    """
+    GARCH-t ES series on the same quantile scale as garch_var_series_t:
+    ES = -(mu - sigma * f_nu(q) (nu + q^2) / ((nu - 1)(1 - alpha)))
+    """
+    from scipy.stats import t as student_t
+    from src.garch_model import garch_conditional_sigma
+
+    sigma = garch_conditional_sigma(res)
+    mean_cls = res.model.__class__.__name__.lower()
+    mu = 0.0 if "zero" in mean_cls else float(res.params.get("mu", 0.0)) / 100.0
+
+    nu = float(res.params.get("nu", np.nan))
+    q = student_t.ppf(1 - alpha, df=nu)
+    k_es = student_t.pdf(q, df=nu) * (nu + q ** 2) / ((nu - 1) * (1 - alpha))
+
+    es = -(mu - sigma * k_es)
+    es.name = f"ES_GARCHt_{int(alpha * 100)}"
+    return es
+
+
+def rolling_var_es(
+    port_ret: pd.Series,
+    alpha: float = 0.975,
+    window: int = 250,
+    models: tuple = ROLLING_ES_MODELS,
+    lam: float = 0.94,
+    res_gt=None,
+) -> pd.DataFrame:
+    """
+    Look-ahead safe 1-day VaR and ES forecasts, computed together in one sliding pass.
+
+    Forecast for day t uses returns t-window .. t-1:
+      HS        empirical quantile / tail mean of the window
+      Gaussian  rolling mean / std (ddof=1)
+      FHS       window of EWMA-standardized returns, rescaled by sigma_t
+      GARCH-t   fitted conditional sigma (res_gt), shifted one day like the VaR backtest
+
+    Columns: VaR_<model>, ES_<model>; the first `window` rows are NaN.
+    """
+    from scipy.stats import norm
+
+    r = port_ret.dropna().astype(np.float64)
+    x = r.values
+    n = len(x)
+    if n <= window:
+        raise ValueError("series shorter than window")
+
+    out = pd.DataFrame(index=r.index)
+    fc = slice(window, n)  # forecast dates; window i covers x[i:i+window]
+
+    if "HS" in models:
+        var, es = sliding_var_es(x[:-1], alpha, window)
+        out["VaR_HS"] = np.nan
+        out["ES_HS"] = np.nan
+        out.iloc[fc, out.columns.get_loc("VaR_HS")] = var
+        out.iloc[fc, out.columns.get_loc("ES_HS")] = es
+
+    if "Gaussian" in models:
+        z = norm.ppf(1 - alpha)
+        k_es = norm.pdf(z) / (1 - alpha)
+        mu = r.rolling(window).mean().shift(1)
+        sig = r.rolling(window).std(ddof=1).shift(1)
+        out["VaR_Gaussian"] = -(mu + z * sig)
+        out["ES_Gaussian"] = -(mu - sig * k_es)
+
+    if "FHS" in models:
+        from src.volatility import ewma_sigma
+
+        sig = ewma_sigma(r, lam=lam).values  # sigma_t uses returns up to t-1
+        zq, zes = sliding_var_es((x / sig)[:-1], alpha, window)
+        out["VaR_FHS"] = np.nan
+        out["ES_FHS"] = np.nan
+        out.iloc[fc, out.columns.get_loc("VaR_FHS")] = zq * sig[window:]
+        out.iloc[fc, out.columns.get_loc("ES_FHS")] = zes * sig[window:]
+
+    if "GARCH-t" in models:
+        if res_gt is None:
+            raise ValueError("GARCH-t needs a fitted result (res_gt)")
+        from src.garch_model import garch_var_series_t
+
+        v = garch_var_series_t(res_gt, alpha=alpha).shift(1).reindex(r.index)
+        e = garch_es_series_t(res_gt, alpha=alpha).shift(1).reindex(r.index)
+        v.iloc[:window] = np.nan
+        e.iloc[:window] = np.nan
+        out["VaR_GARCH-t"] = v
+        out["ES_GARCH-t"] = e
+
+    return out
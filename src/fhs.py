@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from src.tail_stats import series_var_es
+
 
 def fhs_var_es(
     port_ret: pd.Series,
@@ -22,11 +24,5 @@ def fhs_var_es(
     sig = sig.loc[aligned.index]
 
     z = aligned / sig
-    qz = z.quantile(1 - alpha)
-
-    var_today = -qz * sig.iloc[-1]
-
-    tail = z[z <= qz]
-    es_today = -(tail.mean()) * sig.iloc[-1]
-
-    return float(var_today), float(es_today)
+    var_z, es_z = series_var_es(z, alpha)
+    return float(var_z * sig.iloc[-1]), float(es_z * sig.iloc[-1])
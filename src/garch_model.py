@@ -1,6 +1,9 @@
+from typing import Optional
+
 import numpy as np
 import pandas as pd
-from arch import arch_model
+
+from src.tail_stats import tail_var_es
 
 
 # ============================================================
@@ -13,6 +16,7 @@ def fit_garch11(port_ret: pd.Series, mean: str = "Zero", dist: str = "normal") -
 
     dist: "normal" or "t"
     """
+    from arch import arch_model
 
     r = port_ret.dropna()
     r_pct = 100.0 * r  # arch prefers percentage scale
@@ -125,3 +129,117 @@ def garch_var_series_t(res, alpha: float = 0.99) -> pd.Series:
     var = -(mu + q * sigma)
     var.name = f"VaR_GARCHt_{int(alpha * 100)}"
     return var
+
+
+# ============================================================
+# 8. Multi-step variance forecasts
+# ============================================================
+
+def garch_params(res) -> dict:
+    """
+    Fitted GARCH(1,1) parameters on the arch percentage scale, plus the
+    one-step-ahead variance sigma^2_{T+1} = omega + alpha r_T^2 + beta sigma_T^2.
+    """
+    p = res.params
+    omega, a, b = float(p["omega"]), float(p["alpha[1]"]), float(p["beta[1]"])
+    mu = float(p.get("mu", 0.0))
+    eps_T = float(np.asarray(res.resid)[-1])
+    h_T = float(np.asarray(res.conditional_volatility)[-1]) ** 2
+    return {
+        "omega": omega,
+        "alpha": a,
+        "beta": b,
+        "mu": mu,
+        "nu": float(p.get("nu", np.nan)),
+        "persistence": a + b,
+        "h_next": omega + a * eps_T ** 2 + b * h_T,
+    }
+
+
+def garch_variance_term_structure(res, horizon: int = 10) -> pd.DataFrame:
+    """
+    Analytic GARCH(1,1) variance forecasts for days T+1 .. T+horizon (decimal units):
+
+      E[sigma^2_{T+k}] = sigma_bar^2 + (alpha+beta)^(k-1) (sigma^2_{T+1} - sigma_bar^2)
+      sigma_bar^2      = omega / (1 - alpha - beta)
+
+    Returns are serially uncorrelated, so the k-day variance is the cumulative sum.
+    The sqrt-of-time column scales the one-day forecast, for comparison.
+    """
+    g = garch_params(res)
+    k = np.arange(1, horizon + 1)
+    pers = g["persistence"]
+    if pers < 1:
+        h_bar = g["omega"] / (1 - pers)
+        h_k = h_bar + pers ** (k - 1) * (g["h_next"] - h_bar)
+    else:  # integrated / explosive: no long-run level, iterate the recursion
+        h_k = np.empty(horizon)
+        h_k[0] = g["h_next"]
+        for i in range(1, horizon):
+            h_k[i] = g["omega"] + pers * h_k[i - 1]
+
+    h_k = h_k / 1e4
+    cum = np.cumsum(h_k)
+    out = pd.DataFrame({
+        "sigma_1d": np.sqrt(h_k),
+        "sigma_cum": np.sqrt(cum),
+        "sigma_sqrt_time": np.sqrt(h_k[0] * k),
+    }, index=pd.Index(k, name="day"))
+    out["ratio_to_sqrt_time"] = out["sigma_cum"] / out["sigma_sqrt_time"]
+    return out
+
+
+# ============================================================
+# 9. Horizon Monte Carlo
+# ============================================================
+
+def simulate_garch_paths(
+    res,
+    horizon: int = 10,
+    n_paths: int = 200_000,
+    seed: int = 42,
+    dist: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Cumulative `horizon`-day log returns (decimal) of n_paths simulated GARCH(1,1) paths,
+    started from the one-step-ahead variance of the fitted model.
+
+    The variance recursion h <- omega + alpha eps^2 + beta h runs across all paths at once
+    (one vector per day). dist: "normal" or "t" (standardized Student-t with the fitted nu);
+    defaults to the fitted distribution.
+    """
+    g = garch_params(res)
+    if dist is None:
+        dist = "t" if np.isfinite(g["nu"]) else "normal"
+    if dist == "t" and not np.isfinite(g["nu"]):
+        raise ValueError("t innovations need a fit with dist='t' (no nu in res.params)")
+
+    rng = np.random.default_rng(seed)
+    h = np.full(n_paths, g["h_next"])
+    cum = np.zeros(n_paths)
+    if dist == "t":
+        nu = g["nu"]
+        t_scale = np.sqrt((nu - 2.0) / nu)  # unit-variance t
+
+    for _ in range(horizon):
+        z = rng.standard_t(nu, size=n_paths) * t_scale if dist == "t" else rng.standard_normal(n_paths)
+        eps = np.sqrt(h) * z
+        cum += g["mu"] + eps
+        h = g["omega"] + g["alpha"] * eps * eps + g["beta"] * h
+    return cum / 100.0
+
+
+def garch_horizon_var_es(
+    res,
+    horizon: int = 10,
+    alpha: float = 0.99,
+    n_paths: int = 200_000,
+    seed: int = 42,
+    dist: Optional[str] = None,
+) -> tuple[float, float]:
+    """
+    h-day VaR / ES (positive numbers) from simulated GARCH paths: captures volatility
+    clustering over the horizon (and fat-tailed aggregation) that sqrt-of-time scaling ignores.
+    """
+    paths = simulate_garch_paths(res, horizon=horizon, n_paths=n_paths, seed=seed, dist=dist)
+    return tail_var_es(paths, alpha)
@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from src.tail_stats import sliding_var_es
+
 
 def horizon_log_return(log_ret_1d: pd.Series, horizon_days: int = 10) -> pd.Series:
     r = log_ret_1d.dropna()
@@ -16,8 +18,10 @@ def rolling_hs_var_horizon(
     window: int = 250,
 ) -> pd.Series:
     ret_h = horizon_log_return(log_ret_1d, horizon_days=horizon_days)
-    q = ret_h.rolling(window).quantile(1 - alpha)
-    var_h = -q
+    valid = ret_h.dropna()
+    var_h = pd.Series(np.nan, index=ret_h.index)
+    if len(valid) >= window:
+        var_h.loc[valid.index[window - 1:]] = sliding_var_es(valid.values, alpha, window, es=False)[0]
     var_h.name = f"VaR_HS_{horizon_days}D_{int(alpha*100)}"
     return var_h.shift(1)
 
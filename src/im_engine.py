@@ -0,0 +1,301 @@
+from dataclasses import dataclass
+from typing import Literal, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.precision import Precision, resolve_dtype
+from src.tail_stats import tail_var_es
+
+
+ScenarioMethod = Literal["historical", "filtered", "mc_normal", "mc_t"]
+SCENARIO_METHODS = ("historical", "filtered", "mc_normal", "mc_t")
+
+
+# ============================================================
+# 1. MPOR scenario sets (S x N simple returns per unit notional)
+# ============================================================
+
+def _overlapping_sums(X: np.ndarray, h: int) -> np.ndarray:
+    c = np.vstack([np.zeros((1, X.shape[1])), np.cumsum(X, axis=0)])
+    return c[h:] - c[:-h]
+
+
+def _ewma_sigma_panel(X: np.ndarray, lam: float) -> np.ndarray:
+    """
+    Per-asset ewma_sigma for a (T x N) panel in one lfilter call (same start and timing:
+    row t uses returns up to t-1).
+    """
+    from scipy.signal import lfilter
+
+    v0 = X.var(axis=0, ddof=1)
+    v = np.empty_like(X)
+    v[0] = v0
+    v[1:] = lfilter([1 - lam], [1, -lam], X[:-1] ** 2, axis=0, zi=(lam * v0)[None, :])[0]
+    return np.sqrt(v)
+
+
+def im_scenarios(
+    returns: pd.DataFrame,
+    method: ScenarioMethod = "historical",
+    mpor_days: int = 10,
+    window: Optional[int] = None,
+    lam: float = 0.94,
+    n_sims: int = 10_000,
+    df: float = 6.0,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """
+    (S x N) MPOR-day simple returns exp(r_h) - 1, i.e. the P&L of one unit of notional in
+    each asset, built from the last `window` days of log returns (default: all).
+
+    historical: overlapping mpor_days sums of the observed returns.
+    filtered:   the same after per-asset EWMA filtering (fhs_var_es per asset): z_t = r_t / sigma_t
+                rescaled by today's sigma, so the set carries the current vol regime.
+    mc_normal / mc_t: mc_scenarios_normal / mc_scenarios_student_t on daily returns, mean
+                scaled by mpor_days and deviations by sqrt(mpor_days).
+    """
+    if method not in SCENARIO_METHODS:
+        raise ValueError(f"Unknown scenario method {method!r}; choose from {SCENARIO_METHODS}")
+    R = returns.dropna(how="any")
+    if window is not None:
+        R = R.tail(window)
+    X = R.values.astype(np.float64)
+    h = int(mpor_days)
+
+    if method == "historical":
+        Rh = _overlapping_sums(X, h)
+    elif method == "filtered":
+        sig = _ewma_sigma_panel(X, lam)
+        Rh = _overlapping_sums(X / sig * sig[-1], h)
+    else:
+        from src.monte_carlo import mc_scenarios_normal, mc_scenarios_student_t
+
+        if method == "mc_normal":
+            sim = mc_scenarios_normal(R, n_sims=n_sims, seed=seed).values
+        else:
+            sim = mc_scenarios_student_t(R, df=df, n_sims=n_sims, seed=seed).values
+        mu = X.mean(axis=0)
+        Rh = h * mu + np.sqrt(h) * (sim - mu)
+
+    return pd.DataFrame(np.expm1(Rh), columns=R.columns)
+
+
+# ============================================================
+# 2. Positions
+# ============================================================
+
+def positions_matrix(
+    positions: pd.DataFrame,
+    tickers: list[str],
+    account_col: str = "account",
+    ticker_col: str = "ticker",
+    value_col: str = "notional",
+):
+    """
+    Sparse (accounts x assets) CSR matrix of signed notionals from a long table
+    [account, ticker, notional]. Duplicate rows are summed; tickers outside the scenario
+    universe raise. Returns (matrix, account index).
+    """
+    from scipy import sparse
+
+    col = pd.Index(tickers).get_indexer(positions[ticker_col])
+    if (col < 0).any():
+        unknown = sorted(set(positions[ticker_col][col < 0]))
+        raise ValueError(f"positions in tickers without scenarios: {unknown[:10]}")
+    row, accounts = pd.factorize(positions[account_col], sort=True)
+    X = sparse.csr_matrix(
+        (positions[value_col].values.astype(np.float64), (row, col)),
+        shape=(len(accounts), len(tickers)),
+    )
+    X.sum_duplicates()
+    return X, pd.Index(accounts, name=account_col)
+
+
+# ============================================================
+# 3. Engine
+# ============================================================
+
+@dataclass
+class IMEngine:
+    """
+    CCP-style margin engine over one shared scenario set.
+
+    The (N x S) unit P&L matrix is held once (transposed so that the sparse positions
+    product streams over contiguous scenario rows); each account's MPOR P&L is one row
+    of X @ P', and IM is its VaR or ES at `alpha`, floored at zero.
+    """
+    pnl: np.ndarray          # (N x S) P&L per unit notional
+    tickers: list[str]
+    alpha: float = 0.99
+    measure: Literal["VaR", "ES"] = "ES"
+    method: str = "historical"
+    mpor_days: int = 10
+
+    @classmethod
+    def from_scenarios(
+        cls,
+        scenarios: pd.DataFrame,
+        alpha: float = 0.99,
+        measure: Literal["VaR", "ES"] = "ES",
+        method: str = "custom",
+        mpor_days: int = 10,
+        precision: Optional[Precision] = None,
+    ) -> "IMEngine":
+        """
+        Engine from an (S x N) scenario frame (im_scenarios, or any mc_scenarios_* layout).
+        float32 halves the memory of large MC sets; quantiles and tail means are still
+        returned as float64.
+        """
+        if measure not in ("VaR", "ES"):
+            raise ValueError("measure must be 'VaR' or 'ES'")
+        P = np.ascontiguousarray(scenarios.values.T, dtype=resolve_dtype(precision))
+        return cls(pnl=P, tickers=list(scenarios.columns), alpha=alpha, measure=measure,
+                   method=method, mpor_days=mpor_days)
+
+    @property
+    def n_scenarios(self) -> int:
+        return self.pnl.shape[1]
+
+    def _as_sparse(self, positions):
+        from scipy import sparse
+
+        if isinstance(positions, pd.DataFrame):  # wide (accounts x tickers) frame
+            unknown = sorted(positions.columns.difference(self.tickers).astype(str))
+            if unknown:
+                raise ValueError(f"positions in tickers without scenarios: {unknown[:10]}")
+            X = sparse.csr_matrix(positions.reindex(columns=self.tickers).fillna(0.0).values)
+            return X, positions.index
+        X = sparse.csr_matrix(positions, dtype=np.float64)
+        if X.shape[1] != len(self.tickers):
+            raise ValueError(f"positions have {X.shape[1]} assets, scenarios {len(self.tickers)}")
+        return X, pd.RangeIndex(X.shape[0], name="account")
+
+    def unit_risk(self) -> pd.DataFrame:
+        """
+        Standalone VaR / ES of +1 and -1 unit of notional per asset (the concentration
+        add-on rate base).
+        """
+        v_long, e_long = tail_var_es(self.pnl, self.alpha, axis=1)
+        v_short, e_short = tail_var_es(-self.pnl, self.alpha, axis=1)
+        return pd.DataFrame({"VaR_long": v_long, "ES_long": e_long,
+                             "VaR_short": v_short, "ES_short": e_short}, index=self.tickers)
+
+    def account_pnl(self, positions) -> np.ndarray:
+        """
+        Dense (accounts x S) scenario P&L; for inspection of small books only.
+        """
+        X, _ = self._as_sparse(positions)
+        return np.asarray(X @ self.pnl)
+
+    def margin(
+        self,
+        positions,
+        accounts: Optional[pd.Index] = None,
+        chunk: Optional[int] = None,
+        concentration: Optional["ConcentrationAddOn"] = None,
+        max_workers: int = 1,
+    ) -> pd.DataFrame:
+        """
+        Per-account IM for a sparse (accounts x assets) notional matrix (scipy sparse,
+        positions_matrix output, or a wide DataFrame).
+
+        Accounts are processed in chunks (default ~128 MB of P&L at a time): one
+        sparse x dense product, then one row-wise np.partition for the quantile. Work is
+        O(nnz x S) for the product and O(accounts x S) for the selection, so 100k accounts
+        never materialise more than one chunk of scenario P&L per worker. max_workers > 1
+        runs chunks on threads (the sparse product and np.partition release the GIL).
+        """
+        X, idx = self._as_sparse(positions)
+        if accounts is not None:
+            idx = pd.Index(accounts)
+        A, S = X.shape[0], self.n_scenarios
+        chunk = chunk or max(1, int(2 ** 27 // (8 * S)))
+
+        var = np.empty(A)
+        es = np.empty(A)
+
+        def _block(s: int) -> None:
+            L = np.asarray(X[s:s + chunk] @ self.pnl)
+            var[s:s + chunk], es[s:s + chunk] = tail_var_es(L, self.alpha, axis=1)
+
+        starts = range(0, A, chunk)
+        if max_workers > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=max_workers) as ex:
+                list(ex.map(_block, starts))
+        else:
+            for s in starts:
+                _block(s)
+
+        absX = abs(X)
+        out = pd.DataFrame({
+            "gross": np.asarray(absX.sum(axis=1)).ravel(),
+            "net": np.asarray(X.sum(axis=1)).ravel(),
+            "n_positions": np.diff(X.indptr),
+            "VaR": np.maximum(var, 0.0),
+            "ES": np.maximum(es, 0.0),
+        }, index=idx)
+        out["IM_core"] = out[self.measure]
+        out["concentration_addon"] = 0.0 if concentration is None else concentration.charge(X, self)
+        out["IM"] = out["IM_core"] + out["concentration_addon"]
+        return out
+
+
+# ============================================================
+# 4. Add-ons
+# ============================================================
+
+@dataclass(frozen=True)
+class ConcentrationAddOn:
+    """
+    Charge on position size above a per-asset threshold (e.g. a multiple of average daily
+    traded value, so the position cannot be closed out within the MPOR):
+
+      addon_account = sum_i multiplier x excess_i x unit_risk_i(side),
+      excess_i = max(|x_i| - threshold_i, 0)
+
+    unit_risk is the standalone IM per unit notional of the position's side (long or
+    short) from the same scenario set and measure, so large positions are margined as if
+    the excess were held alone, without diversification.
+    """
+    thresholds: pd.Series           # notional per ticker; missing tickers are never charged
+    multiplier: float = 1.0
+
+    def charge(self, X, engine: IMEngine) -> np.ndarray:
+        thr = self.thresholds.reindex(engine.tickers).fillna(np.inf).values.astype(np.float64)
+        ur = engine.unit_risk()
+        long_rate = ur[f"{engine.measure}_long"].values.clip(min=0.0)
+        short_rate = ur[f"{engine.measure}_short"].values.clip(min=0.0)
+
+        E = X.tocsr(copy=True)
+        j = E.indices
+        rate = np.where(E.data >= 0, long_rate[j], short_rate[j])
+        E.data = self.multiplier * np.maximum(np.abs(E.data) - thr[j], 0.0) * rate
+        return np.asarray(E.sum(axis=1)).ravel()
+
+
+def im_accounts(
+    returns: pd.DataFrame,
+    positions: Union[pd.DataFrame, object],
+    method: ScenarioMethod = "historical",
+    mpor_days: int = 10,
+    alpha: float = 0.99,
+    measure: Literal["VaR", "ES"] = "ES",
+    window: Optional[int] = None,
+    concentration: Optional[ConcentrationAddOn] = None,
+    max_workers: int = 1,
+    **scenario_kwargs,
+) -> pd.DataFrame:
+    """
+    One-call nightly run: scenario set from returns, engine, per-account IM. `positions`
+    is a long [account, ticker, notional] table or a sparse / wide matrix over
+    returns.columns.
+    """
+    scen = im_scenarios(returns, method=method, mpor_days=mpor_days, window=window, **scenario_kwargs)
+    engine = IMEngine.from_scenarios(scen, alpha=alpha, measure=measure, method=method, mpor_days=mpor_days)
+    accounts = None
+    if isinstance(positions, pd.DataFrame) and "account" in positions.columns:
+        positions, accounts = positions_matrix(positions, engine.tickers)
+    return engine.margin(positions, accounts=accounts, concentration=concentration, max_workers=max_workers)
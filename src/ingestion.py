@@ -0,0 +1,355 @@
+import hashlib
+import io
+import os
+import random
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, quote, unquote, urlparse
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# 1. Price sources
+# ============================================================
+
+class PriceSource(ABC):
+    """
+    Interface: fetch one ticker's adjusted close prices as a date-indexed Series.
+    Implementations must be thread-safe; transient failures should raise.
+    """
+
+    name = "source"
+
+    @abstractmethod
+    def fetch(self, ticker: str, start: str, end: str) -> pd.Series:
+        ...
+
+    def cache_key(self) -> str:
+        """
+        Identity of the data this source returns (checkpoints are keyed on it); sources
+        with constructor arguments that change the data must include them.
+        """
+        return self.name
+
+
+class YFinanceSource(PriceSource):
+    name = "yfinance"
+
+    def fetch(self, ticker: str, start: str, end: str) -> pd.Series:
+        import yfinance as yf
+
+        data = yf.download(ticker, start=start, end=end, auto_adjust=True, progress=False, threads=False)
+        if data is None or len(data) == 0:
+            raise RuntimeError(f"no data returned for {ticker}")
+        close = data["Close"]
+        if isinstance(close, pd.DataFrame):
+            close = close.iloc[:, 0]
+        return close.dropna().rename(ticker)
+
+
+class CSVDirectorySource(PriceSource):
+    """
+    One CSV per ticker: {root}/{ticker}.csv with columns Date, Close.
+    """
+
+    name = "csv"
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def cache_key(self) -> str:
+        return f"{self.name}:{self.root.resolve()}"
+
+    def fetch(self, ticker: str, start: str, end: str) -> pd.Series:
+        df = pd.read_csv(self.root / f"{ticker}.csv", index_col=0, parse_dates=True)
+        s = df["Close"].sort_index()
+        return s.loc[start:end].rename(ticker)
+
+
+class HTTPSource(PriceSource):
+    """
+    GET {base_url}/{ticker}?start=...&end=... returning CSV (Date, Close),
+    e.g. a LocalPriceServer.
+    """
+
+    name = "http"
+
+    def __init__(self, base_url: str, timeout: float = 10.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def cache_key(self) -> str:
+        return f"{self.name}:{self.base_url}"
+
+    def fetch(self, ticker: str, start: str, end: str) -> pd.Series:
+        url = f"{self.base_url}/{quote(ticker)}?start={start}&end={end}"
+        with urlopen(url, timeout=self.timeout) as resp:
+            body = resp.read().decode()
+        df = pd.read_csv(io.StringIO(body), index_col=0, parse_dates=True)
+        return df["Close"].rename(ticker)
+
+
+class SyntheticSource(PriceSource):
+    """
+    Deterministic random-walk prices per ticker (offline testing).
+    latency: mean seconds per request (lognormal); fail_rate: probability of a transient error.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, seed: int = 0, latency: float = 0.0, fail_rate: float = 0.0):
+        self.seed = seed
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def cache_key(self) -> str:
+        return f"{self.name}:{self.seed}"  # latency and failures do not change the prices
+
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def fetch(self, ticker: str, start: str, end: str) -> pd.Series:
+        with self._lock:
+            delay = self.latency * self._rng.lognormvariate(0.0, 0.5) if self.latency > 0 else 0.0
+            fail = self._rng.random() < self.fail_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise ConnectionError(f"transient failure fetching {ticker}")
+
+        idx = pd.bdate_range(start, end, inclusive="left")
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()) ^ self.seed)
+        r = rng.standard_t(5, size=len(idx)) * 0.012 + 0.0003
+        return pd.Series(100.0 * np.exp(np.cumsum(r)), index=idx, name=ticker)
+
+
+# ============================================================
+# 2. Local HTTP stand-in
+# ============================================================
+
+class LocalPriceServer:
+    """
+    Serve any PriceSource over HTTP on localhost, for HTTPSource tests:
+
+        with LocalPriceServer(SyntheticSource(latency=0.05)) as srv:
+            prices, report = ingest_prices(tickers, start, end, HTTPSource(srv.url))
+    """
+
+    def __init__(self, source: PriceSource, host: str = "127.0.0.1", port: int = 0):
+        src = source
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                u = urlparse(self.path)
+                q = parse_qs(u.query)
+                ticker = unquote(u.path.strip("/"))
+                try:
+                    s = src.fetch(ticker, q["start"][0], q["end"][0])
+                    body = s.rename("Close").rename_axis("Date").to_csv().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/csv")
+                except Exception as e:
+                    body = str(e).encode()
+                    self.send_response(503)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 128  # many concurrent clients; the default backlog of 5 stalls connects
+
+        self._server = Server((host, port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalPriceServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "LocalPriceServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def make_source(spec: str) -> PriceSource:
+    """
+    Source from a CLI-style spec: "yfinance", "synthetic", "csv:<dir>" or "http:<base_url>".
+    """
+    kind, _, arg = spec.partition(":")
+    if kind == "yfinance":
+        return YFinanceSource()
+    if kind == "synthetic":
+        return SyntheticSource(seed=int(arg) if arg else 0)
+    if kind == "csv":
+        return CSVDirectorySource(arg)
+    if kind == "http":
+        return HTTPSource(arg)
+    raise ValueError(f"Unknown source {spec!r}; use yfinance, synthetic, csv:<dir> or http:<url>")
+
+
+# ============================================================
+# 3. Concurrent, resumable ingestion
+# ============================================================
+
+@dataclass(frozen=True)
+class IngestionReport:
+    tickers: pd.DataFrame  # per ticker: status, attempts, latency_s, rows, from_checkpoint, error
+    wall_seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """
+        Tickers fetched per second of wall time (checkpoint hits excluded).
+        """
+        fetched = int((self.tickers["status"] == "ok").sum() - self.tickers["from_checkpoint"].sum())
+        return fetched / self.wall_seconds if self.wall_seconds > 0 else float("nan")
+
+    def latency_summary(self) -> dict:
+        lat = self.tickers.loc[~self.tickers["from_checkpoint"], "latency_s"].dropna()
+        if len(lat) == 0:
+            return {"p50": np.nan, "p95": np.nan, "p99": np.nan, "max": np.nan}
+        return {
+            "p50": float(lat.quantile(0.50)),
+            "p95": float(lat.quantile(0.95)),
+            "p99": float(lat.quantile(0.99)),
+            "max": float(lat.max()),
+        }
+
+    def summary(self) -> dict:
+        t = self.tickers
+        return {
+            "tickers": len(t),
+            "ok": int((t["status"] == "ok").sum()),
+            "failed": int((t["status"] == "failed").sum()),
+            "from_checkpoint": int(t["from_checkpoint"].sum()),
+            "retries": int((t["attempts"] - 1).clip(lower=0).sum()),
+            "wall_seconds": self.wall_seconds,
+            "tickers_per_second": self.throughput,
+            **{f"latency_{k}": v for k, v in self.latency_summary().items()},
+        }
+
+
+def _checkpoint_dir(root: str, source: PriceSource, start: str, end: str) -> Path:
+    key = hashlib.sha256(f"{source.cache_key()}|{start}|{end}".encode()).hexdigest()[:16]
+    return Path(root) / key
+
+
+def _write_checkpoint(path: Path, s: pd.Series) -> None:
+    tmp = path.with_suffix(".tmp")
+    s.rename("Close").rename_axis("Date").to_csv(tmp)
+    os.replace(tmp, path)  # atomic: a crash never leaves a half-written checkpoint
+
+
+def _fetch_with_retry(source, ticker, start, end, retries, backoff, backoff_max):
+    t0 = time.perf_counter()
+    last = None
+    for attempt in range(1, retries + 2):
+        try:
+            s = source.fetch(ticker, start, end)
+            if s is None or len(s) == 0:
+                raise RuntimeError(f"empty series for {ticker}")
+            return s, attempt, time.perf_counter() - t0, None
+        except Exception as e:
+            last = e
+            if attempt <= retries:
+                delay = min(backoff_max, backoff * 2 ** (attempt - 1))
+                time.sleep(delay * (0.5 + random.random()))  # full jitter around the schedule
+    return None, retries + 1, time.perf_counter() - t0, f"{type(last).__name__}: {last}"
+
+
+def ingest_prices(
+    tickers: list[str],
+    start: str,
+    end: str,
+    source: Optional[PriceSource] = None,
+    max_workers: int = 8,
+    retries: int = 3,
+    backoff: float = 0.5,
+    backoff_max: float = 8.0,
+    checkpoint_dir: Optional[str] = "data/.ingest",
+    resume: bool = True,
+) -> tuple[pd.DataFrame, IngestionReport]:
+    """
+    Fetch tickers concurrently (bounded thread pool) with retries and exponential backoff.
+
+    Each successful ticker is checkpointed to {checkpoint_dir}/<source,start,end hash>/<ticker>.csv,
+    so a failed or interrupted run resumes with only the missing tickers (resume=True).
+    Failed tickers are reported, not raised; the price frame is cleaned like
+    download_price_data (all-NaN columns dropped, then incomplete rows).
+    """
+    source = source or YFinanceSource()
+    ck = None
+    if checkpoint_dir is not None:
+        ck = _checkpoint_dir(checkpoint_dir, source, start, end)
+        ck.mkdir(parents=True, exist_ok=True)
+
+    series: dict[str, pd.Series] = {}
+    rows = {}
+    todo = []
+    for t in dict.fromkeys(tickers):
+        path = ck / f"{t}.csv" if ck is not None else None
+        if resume and path is not None and path.exists():
+            series[t] = pd.read_csv(path, index_col=0, parse_dates=True)["Close"].rename(t)
+            rows[t] = {"status": "ok", "attempts": 0, "latency_s": np.nan,
+                       "rows": len(series[t]), "from_checkpoint": True, "error": None}
+        else:
+            todo.append(t)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as ex:
+        futs = {ex.submit(_fetch_with_retry, source, t, start, end, retries, backoff, backoff_max): t
+                for t in todo}
+        for fut in as_completed(futs):
+            t = futs[fut]
+            s, attempts, latency, err = fut.result()
+            if s is not None:
+                series[t] = s.rename(t)
+                if ck is not None:
+                    _write_checkpoint(ck / f"{t}.csv", series[t])
+            rows[t] = {"status": "ok" if s is not None else "failed", "attempts": attempts,
+                       "latency_s": latency, "rows": 0 if s is None else len(s),
+                       "from_checkpoint": False, "error": err}
+    wall = time.perf_counter() - t0
+
+    report = IngestionReport(
+        tickers=pd.DataFrame.from_dict(rows, orient="index").reindex(list(dict.fromkeys(tickers))),
+        wall_seconds=wall,
+    )
+    if not series:
+        raise RuntimeError("no tickers could be fetched; see report")
+
+    prices = pd.concat([series[t] for t in dict.fromkeys(tickers) if t in series], axis=1).sort_index()
+    prices = prices.dropna(axis=1, how="all").dropna()
+    return prices, report
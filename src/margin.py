@@ -1,3 +1,5 @@
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
@@ -23,21 +25,82 @@ def im_proxy_from_var(var_1d: float, mpor_days: int = 10) -> float:
     return sqrt_time_scale(var_1d, mpor_days)
 
 
+IM_METHODS = ("sqrt_time", "garch_analytic", "garch_mc")
+
+
+def im_proxy_garch(
+    res,
+    mpor_days: int = 10,
+    alpha: float = 0.99,
+    method: str = "garch_mc",
+    n_paths: int = 200_000,
+    seed: int = 42,
+) -> float:
+    """
+    IM proxy as the MPOR-day VaR of a fitted GARCH(1,1) (arch result from fit_garch11).
+
+    garch_analytic: quantile of the fitted innovation distribution times the analytic
+                    cumulative-variance forecast (keeps the volatility term structure,
+                    assumes the horizon sum stays Normal / t).
+    garch_mc:       simulated paths with the variance recursion, so clustering within the
+                    MPOR also fattens the horizon tails.
+    """
+    from src.garch_model import garch_horizon_var_es, garch_params, garch_variance_term_structure
+
+    if method == "garch_mc":
+        return garch_horizon_var_es(res, horizon=mpor_days, alpha=alpha, n_paths=n_paths, seed=seed)[0]
+    if method == "garch_analytic":
+        from scipy.stats import norm, t as student_t
+
+        g = garch_params(res)
+        sigma_h = float(garch_variance_term_structure(res, horizon=mpor_days)["sigma_cum"].iloc[-1])
+        if np.isfinite(g["nu"]):
+            q = student_t.ppf(1 - alpha, df=g["nu"]) * np.sqrt((g["nu"] - 2.0) / g["nu"])
+        else:
+            q = norm.ppf(1 - alpha)
+        return float(-(mpor_days * g["mu"] / 100.0 + q * sigma_h))
+    raise ValueError(f"Unknown GARCH IM method {method!r}")
+
+
 def im_proxy_table(
     var_dict: dict,
     mpor_days: int = 10,
+    method: str = "sqrt_time",
+    garch_fits: Optional[dict] = None,
+    alpha: float = 0.99,
+    n_paths: int = 200_000,
+    seed: int = 42,
 ) -> pd.DataFrame:
     """
     Build a table of IM proxies from a dict of {model_name: VaR_1d}.
+
+    method="sqrt_time" (default) scales every 1-day VaR by sqrt(MPOR).
+    method="garch_analytic" / "garch_mc" replaces the IM of the models in
+    garch_fits ({model_name: arch result}) with their MPOR-day GARCH VaR (see
+    im_proxy_garch); the other models keep sqrt-of-time, and the table gains the
+    method used per row and the sqrt-of-time figure for comparison.
     """
+    if method not in IM_METHODS:
+        raise ValueError(f"Unknown IM method {method!r}; choose from {IM_METHODS}")
+    if method != "sqrt_time" and not garch_fits:
+        raise ValueError(f"method={method!r} needs garch_fits={{model_name: arch result}}")
+
+    col = f"IM_proxy_{mpor_days}d"
     rows = []
     for name, v in var_dict.items():
-        rows.append({
+        row = {
             "model": name,
             "VaR_1d": float(v),
-            f"IM_proxy_{mpor_days}d": im_proxy_from_var(float(v), mpor_days=mpor_days)
-        })
+            col: im_proxy_from_var(float(v), mpor_days=mpor_days)
+        }
+        if method != "sqrt_time":
+            row[f"IM_sqrt_time_{mpor_days}d"] = row[col]
+            row["IM_method"] = "sqrt_time"
+            if name in garch_fits:
+                row[col] = im_proxy_garch(garch_fits[name], mpor_days=mpor_days, alpha=alpha,
+                                          method=method, n_paths=n_paths, seed=seed)
+                row["IM_method"] = method
+        rows.append(row)
 
-    col = f"IM_proxy_{mpor_days}d"
     df = pd.DataFrame(rows).set_index("model").sort_values(col)
     return df
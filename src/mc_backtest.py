@@ -1,6 +1,10 @@
 import numpy as np
 import pandas as pd
-from typing import Literal
+from typing import Literal, Optional
+
+from src.monte_carlo import _draw_scenarios, _portfolio_from_paths, sequential_var_es
+from src.precision import Precision, resolve_dtype
+from src.tail_stats import tail_quantile
 
 
 def rolling_mc_var(
@@ -12,6 +16,7 @@ def rolling_mc_var(
     dist: Literal["normal", "t"] = "normal",
     df: float = 6.0,
     seed: int = 42,
+    precision: Optional[Precision] = None,
 ) -> pd.Series:
     """
     Rolling 1-day-ahead MC VaR forecast series (look-ahead safe).
@@ -20,11 +25,13 @@ def rolling_mc_var(
 
     returns: (T x N) asset return matrix
     weights: Series indexed by ticker
+    precision: storage dtype of the simulated scenarios (moments/quantiles stay float64)
     """
     rng = np.random.default_rng(seed)
+    dtype = resolve_dtype(precision)
 
     cols = list(returns.columns)
-    r = returns[cols].dropna(how="any").copy()
+    r = returns[cols].dropna(how="any").astype(np.float64)
     w = weights.reindex(cols).fillna(0.0).values
 
     var = pd.Series(index=r.index, dtype=float)
@@ -35,25 +42,63 @@ def rolling_mc_var(
         mu = sample.mean().values
         Sigma = sample.cov().values
 
-        if dist == "normal":
-            sim = rng.multivariate_normal(mean=mu, cov=Sigma, size=n_sims)
-        elif dist == "t":
-            # elliptical t: mu + z * sqrt(df/u)
-            z = rng.multivariate_normal(mean=np.zeros(len(cols)), cov=Sigma, size=n_sims)
-            u = rng.chisquare(df, size=n_sims)
-            scale = np.sqrt(df / u).reshape(-1, 1)
-            sim = mu + z * scale
-        else:
-            raise ValueError("dist must be 'normal' or 't'")
-
-        rp = sim @ w
-        q = np.quantile(rp, 1 - alpha)
-        var.iloc[i] = -q  # positive VaR
+        sim = _draw_scenarios(rng, mu, Sigma, n_sims, dist, df, dtype)
+        rp = _portfolio_from_paths(sim, w).astype(np.float64)
+        var.iloc[i] = -tail_quantile(rp, alpha)  # positive VaR
 
     var.name = f"VaR_MC_{dist}_roll_{window}"
     return var
 
 
+def rolling_mc_var_adaptive(
+    returns: pd.DataFrame,
+    weights: pd.Series,
+    alpha: float = 0.99,
+    window: int = 504,
+    dist: Literal["normal", "t"] = "normal",
+    df: float = 6.0,
+    rel_tol: float = 0.02,
+    abs_tol: float = 0.0,
+    measure: Literal["VaR", "ES", "both"] = "VaR",
+    batch_size: int = 5_000,
+    max_sims: int = 200_000,
+    se_method: Literal["order_stat", "batch_means"] = "order_stat",
+    seed: int = 42,
+    precision: Optional[Precision] = None,
+) -> pd.DataFrame:
+    """
+    rolling_mc_var with a precision target instead of a fixed n_sims: on each date the
+    simulation runs in batches until se(VaR) (and/or se(ES)) <= max(rel_tol x estimate,
+    abs_tol) or max_sims is reached (sequential_var_es).
+
+    Returns a DataFrame on the forecast dates (after the first `window` rows) with
+    VaR, ES, VaR_se, ES_se, n_sims (scenarios used on that date) and converged.
+    """
+    rng = np.random.default_rng(seed)
+    dtype = resolve_dtype(precision)
+
+    cols = list(returns.columns)
+    r = returns[cols].dropna(how="any").astype(np.float64)
+    w = weights.reindex(cols).fillna(0.0).values
+
+    rows = []
+    for i in range(window, len(r)):
+        sample = r.iloc[i - window:i]
+        mu = sample.mean().values
+        Sigma = sample.cov().values
+
+        def draw(n: int) -> np.ndarray:
+            return _portfolio_from_paths(_draw_scenarios(rng, mu, Sigma, n, dist, df, dtype), w).astype(np.float64)
+
+        res = sequential_var_es(draw, alpha=alpha, rel_tol=rel_tol, abs_tol=abs_tol, measure=measure,
+                                batch_size=batch_size, max_sims=max_sims, se_method=se_method)
+        rows.append({"VaR": res.var, "ES": res.es, "VaR_se": res.var_se, "ES_se": res.es_se,
+                     "n_sims": res.n_sims, "converged": res.converged})
+
+    return pd.DataFrame(rows, index=r.index[window:],
+                        columns=["VaR", "ES", "VaR_se", "ES_se", "n_sims", "converged"])
+
+
 def backtest_exceptions(port_ret: pd.Series, var_series: pd.Series) -> pd.Series:
     """
     Exception indicator: 1 if r_t < -VaR_t (loss exceeds VaR).
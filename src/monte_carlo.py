@@ -1,10 +1,146 @@
+from dataclasses import dataclass
+from typing import Literal, Optional, Union
+
 import numpy as np
 import pandas as pd
 
+from src.precision import Precision, resolve_dtype
+from src.tail_stats import Alphas, ScenarioMatrix, tail_var_es
+
 
 def _portfolio_from_paths(sim_rets: np.ndarray, weights: np.ndarray) -> np.ndarray:
     # sim_rets: (M x N), weights: (N,)
-    return sim_rets @ weights
+    return sim_rets @ weights.astype(sim_rets.dtype, copy=False)
+
+
+def _cov_factor(Sigma: np.ndarray) -> np.ndarray:
+    """
+    Lower factor L with L @ L.T = Sigma (eigen fallback for semi-definite Sigma).
+    """
+    try:
+        return np.linalg.cholesky(Sigma)
+    except np.linalg.LinAlgError:
+        vals, vecs = np.linalg.eigh(Sigma)
+        return vecs * np.sqrt(np.clip(vals, 0.0, None))
+
+
+def _draw_normal(rng, mean: np.ndarray, Sigma: np.ndarray, n_sims: int, dtype: np.dtype) -> np.ndarray:
+    """
+    (n_sims x N) multivariate Normal draws stored in `dtype`.
+    float64 keeps the original multivariate_normal stream; float32 draws standard
+    normals directly in float32 and colours them with a float64-computed factor.
+    """
+    if dtype == np.float64:
+        return rng.multivariate_normal(mean=mean, cov=Sigma, size=n_sims)
+
+    L = _cov_factor(Sigma).astype(dtype)
+    z = rng.standard_normal((n_sims, len(mean)), dtype=dtype)
+    sim = z @ L.T
+    sim += mean.astype(dtype)
+    return sim
+
+
+def _draw_chisquare(rng, df: float, n_sims: int, dtype: np.dtype) -> np.ndarray:
+    if dtype == np.float64:
+        return rng.chisquare(df, size=n_sims)
+    return 2.0 * rng.standard_gamma(df / 2.0, size=n_sims, dtype=dtype)
+
+
+def _draw_scenarios(
+    rng,
+    mu: np.ndarray,
+    Sigma: np.ndarray,
+    n_sims: int,
+    dist: Literal["normal", "t"],
+    df: float,
+    dtype: np.dtype,
+) -> np.ndarray:
+    """
+    (n_sims x N) draws from the multivariate Normal or the elliptical t (mu + z sqrt(df/u)).
+    """
+    if dist == "normal":
+        return _draw_normal(rng, mu, Sigma, n_sims, dtype)
+    if dist != "t":
+        raise ValueError("dist must be 'normal' or 't'")
+    z = _draw_normal(rng, np.zeros(len(mu)), Sigma, n_sims, dtype)
+    u = _draw_chisquare(rng, df, n_sims, dtype)
+    z *= np.sqrt(df / u).reshape(-1, 1).astype(dtype, copy=False)
+    z += mu.astype(dtype)
+    return z
+
+
+def _tail_var_es(rp: np.ndarray, alpha: float) -> tuple[float, float]:
+    # quantile and tail mean are always accumulated in float64
+    return tail_var_es(np.asarray(rp, dtype=np.float64), alpha)
+
+
+def mc_scenarios_normal(
+    returns: pd.DataFrame,
+    n_sims: int = 50_000,
+    seed: int = 42,
+    precision: Optional[Precision] = None,
+) -> pd.DataFrame:
+    """
+    (n_sims x N) asset-level scenario matrix under multivariate Normal returns.
+    Columns follow returns.columns; re-use it for the portfolio number and attribution.
+    """
+    rng = np.random.default_rng(seed)
+    dtype = resolve_dtype(precision)
+
+    r64 = returns.astype(np.float64)
+    mu = r64.mean().values
+    Sigma = r64.cov().values
+
+    sim = _draw_normal(rng, mu, Sigma, n_sims, dtype)
+    return pd.DataFrame(sim, columns=returns.columns, copy=False)
+
+
+def mc_scenarios_student_t(
+    returns: pd.DataFrame,
+    df: float = 6.0,
+    n_sims: int = 50_000,
+    seed: int = 42,
+    precision: Optional[Precision] = None,
+) -> pd.DataFrame:
+    """
+    (n_sims x N) asset-level scenario matrix under an elliptical Student-t with df degrees of freedom.
+    Keeps correlation via Sigma and introduces fat tails via chi-square scaling.
+    """
+    rng = np.random.default_rng(seed)
+    dtype = resolve_dtype(precision)
+
+    r64 = returns.astype(np.float64)
+    mu = r64.mean().values
+    Sigma = r64.cov().values
+
+    # Step 1: draw z ~ N(0, Sigma)
+    z = _draw_normal(rng, np.zeros(len(mu)), Sigma, n_sims, dtype)
+
+    # Step 2: draw u ~ chi2(df)
+    u = _draw_chisquare(rng, df, n_sims, dtype)
+
+    # Step 3: scale to get t-like heavy tails
+    scale = np.sqrt(df / u).reshape(-1, 1).astype(dtype, copy=False)
+    z *= scale
+    z += mu.astype(dtype)
+    return pd.DataFrame(z, columns=returns.columns, copy=False)
+
+
+def mc_var_es_from_scenarios(
+    scenarios: Union[pd.DataFrame, ScenarioMatrix],
+    weights: pd.Series,
+    alpha: Alphas = 0.99,
+) -> tuple:
+    """
+    Portfolio VaR/ES (positive numbers) from an asset-level scenario matrix.
+    Pass a ScenarioMatrix to reuse the portfolio P&L across calls, and a list of alphas
+    to get arrays from a single partition.
+    """
+    if isinstance(scenarios, ScenarioMatrix):
+        return scenarios.var_es(weights, alpha)
+    w = weights.reindex(scenarios.columns).fillna(0.0).values
+    rp = _portfolio_from_paths(scenarios.values, w)
+    return tail_var_es(np.asarray(rp, dtype=np.float64), alpha)
 
 
 def mc_var_es_normal(
@@ -12,29 +148,17 @@ def mc_var_es_normal(
     weights: pd.Series,
     alpha: float = 0.99,
     n_sims: int = 50_000,
-    seed: int = 42
+    seed: int = 42,
+    precision: Optional[Precision] = None,
 ) -> tuple[float, float]:
     """
     Monte Carlo VaR/ES assuming multivariate Normal returns.
     returns: (T x N) asset return matrix
     weights: Series indexed by ticker
+    precision: storage dtype of the scenario matrix ("float32" halves its memory)
     """
-    rng = np.random.default_rng(seed)
-
-    cols = list(returns.columns)
-    w = weights.reindex(cols).fillna(0.0).values
-
-    mu = returns.mean().values
-    Sigma = returns.cov().values
-
-    sim = rng.multivariate_normal(mean=mu, cov=Sigma, size=n_sims)
-    rp = _portfolio_from_paths(sim, w)
-
-    q = np.quantile(rp, 1 - alpha)
-    var = -q
-    es = -rp[rp <= q].mean()
-
-    return float(var), float(es)
+    sim = mc_scenarios_normal(returns, n_sims=n_sims, seed=seed, precision=precision)
+    return mc_var_es_from_scenarios(sim, weights, alpha=alpha)
 
 
 def mc_var_es_student_t(
@@ -43,34 +167,309 @@ def mc_var_es_student_t(
     df: float = 6.0,
     alpha: float = 0.99,
     n_sims: int = 50_000,
-    seed: int = 42
+    seed: int = 42,
+    precision: Optional[Precision] = None,
 ) -> tuple[float, float]:
     """
     Monte Carlo VaR/ES using an elliptical Student-t construction with df degrees of freedom.
     Keeps correlation via Sigma and introduces fat tails via chi-square scaling.
+    precision: storage dtype of the scenario matrix ("float32" halves its memory)
+    """
+    sim = mc_scenarios_student_t(returns, df=df, n_sims=n_sims, seed=seed, precision=precision)
+    return mc_var_es_from_scenarios(sim, weights, alpha=alpha)
+
+
+# ============================================================
+# Adaptive-precision (sequential) Monte Carlo
+# ============================================================
+
+SE_METHODS = ("order_stat", "batch_means")
+MIN_BATCHES = 5  # batch-means standard errors are only checked from this many batches on
+
+
+@dataclass(frozen=True)
+class AdaptiveMCResult:
+    """
+    Sequential MC estimate: VaR / ES (positive numbers), their standard errors, the
+    number of scenarios actually simulated and whether the target was met within budget.
+    """
+    var: float
+    es: float
+    var_se: float
+    es_se: float
+    n_sims: int
+    converged: bool
+
+
+def tail_standard_errors(
+    rp: np.ndarray,
+    alpha: float = 0.99,
+    method: Literal["order_stat", "batch_means"] = "order_stat",
+    batch_size: int = 10_000,
+) -> tuple[float, float, float, float]:
+    """
+    (VaR, ES, se(VaR), se(ES)) of iid portfolio P&L draws.
+
+    order_stat:  se(VaR) is half the distance between the order statistics at
+                 n p -/+ sqrt(n p (1 - p)) (a one-sigma distribution-free interval for
+                 the quantile); se(ES)^2 = [Var(X | X <= q) + (1 - p)(q - m)^2] / (n p),
+                 m = E[X | X <= q] (asymptotic variance of the tail-mean estimator).
+    batch_means: standard deviation of the estimates over consecutive batches of
+                 batch_size draws, divided by sqrt(number of batches) (needs >= 2 batches).
+    """
+    rp = np.asarray(rp, dtype=np.float64)
+    n = len(rp)
+    var, es = tail_var_es(rp, alpha)
+    if method == "batch_means":
+        nb = n // batch_size
+        if nb < 2:
+            return var, es, np.inf, np.inf
+        bv, be = tail_var_es(rp[:nb * batch_size].reshape(nb, batch_size), alpha, axis=1)
+        return var, es, float(bv.std(ddof=1) / np.sqrt(nb)), float(be.std(ddof=1) / np.sqrt(nb))
+    if method != "order_stat":
+        raise ValueError(f"Unknown se method {method!r}; choose from {SE_METHODS}")
+
+    p = 1 - alpha
+    half = np.sqrt(n * p * (1 - p))
+    lo = int(max(0, np.floor(n * p - half)))
+    hi = int(min(n - 1, np.ceil(n * p + half)))
+    part = np.partition(rp, [lo, hi])
+    var_se = float(part[hi] - part[lo]) / 2.0
+
+    tail = rp[rp <= -var]
+    k = len(tail)
+    es_se = np.inf if k < 2 else float(np.sqrt((tail.var(ddof=1) + (1 - p) * (var - es) ** 2) / (n * p)))
+    return var, es, var_se, es_se
+
+
+def sequential_var_es(
+    draw,
+    alpha: float = 0.99,
+    rel_tol: float = 0.01,
+    abs_tol: float = 0.0,
+    measure: Literal["VaR", "ES", "both"] = "both",
+    batch_size: int = 10_000,
+    max_sims: int = 1_000_000,
+    se_method: Literal["order_stat", "batch_means"] = "order_stat",
+) -> AdaptiveMCResult:
+    """
+    Simulate portfolio P&L in batches until the standard error of the tracked measure(s)
+    is at most max(rel_tol x estimate, abs_tol), or max_sims is reached.
+
+    draw(n) must return n new float64 portfolio P&L draws. After each check the next
+    batch is sized from se ~ 1/sqrt(n), i.e. n_needed = n (se / tol)^2 (plus 10%,
+    at least batch_size), so calm days stop after the first batch and stressed days reach
+    the target in a few steps rather than one check per batch. With batch_means the first
+    check is after MIN_BATCHES batches and every step is a whole number of batches.
+    """
+    if rel_tol <= 0 and abs_tol <= 0:
+        raise ValueError("set rel_tol > 0 or abs_tol > 0")
+    buf = np.empty(max_sims)
+    n = 0
+    step = min(batch_size * (MIN_BATCHES if se_method == "batch_means" else 1), max_sims)
+    while True:
+        buf[n:n + step] = draw(step)
+        n += step
+        var, es, var_se, es_se = tail_standard_errors(buf[:n], alpha, se_method, batch_size)
+        ratios = []
+        if measure in ("VaR", "both"):
+            ratios.append(var_se / max(rel_tol * abs(var), abs_tol))
+        if measure in ("ES", "both"):
+            ratios.append(es_se / max(rel_tol * abs(es), abs_tol))
+        worst = max(ratios)
+        if worst <= 1.0 or n >= max_sims:
+            return AdaptiveMCResult(var=var, es=es, var_se=var_se, es_se=es_se, n_sims=n,
+                                    converged=bool(worst <= 1.0))
+        needed = int(np.ceil(n * worst ** 2 * 1.1)) if np.isfinite(worst) else 2 * n
+        step = int(min(max(needed - n, batch_size), max_sims - n))
+        if se_method == "batch_means":
+            step = min(max(batch_size, step - step % batch_size), max_sims - n)
+
+
+def mc_var_es_adaptive(
+    returns: pd.DataFrame,
+    weights: pd.Series,
+    alpha: float = 0.99,
+    dist: Literal["normal", "t"] = "normal",
+    df: float = 6.0,
+    rel_tol: float = 0.01,
+    abs_tol: float = 0.0,
+    measure: Literal["VaR", "ES", "both"] = "both",
+    batch_size: int = 10_000,
+    max_sims: int = 1_000_000,
+    se_method: Literal["order_stat", "batch_means"] = "order_stat",
+    seed: int = 42,
+    precision: Optional[Precision] = None,
+) -> AdaptiveMCResult:
+    """
+    mc_var_es_normal / mc_var_es_student_t with a precision target instead of a fixed
+    n_sims: scenarios are drawn in batches (same models and moment estimates) until the
+    standard error is within rel_tol of the estimate (or abs_tol), or max_sims is hit.
     """
     rng = np.random.default_rng(seed)
+    dtype = resolve_dtype(precision)
 
-    cols = list(returns.columns)
-    w = weights.reindex(cols).fillna(0.0).values
+    r64 = returns.astype(np.float64)
+    mu = r64.mean().values
+    Sigma = r64.cov().values
+    w = weights.reindex(returns.columns).fillna(0.0).values
 
-    mu = returns.mean().values
-    Sigma = returns.cov().values
+    def draw(n: int) -> np.ndarray:
+        sim = _draw_scenarios(rng, mu, Sigma, n, dist, df, dtype)
+        return _portfolio_from_paths(sim, w).astype(np.float64)
 
-    # Step 1: draw z ~ N(0, Sigma)
-    z = rng.multivariate_normal(mean=np.zeros(len(cols)), cov=Sigma, size=n_sims)
+    return sequential_var_es(draw, alpha=alpha, rel_tol=rel_tol, abs_tol=abs_tol, measure=measure,
+                             batch_size=batch_size, max_sims=max_sims, se_method=se_method)
 
-    # Step 2: draw u ~ chi2(df)
-    u = rng.chisquare(df, size=n_sims)
 
-    # Step 3: scale to get t-like heavy tails
-    scale = np.sqrt(df / u).reshape(-1, 1)
-    sim = mu + z * scale
+# ============================================================
+# Importance sampling for far-tail VaR / ES
+# ============================================================
+
+@dataclass(frozen=True)
+class ISParams:
+    """
+    Sampling-measure change for one portfolio: the Normal factor is shifted by `shift`
+    standard deviations along the portfolio direction Sigma w / sigma_p (negative = toward
+    losses) and, for the t, the chi-square mixing variable is scaled by chi2_scale < 1
+    (more small u, i.e. more large sqrt(df / u) multipliers).
+    """
+    shift: float
+    chi2_scale: float = 1.0
+
+
+def is_parameters(
+    alpha: float = 0.999,
+    dist: Literal["normal", "t"] = "normal",
+    df: float = 6.0,
+    n_pilot: int = 20_000,
+    n_iter: int = 10,
+    seed: int = 0,
+) -> ISParams:
+    """
+    Variance-reducing parameters for the loss event at level alpha.
+
+    The portfolio P&L is mu_p + sigma_p Y with Y = S (Normal) or Y = S sqrt(df / U)
+    (elliptical t), S ~ N(0, 1), U ~ chi2(df), so the tilt only involves (S, U).
+    Normal: the shift is the conditional tail mean E[S | S <= z_p] = -phi(z_p) / p.
+    t: cross-entropy on scalar pilot draws of (S, U) for the event Y <= t_df^-1(p):
+    shift = weighted tail mean of S, chi2_scale = weighted tail mean of U / df, with
+    the level lowered in stages (10% of the pilot) until it reaches the target.
+    """
+    from scipy.stats import norm, t as student_t
+
+    p = 1 - alpha
+    if dist == "normal":
+        return ISParams(shift=float(-norm.pdf(norm.ppf(p)) / p))
+    if dist != "t":
+        raise ValueError("dist must be 'normal' or 't'")
+
+    rng = np.random.default_rng(seed)
+    target = student_t.ppf(p, df)
+    shift, scale = 0.0, 1.0
+    for _ in range(n_iter):
+        S = rng.standard_normal(n_pilot) + shift
+        U = scale * rng.chisquare(df, n_pilot)
+        Y = S * np.sqrt(df / U)
+        log_lr = -shift * S + 0.5 * shift ** 2 + 0.5 * df * np.log(scale) + 0.5 * U * (1 / scale - 1)
+        level = max(target, np.quantile(Y, 0.1))
+        hit = Y <= level
+        W = np.exp(log_lr[hit])
+        shift = float(np.sum(W * S[hit]) / W.sum())
+        scale = float(np.sum(W * U[hit]) / (df * W.sum()))
+        if level == target:
+            break
+    return ISParams(shift=shift, chi2_scale=min(scale, 1.0))
+
+
+def mc_scenarios_is(
+    returns: pd.DataFrame,
+    weights: pd.Series,
+    alpha: float = 0.999,
+    dist: Literal["normal", "t"] = "normal",
+    df: float = 6.0,
+    n_sims: int = 10_000,
+    seed: int = 42,
+    precision: Optional[Precision] = None,
+    params: Optional[ISParams] = None,
+) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    Asset-level Normal / elliptical-t scenarios drawn under the tilted measure for the
+    portfolio `weights`, and their likelihood ratios (original / sampling density).
+
+    The Normal part is shifted by params.shift x Sigma w / sigma_p, which changes only the
+    law of S = w'z / sigma_p, so LR = exp(-shift S + shift^2 / 2); for the t, u is drawn
+    as chi2_scale x chi2(df), adding the factor c^(df/2) exp(u (1/c - 1) / 2).
+    Any estimator that weights scenario i by LR_i is unbiased for every portfolio; the
+    variance reduction is for the tail of this one.
+    """
+    rng = np.random.default_rng(seed)
+    dtype = resolve_dtype(precision)
+    params = params or is_parameters(alpha, dist, df)
 
-    rp = _portfolio_from_paths(sim, w)
+    r64 = returns.astype(np.float64)
+    mu = r64.mean().values
+    Sigma = r64.cov().values
+    w = weights.reindex(returns.columns).fillna(0.0).values
+    sw = Sigma @ w
+    sigma_p = float(np.sqrt(w @ sw))
 
-    q = np.quantile(rp, 1 - alpha)
-    var = -q
-    es = -rp[rp <= q].mean()
+    z = _draw_normal(rng, np.zeros(len(mu)), Sigma, n_sims, dtype)
+    z += (params.shift * sw / sigma_p).astype(dtype)
+    S = _portfolio_from_paths(z, w).astype(np.float64) / sigma_p
+    log_lr = -params.shift * S + 0.5 * params.shift ** 2
 
+    if dist == "t":
+        c = params.chi2_scale
+        u = c * _draw_chisquare(rng, df, n_sims, dtype)
+        log_lr += 0.5 * df * np.log(c) + 0.5 * u.astype(np.float64) * (1 / c - 1)
+        z *= np.sqrt(df / u).reshape(-1, 1).astype(dtype, copy=False)
+    elif dist != "normal":
+        raise ValueError("dist must be 'normal' or 't'")
+
+    z += mu.astype(dtype)
+    return pd.DataFrame(z, columns=returns.columns, copy=False), np.exp(log_lr)
+
+
+def weighted_var_es(rp: np.ndarray, lr: np.ndarray, alpha: float = 0.99) -> tuple[float, float]:
+    """
+    VaR / ES (positive numbers) from likelihood-ratio weighted draws.
+
+    F(x) = sum_i lr_i 1{rp_i <= x} / n; VaR = -min{x : F(x) >= p} and
+    ES = -(1/p) int_0^p F^-1(u) du, i.e. the weighted tail mean with the boundary
+    scenario counted for the remaining probability mass.
+    """
+    rp = np.asarray(rp, dtype=np.float64)
+    lr = np.asarray(lr, dtype=np.float64)
+    n = len(rp)
+    p = 1 - alpha
+
+    order = np.argsort(rp, kind="stable")
+    x, wx = rp[order], lr[order]
+    mass = np.cumsum(wx) / n
+    k = min(int(np.searchsorted(mass, p)), n - 1)
+    var = -x[k]
+    below = mass[k - 1] if k > 0 else 0.0
+    es = -(np.dot(wx[:k], x[:k]) / n + (p - below) * x[k]) / p
     return float(var), float(es)
+
+
+def mc_var_es_is(
+    returns: pd.DataFrame,
+    weights: pd.Series,
+    alpha: float = 0.999,
+    dist: Literal["normal", "t"] = "normal",
+    df: float = 6.0,
+    n_sims: int = 10_000,
+    seed: int = 42,
+    precision: Optional[Precision] = None,
+    params: Optional[ISParams] = None,
+) -> tuple[float, float]:
+    """
+    Importance-sampled counterpart of mc_var_es_normal / mc_var_es_student_t for far
+    tails (99.9% and above): scenarios from mc_scenarios_is, estimates from weighted_var_es.
+    """
+    scen, lr = mc_scenarios_is(returns, weights, alpha=alpha, dist=dist, df=df, n_sims=n_sims,
+                               seed=seed, precision=precision, params=params)
+    w = weights.reindex(scen.columns).fillna(0.0).values
+    return weighted_var_es(_portfolio_from_paths(scen.values, w), lr, alpha)
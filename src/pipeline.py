@@ -0,0 +1,499 @@
+import functools
+import hashlib
+import importlib
+import json
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Literal, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# 1. Content Hashing
+# ============================================================
+
+def _update_hash(h, obj: Any) -> None:
+    if isinstance(obj, pd.DataFrame):
+        h.update(b"DataFrame")
+        h.update(repr(list(obj.columns)).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(b"Series")
+        h.update(repr(obj.name).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(b"ndarray")
+        h.update(str(obj.dtype).encode())
+        h.update(repr(obj.shape).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b"dict")
+        for k in sorted(obj, key=repr):
+            _update_hash(h, k)
+            _update_hash(h, obj[k])
+    elif isinstance(obj, (list, tuple)):
+        h.update(type(obj).__name__.encode())
+        for x in obj:
+            _update_hash(h, x)
+    elif obj is None or isinstance(obj, (str, int, float, bool, np.generic)):
+        h.update(repr(obj).encode())
+    else:
+        try:
+            h.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            h.update(repr(obj).encode())
+
+
+def content_hash(obj: Any) -> str:
+    """
+    Stable SHA-256 digest of an artifact (DataFrame, Series, ndarray, dict, scalars...).
+    """
+    h = hashlib.sha256()
+    _update_hash(h, obj)
+    return h.hexdigest()
+
+
+def _params_hash(params: dict) -> str:
+    payload = json.dumps(params, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _update_code_hash(h, code) -> None:
+    """
+    Bytecode, constants and referenced names of a code object, recursing into nested
+    functions (a code object's repr carries its memory address, so it is never hashed).
+    """
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for c in code.co_consts:
+        if hasattr(c, "co_code"):
+            _update_code_hash(h, c)
+        elif isinstance(c, frozenset):  # `x in {...}` literals; iteration order varies per process
+            h.update(repr(sorted(map(repr, c))).encode())
+        else:
+            h.update(repr(c).encode())
+
+
+def func_hash(func: Callable[..., Any]) -> str:
+    """
+    Digest of a stage function's own code, so editing a stage invalidates its cache entries.
+    Helpers it calls are not followed; partials hash the wrapped function and their arguments.
+    """
+    h = hashlib.sha256()
+    h.update(f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}".encode())
+    if isinstance(func, functools.partial):
+        h.update(func_hash(func.func).encode())
+        _update_hash(h, list(func.args))
+        _update_hash(h, dict(func.keywords))
+    code = getattr(func, "__code__", None)
+    if code is not None:
+        _update_code_hash(h, code)
+    return h.hexdigest()
+
+
+# ============================================================
+# 2. Worker prewarming
+# ============================================================
+
+# Heavy imports a risk-pack worker needs; importing them once per worker at pool start
+# keeps seconds of library start-up out of the first stage each worker runs.
+DEFAULT_PREWARM = (
+    "numpy", "pandas", "scipy.stats", "scipy.optimize",
+    "sklearn.covariance", "arch", "src.risk_pack",
+)
+
+
+def prewarm(modules: Iterable[str] = DEFAULT_PREWARM) -> None:
+    """
+    Import modules up front (used as the process-pool initializer).
+    """
+    for m in modules:
+        importlib.import_module(m)
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+# ============================================================
+# 3. Stage + Pipeline
+# ============================================================
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[..., Any]
+    deps: tuple[str, ...] = ()
+    params: dict = field(default_factory=dict)
+    cache: bool = True
+
+
+class Pipeline:
+    """
+    Small DAG runner with a content-hashed on-disk artifact cache.
+
+    Each stage is called as func(*dep_values, **params). Its cache key is a hash of
+    the stage name, the function, its params and the content digests of its inputs,
+    so a stage is skipped whenever nothing upstream of it has changed. Stages whose
+    dependencies are resolved run concurrently on a thread (or process) pool.
+
+    With `prewarm` set, start_workers() creates the pool once, imports the listed modules
+    in every worker before any stage is submitted, and reuses it across run() calls.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = "outputs/.cache",
+        max_workers: int = 1,
+        executor: Literal["thread", "process"] = "thread",
+        prewarm: Optional[Iterable[str]] = None,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_workers = max(1, int(max_workers))
+        self.executor = executor
+        self.prewarm = tuple(prewarm) if prewarm is not None else None
+        self.stages: dict[str, Stage] = {}
+        self.last_run: list[dict] = []
+        self._pool = None
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        deps: Iterable[str] = (),
+        params: Optional[dict] = None,
+        cache: bool = True,
+    ) -> "Pipeline":
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' already defined.")
+        self.stages[name] = Stage(name=name, func=func, deps=tuple(deps), params=dict(params or {}), cache=cache)
+        return self
+
+    # ------------------------------
+    # Graph helpers
+    # ------------------------------
+
+    def _required(self, targets: Iterable[str]) -> list[str]:
+        """
+        Topologically ordered list of the targets and everything upstream of them.
+        """
+        order: list[str] = []
+        state: dict[str, int] = {}
+
+        def visit(name: str) -> None:
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage '{name}'.")
+            s = state.get(name, 0)
+            if s == 1:
+                raise ValueError(f"Cycle detected at stage '{name}'.")
+            if s == 2:
+                return
+            state[name] = 1
+            for d in self.stages[name].deps:
+                visit(d)
+            state[name] = 2
+            order.append(name)
+
+        for t in targets:
+            visit(t)
+        return order
+
+    def _key(self, stage: Stage, dep_digests: list[str]) -> str:
+        h = hashlib.sha256()
+        h.update(stage.name.encode())
+        h.update(func_hash(stage.func).encode())
+        h.update(_params_hash(stage.params).encode())
+        for d in dep_digests:
+            h.update(d.encode())
+        return h.hexdigest()
+
+    # ------------------------------
+    # Disk cache
+    # ------------------------------
+
+    def _paths(self, name: str, key: str) -> tuple[Path, Path]:
+        base = self.cache_dir / name
+        return base / f"{key[:24]}.pkl", base / f"{key[:24]}.digest"
+
+    def _cached_digest(self, stage: Stage, key: str) -> Optional[str]:
+        if self.cache_dir is None or not stage.cache:
+            return None
+        pkl, dig = self._paths(stage.name, key)
+        if pkl.exists() and dig.exists():
+            return dig.read_text().strip()
+        return None
+
+    def _load(self, name: str, key: str) -> Any:
+        pkl, _ = self._paths(name, key)
+        with open(pkl, "rb") as f:
+            return pickle.load(f)
+
+    def _save(self, stage: Stage, key: str, value: Any, digest: str) -> None:
+        if self.cache_dir is None or not stage.cache:
+            return
+        pkl, dig = self._paths(stage.name, key)
+        pkl.parent.mkdir(parents=True, exist_ok=True)
+        tmp = pkl.with_suffix(".tmp")
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # unpicklable artifact: keep it in memory only
+            tmp.unlink(missing_ok=True)
+            return
+        os.replace(tmp, pkl)
+        dig.write_text(digest)
+
+    # ------------------------------
+    # Workers
+    # ------------------------------
+
+    def _new_pool(self):
+        if self.executor == "process":
+            init = (prewarm, (self.prewarm,)) if self.prewarm else (None, ())
+            return ProcessPoolExecutor(max_workers=self.max_workers, initializer=init[0], initargs=init[1])
+        if self.prewarm:
+            prewarm(self.prewarm)  # threads share the parent's imports
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def start_workers(self) -> float:
+        """
+        Start a persistent (prewarmed) pool and block until every worker is up.
+        Returns the start-up time in seconds.
+        """
+        t0 = time.perf_counter()
+        if self._pool is None:
+            self._pool = self._new_pool()
+            for f in [self._pool.submit(_worker_ready) for _ in range(self.max_workers)]:
+                f.result()
+        return time.perf_counter() - t0
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "Pipeline":
+        self.start_workers()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+    # ------------------------------
+    # Execution
+    # ------------------------------
+
+    def run(self, targets: Optional[Iterable[str]] = None, force: Iterable[str] = ()) -> dict[str, Any]:
+        """
+        Resolve the requested targets (default: every stage) and return {name: value}.
+        Stages listed in `force` are recomputed even if a cached artifact exists.
+        """
+        targets = list(targets) if targets is not None else list(self.stages)
+        order = self._required(targets)
+        force = set(force)
+
+        digests: dict[str, str] = {}
+        keys: dict[str, str] = {}
+        values: dict[str, Any] = {}
+        pending = list(order)
+        running: dict[Any, tuple[str, float]] = {}
+        self.last_run = []
+
+        def value_of(name: str) -> Any:
+            if name not in values:
+                values[name] = self._load(name, keys[name])
+            return values[name]
+
+        pool = self._pool if self._pool is not None else self._new_pool()
+        try:
+            while pending or running:
+                progressed = False
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if not all(d in digests for d in stage.deps):
+                        continue
+                    pending.remove(name)
+                    progressed = True
+
+                    key = self._key(stage, [digests[d] for d in stage.deps])
+                    keys[name] = key
+                    cached = None if name in force else self._cached_digest(stage, key)
+                    if cached is not None:
+                        digests[name] = cached
+                        self.last_run.append({"stage": name, "status": "cached", "seconds": 0.0})
+                        continue
+
+                    args = [value_of(d) for d in stage.deps]
+                    fut = pool.submit(stage.func, *args, **stage.params)
+                    running[fut] = (name, time.perf_counter())
+
+                if not progressed:
+                    if not running:
+                        raise RuntimeError("Pipeline stalled: unresolved dependencies.")
+                    done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        name, t0 = running.pop(fut)
+                        value = fut.result()
+                        digest = content_hash(value)
+                        values[name] = value
+                        digests[name] = digest
+                        self._save(self.stages[name], keys[name], value, digest)
+                        self.last_run.append({
+                            "stage": name,
+                            "status": "computed",
+                            "seconds": time.perf_counter() - t0,
+                        })
+        finally:
+            if pool is not self._pool:
+                pool.shutdown()
+
+        return {name: value_of(name) for name in targets}
+
+    def run_report(self) -> pd.DataFrame:
+        """
+        Per-stage status ("cached" / "computed") and wall time of the last run.
+        """
+        if not self.last_run:
+            return pd.DataFrame(columns=["status", "seconds"])
+        return pd.DataFrame(self.last_run).set_index("stage")
+
+
+# ============================================================
+# 4. Standard Risk Pipeline
+# ============================================================
+
+def _load_prices(tickers: list[str], start: str, end: str) -> pd.DataFrame:
+    from src.data import download_price_data
+
+    prices = download_price_data(tickers, start, end)
+    return prices.dropna(axis=1, how="all")
+
+
+def _clean_log_returns(prices: pd.DataFrame, max_nan_frac: float = 0.05, precision: Optional[str] = None) -> pd.DataFrame:
+    from src.returns import compute_log_returns, clean_returns
+    from src.precision import as_precision
+
+    return as_precision(clean_returns(compute_log_returns(prices), max_nan_frac=max_nan_frac), precision)
+
+
+def _tail_window(rets: pd.DataFrame, n: int = 504) -> pd.DataFrame:
+    return rets.tail(n)
+
+
+def _lw_covariance(rets_est: pd.DataFrame) -> np.ndarray:
+    from src.covariance import ledoit_wolf_covariance
+
+    return ledoit_wolf_covariance(rets_est)
+
+
+def _min_var_weights(Sigma: np.ndarray, rets_est: pd.DataFrame, weight_cap: float = 0.05) -> pd.Series:
+    from src.portfolio import min_variance_weights
+
+    return min_variance_weights(Sigma, tickers=list(rets_est.columns), weight_cap=weight_cap)
+
+
+def _portfolio_returns(rets: pd.DataFrame, w: pd.Series) -> pd.Series:
+    from src.var_models import portfolio_returns
+
+    return portfolio_returns(rets, w)
+
+
+def _hs_var_es(rp: pd.Series, alpha: float = 0.99) -> dict:
+    from src.stress import hs_var_es
+
+    var, es = hs_var_es(rp, alpha=alpha)
+    return {"VaR": var, "ES": es}
+
+
+def _garch_fit(rp: pd.Series, dist: str = "normal") -> object:
+    from src.garch_model import fit_garch11
+
+    return fit_garch11(rp, mean="Zero", dist=dist)
+
+
+def _mc_var_es(
+    rets_est: pd.DataFrame,
+    w: pd.Series,
+    dist: str = "normal",
+    df: float = 6.0,
+    alpha: float = 0.99,
+    n_sims: int = 50_000,
+    seed: int = 42,
+    precision: Optional[str] = None,
+) -> dict:
+    from src.monte_carlo import mc_var_es_normal, mc_var_es_student_t
+
+    if dist == "normal":
+        var, es = mc_var_es_normal(rets_est, w, alpha=alpha, n_sims=n_sims, seed=seed, precision=precision)
+    else:
+        var, es = mc_var_es_student_t(rets_est, w, df=df, alpha=alpha, n_sims=n_sims, seed=seed,
+                                      precision=precision)
+    return {"VaR": var, "ES": es}
+
+
+def _historical_stress(rp: pd.Series, k_days: int = 10, horizon_days: int = 10, k_horizon: int = 5) -> dict:
+    from src.stress import worst_days, worst_horizon
+
+    return {
+        "worst_days": worst_days(rp, k=k_days),
+        "worst_horizon": worst_horizon(rp, horizon_days=horizon_days, k=k_horizon),
+    }
+
+
+def build_risk_pipeline(
+    tickers: list[str],
+    start: str,
+    end: str,
+    max_nan_frac: float = 0.05,
+    est_window: int = 504,
+    weight_cap: float = 0.05,
+    alpha: float = 0.99,
+    n_sims: int = 50_000,
+    mc_df: float = 6.0,
+    seed: int = 42,
+    precision: Optional[str] = None,
+    cache_dir: Optional[str] = "outputs/.cache",
+    max_workers: int = 4,
+    executor: Literal["thread", "process"] = "thread",
+    prewarm: Optional[Iterable[str]] = None,
+) -> Pipeline:
+    """
+    The chain every runner repeats, declared once:
+
+        prices -> returns -> rets_est -> cov -> weights -> port_ret
+                                                    |-> hs, garch_n, garch_t, mc_normal, mc_t, worst_losses
+
+    The leaf branches are independent and run concurrently. `precision` sets the storage
+    dtype of the return panel and MC scenarios (None -> src.precision.DEFAULT_PRECISION,
+    resolved here so stage cache keys record the dtype actually used).
+    """
+    from src.precision import resolve_dtype
+
+    precision = resolve_dtype(precision).name
+    p = Pipeline(cache_dir=cache_dir, max_workers=max_workers, executor=executor, prewarm=prewarm)
+    p.add("prices", _load_prices, params={"tickers": list(tickers), "start": start, "end": end})
+    p.add("returns", _clean_log_returns, deps=["prices"],
+          params={"max_nan_frac": max_nan_frac, "precision": precision})
+    p.add("rets_est", _tail_window, deps=["returns"], params={"n": est_window})
+    p.add("cov", _lw_covariance, deps=["rets_est"])
+    p.add("weights", _min_var_weights, deps=["cov", "rets_est"], params={"weight_cap": weight_cap})
+    p.add("port_ret", _portfolio_returns, deps=["returns", "weights"])
+
+    p.add("hs", _hs_var_es, deps=["port_ret"], params={"alpha": alpha})
+    p.add("garch_n", _garch_fit, deps=["port_ret"], params={"dist": "normal"})
+    p.add("garch_t", _garch_fit, deps=["port_ret"], params={"dist": "t"})
+    p.add("mc_normal", _mc_var_es, deps=["rets_est", "weights"],
+          params={"dist": "normal", "alpha": alpha, "n_sims": n_sims, "seed": seed,
+                  "precision": precision})
+    p.add("mc_t", _mc_var_es, deps=["rets_est", "weights"],
+          params={"dist": "t", "df": mc_df, "alpha": alpha, "n_sims": n_sims, "seed": seed,
+                  "precision": precision})
+    p.add("worst_losses", _historical_stress, deps=["port_ret"])
+    return p
@@ -1,6 +1,5 @@
 import numpy as np
 import pandas as pd
-from scipy.optimize import minimize
 
 
 def min_variance_weights(
@@ -14,6 +13,7 @@ def min_variance_weights(
       - sum(w)=1
       - 0 <= w_i <= weight_cap
     """
+    from scipy.optimize import minimize
 
     n = cov.shape[0]
     if cov.shape != (n, n):
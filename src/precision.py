@@ -0,0 +1,43 @@
+from typing import Literal, Union
+
+import numpy as np
+import pandas as pd
+
+
+Precision = Literal["float64", "float32"]
+
+# Storage precision for return panels and simulated scenario matrices, used wherever a
+# function's precision argument is left as None (the default throughout).
+# Quantiles, ES and covariance estimates are always accumulated in float64.
+DEFAULT_PRECISION: Precision = "float64"
+
+
+def resolve_dtype(precision: Union[Precision, None] = None) -> np.dtype:
+    """
+    Map a precision name ("float64" / "float32", None -> DEFAULT_PRECISION) to a numpy dtype.
+    """
+    p = DEFAULT_PRECISION if precision is None else precision
+    if p not in ("float64", "float32"):
+        raise ValueError("precision must be 'float64' or 'float32'")
+    return np.dtype(p)
+
+
+def set_default_precision(precision: Precision) -> None:
+    """
+    Change the process-wide default storage precision.
+    """
+    global DEFAULT_PRECISION
+    resolve_dtype(precision)
+    DEFAULT_PRECISION = precision
+
+
+def as_precision(x, precision: Union[Precision, None] = None):
+    """
+    Cast a DataFrame / Series / ndarray to the storage precision (no copy if already there).
+    """
+    dtype = resolve_dtype(precision)
+    if isinstance(x, pd.DataFrame):
+        return x if (x.dtypes == dtype).all() else x.astype(dtype)
+    if isinstance(x, pd.Series):
+        return x if x.dtype == dtype else x.astype(dtype)
+    return np.asarray(x, dtype=dtype)
@@ -0,0 +1,201 @@
+import datetime as dt
+import json
+import uuid
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+
+def _arrow():
+    """
+    pyarrow is an optional dependency (pip install nifty-risk[parquet]).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ModuleNotFoundError as e:
+        raise RuntimeError("The results store needs pyarrow: pip install pyarrow") from e
+    return pa, ds
+
+
+def table_name(filename: str) -> str:
+    """
+    Dataset name for a risk-pack CSV artifact: "backtest_kupiec_alpha99.csv" -> "backtest_kupiec_alpha99".
+    """
+    return Path(filename).stem
+
+
+def params_hash(params: Optional[dict]) -> str:
+    import hashlib
+
+    blob = json.dumps(params or {}, sort_keys=True, default=str).encode()
+    return hashlib.sha256(blob).hexdigest()[:12]
+
+
+PARTITION_KEYS = ("run_date", "params_hash", "model")
+
+
+class ResultsStore:
+    """
+    Append-only, partitioned Parquet store for risk-pack tables.
+
+    Layout (hive partitioning, one dataset per table):
+        {root}/{table}/run_date=YYYY-MM-DD/params_hash=<hash>[/model=<model>]/part-{run_id}-{write}-{i}.parquet
+        {root}/_runs/{run_id}.json          run parameters
+
+    The model level is present for tables with a model column (or written with model=),
+    so runs with different configs on the same date coexist in separate directories.
+    Files are never overwritten; reads prune run_date / params_hash / model partitions
+    and push run_id and column filters down to the Parquet scan.
+    """
+
+    def __init__(self, root: str = "outputs/store"):
+        self.root = Path(root)
+
+    # ------------------------------
+    # Write
+    # ------------------------------
+
+    def new_run(self, params: Optional[dict] = None, run_date: Optional[str] = None) -> dict:
+        """
+        Register a run; returns the keys to pass to write().
+        """
+        run = {
+            "run_id": uuid.uuid4().hex[:16],
+            "run_date": str(run_date or dt.date.today().isoformat()),
+            "params_hash": params_hash(params),
+            "created": dt.datetime.now().isoformat(timespec="seconds"),
+            "params": params or {},
+        }
+        runs = self.root / "_runs"
+        runs.mkdir(parents=True, exist_ok=True)
+        with open(runs / f"{run['run_id']}.json", "w") as f:
+            json.dump(run, f, default=str, indent=1)
+        return run
+
+    def write(self, table: str, df: pd.DataFrame, run: dict, model: Optional[str] = None) -> Path:
+        """
+        Append one table for a run. Non-default indexes are stored as columns.
+        """
+        pa, ds = _arrow()
+
+        out = df.reset_index() if not isinstance(df.index, pd.RangeIndex) else df.copy()
+        out.columns = [str(c) for c in out.columns]
+        out["run_id"] = run["run_id"]
+        out["params_hash"] = run["params_hash"]
+        if model is not None:
+            out["model"] = model
+        out["run_date"] = run["run_date"]
+        keys = tuple(k for k in PARTITION_KEYS if k in out.columns)
+        if "model" in keys:
+            out["model"] = out["model"].astype("string")  # partition values are strings
+
+        path = self.root / table
+        ds.write_dataset(
+            pa.Table.from_pandas(out, preserve_index=False),
+            path,
+            format="parquet",
+            partitioning=self._partitioning(keys),
+            # a fresh id per write keeps every file name new, so repeated writes of a table in
+            # one run append instead of replacing each other
+            basename_template=f"part-{run['run_id']}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        return path
+
+    def write_tables(self, tables: dict[str, pd.DataFrame], run: dict, model: Optional[str] = None) -> list[str]:
+        """
+        Append a risk-pack section output ({filename: DataFrame}) under one run. Tables
+        with a model column are partitioned by it; model= tags the others.
+        """
+        return [str(self.write(table_name(fname), df, run, model=model)) for fname, df in tables.items()]
+
+    # ------------------------------
+    # Read
+    # ------------------------------
+
+    def _partitioning(self, keys: tuple[str, ...] = PARTITION_KEYS):
+        """
+        Hive partitioning over `keys`. Reads use all keys: hive matches directories by
+        name, so tables without a model level (or older run_date-only data) read as null.
+        """
+        pa, ds = _arrow()
+        return ds.partitioning(pa.schema([(k, pa.string()) for k in keys]), flavor="hive")
+
+    def tables(self) -> list[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and not p.name.startswith("_"))
+
+    def runs(self) -> pd.DataFrame:
+        rows = []
+        for p in sorted((self.root / "_runs").glob("*.json")):
+            with open(p) as f:
+                r = json.load(f)
+            r.pop("params", None)
+            rows.append(r)
+        return pd.DataFrame(rows)
+
+    def read(
+        self,
+        table: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        model: Optional[Union[str, list[str]]] = None,
+        run_id: Optional[str] = None,
+        params_hash: Optional[str] = None,
+        columns: Optional[list[str]] = None,
+        filter=None,
+    ) -> pd.DataFrame:
+        """
+        Load a table across runs. start/end bound run_date (inclusive, ISO strings); together
+        with params_hash and model they prune whole partitions. run_id and `filter` (a
+        pyarrow.dataset expression) are pushed down to the Parquet row-group scan.
+        """
+        pa, ds = _arrow()
+        import pyarrow.compute as pc
+
+        dataset = ds.dataset(self.root / table, format="parquet", partitioning=self._partitioning())
+
+        expr = None
+
+        def _and(e):
+            nonlocal expr
+            expr = e if expr is None else expr & e
+
+        if start is not None:
+            _and(pc.field("run_date") >= str(start))
+        if end is not None:
+            _and(pc.field("run_date") <= str(end))
+        if model is not None:
+            models = [model] if isinstance(model, str) else list(model)
+            _and(pc.field("model").isin(models))
+        if params_hash is not None:
+            _and(pc.field("params_hash") == params_hash)
+        if run_id is not None:
+            _and(pc.field("run_id") == run_id)
+        if filter is not None:
+            _and(filter)
+
+        return dataset.to_table(columns=columns, filter=expr).to_pandas()
+
+    # ------------------------------
+    # CSV export
+    # ------------------------------
+
+    def export_csv(self, table: str, out_dir: str = "outputs", run_id: Optional[str] = None) -> str:
+        """
+        Write one run of a table back to the classic CSV artifact (latest run by default).
+        """
+        df = self.read(table, run_id=run_id)
+        if run_id is None and len(df):
+            reg = self.runs()
+            reg = reg[reg["run_id"].isin(df["run_id"].unique())]
+            latest = reg.sort_values(["run_date", "created"]).iloc[-1]["run_id"]
+            df = df[df["run_id"] == latest]
+        keys = [c for c in ("run_id", "params_hash", "run_date") if c in df.columns]
+        path = Path(out_dir) / f"{table}.csv"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.drop(columns=keys).to_csv(path, index=False)
+        return str(path)
@@ -0,0 +1,599 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import RISK_PACK_SECTIONS  # noqa: F401  (re-exported)
+from src.pipeline import Pipeline, build_risk_pipeline
+from src.precision import resolve_dtype
+
+ALL_MODELS = (
+    "HS", "Gaussian", "Cornish-Fisher", "EWMA", "FHS",
+    "MC-N", "MC-t", "GARCH-N", "GARCH-t",
+)
+
+# Pipeline stage feeding each model that needs more than the portfolio return series;
+# the var stage depends only on those of the selected models
+VAR_MODEL_INPUTS = {"GARCH-N": "garch_n", "GARCH-t": "garch_t", "MC-N": "mc_n_scen", "MC-t": "mc_t_scen"}
+
+
+def alpha_tag(alpha: float) -> str:
+    """
+    File-name tag for a confidence level: 0.99 -> "99", 0.975 -> "975".
+    """
+    return f"{alpha * 100:g}".replace(".", "")
+
+
+# ============================================================
+# 1. VaR / ES point estimates
+# ============================================================
+
+def var_model_deps(models: list[str]) -> list[str]:
+    """
+    Pipeline stages var_es_section needs beyond port_ret and weights, in VAR_MODEL_INPUTS order.
+    """
+    return [stage for m, stage in VAR_MODEL_INPUTS.items() if m in models]
+
+
+def var_es_section(
+    rp: pd.Series,
+    w: pd.Series,
+    *inputs,
+    alphas: list[float],
+    models: list[str],
+    lam: float = 0.94,
+) -> dict[str, pd.DataFrame]:
+    """
+    1-day VaR (and ES where the model provides it) for every model and alpha.
+    `inputs` are the GARCH fits / MC scenario matrices of the selected models, in
+    var_model_deps order; MC numbers come from the shared scenario matrices (one
+    simulation for all alphas).
+    """
+    from src.var_models import var_parametric_gaussian, var_cornish_fisher, var_ewma_parametric
+    from src.es_models import es_parametric_gaussian
+    from src.fhs import fhs_var_es
+    from src.garch_model import garch_var_series, garch_var_series_t
+    from src.tail_stats import ScenarioMatrix, series_var_es
+
+    fitted = dict(zip([m for m in VAR_MODEL_INPUTS if m in models], inputs))
+
+    # scenario models: one partition per portfolio P&L vector covers every alpha
+    tails = {}
+    if "HS" in models:
+        tails["HS"] = series_var_es(rp, alphas)
+    for name in ("MC-N", "MC-t"):
+        if name in models:
+            tails[name] = ScenarioMatrix.from_frame(fitted[name]).var_es(w, alphas)
+
+    rows = []
+    for k, alpha in enumerate(alphas):
+        out: dict[str, tuple[float, float]] = {}
+        if "HS" in models:
+            out["HS"] = (tails["HS"][0][k], tails["HS"][1][k])
+        if "Gaussian" in models:
+            out["Gaussian"] = (var_parametric_gaussian(rp, alpha), es_parametric_gaussian(rp, alpha))
+        if "Cornish-Fisher" in models:
+            out["Cornish-Fisher"] = (var_cornish_fisher(rp, alpha), np.nan)
+        if "EWMA" in models:
+            out["EWMA"] = (float(var_ewma_parametric(rp, alpha=alpha, lam=lam).dropna().iloc[-1]), np.nan)
+        if "FHS" in models:
+            out["FHS"] = fhs_var_es(rp, alpha=alpha, lam=lam)
+        for name in ("MC-N", "MC-t"):
+            if name in models:
+                out[name] = (tails[name][0][k], tails[name][1][k])
+        if "GARCH-N" in models:
+            out["GARCH-N"] = (float(garch_var_series(fitted["GARCH-N"], alpha=alpha).dropna().iloc[-1]), np.nan)
+        if "GARCH-t" in models:
+            out["GARCH-t"] = (float(garch_var_series_t(fitted["GARCH-t"], alpha=alpha).dropna().iloc[-1]), np.nan)
+
+        for name, (v, e) in out.items():
+            rows.append({"model": name, "alpha": alpha, "VaR_1d": float(v), "ES_1d": float(e)})
+
+    df = pd.DataFrame(rows).set_index(["model", "alpha"])
+    return {"var_es_table.csv": df}
+
+
+def var_ci_section(
+    rp: pd.Series,
+    alphas: list[float],
+    models: list[str],
+    n_boot: int = 10_000,
+    method: str = "stationary",
+    level: float = 0.90,
+    lam: float = 0.94,
+    seed: int = 42,
+) -> dict[str, pd.DataFrame]:
+    """
+    Bootstrap confidence intervals for the HS, Gaussian, Cornish-Fisher and FHS rows of
+    the VaR/ES table, plus paired model differences at the first alpha. Empty when none
+    of those models is selected; the difference tables need at least two.
+    """
+    from src.bootstrap import BOOTSTRAP_MODELS, bootstrap_var_es
+
+    boot_models = [m for m in models if m in BOOTSTRAP_MODELS]
+    if not boot_models:
+        return {}
+    res = bootstrap_var_es(rp, alphas, models=boot_models, n_boot=n_boot, method=method, lam=lam, seed=seed)
+    tables = {"var_es_ci.csv": res.ci(level)}
+    if len(boot_models) > 1:
+        tag = alpha_tag(alphas[0])
+        tables[f"var_model_differences_alpha{tag}.csv"] = res.differences("VaR", alphas[0], level)
+        tables[f"es_model_differences_alpha{tag}.csv"] = res.differences("ES", alphas[0], level)
+    return tables
+
+
+# ============================================================
+# 2. Rolling VaR forecasts, backtests, traffic light
+# ============================================================
+
+def var_forecast_series(
+    rp: pd.Series,
+    res_gn,
+    res_gt,
+    alpha: float = 0.99,
+    window: int = 250,
+    lam: float = 0.94,
+) -> dict[str, pd.Series]:
+    """
+    Look-ahead safe 1-day VaR forecast series shared by the backtest and traffic-light sections.
+    """
+    from src.backtesting import rolling_historical_var, rolling_gaussian_var
+    from src.var_models import var_ewma_parametric
+    from src.garch_model import garch_var_series, garch_var_series_t
+
+    return {
+        f"HS(rolling{window})": rolling_historical_var(rp, alpha=alpha, window=window),
+        "Gaussian": rolling_gaussian_var(rp, alpha=alpha, window=window),
+        f"EWMA(lam={lam})": var_ewma_parametric(rp, alpha=alpha, lam=lam).shift(1),
+        "GARCH-N": garch_var_series(res_gn, alpha=alpha).shift(1),
+        "GARCH-t": garch_var_series_t(res_gt, alpha=alpha).shift(1),
+    }
+
+
+def backtest_section(rp: pd.Series, var_series: dict, alpha: float = 0.99) -> dict[str, pd.DataFrame]:
+    from src.backtesting import compute_exceptions, kupiec_pof_test, exception_clustering_summary
+
+    rows = []
+    for name, v in var_series.items():
+        exc = compute_exceptions(rp, v.dropna())
+        bt = kupiec_pof_test(exc, alpha=alpha)
+        cl = exception_clustering_summary(exc)
+        rows.append({
+            "model": name,
+            "obs": bt["n"],
+            "exceptions": bt["x"],
+            "expected": bt["n"] * (1 - alpha),
+            "LR_pof": bt["LR_pof"],
+            "p_value": bt["p_value"],
+            **cl,
+        })
+
+    df = pd.DataFrame(rows).set_index("model")
+    return {f"backtest_kupiec_alpha{alpha_tag(alpha)}.csv": df}
+
+
+def traffic_light_section(
+    rp: pd.Series,
+    var_series: dict,
+    alpha: float = 0.99,
+    n_obs: int = 250,
+) -> dict[str, pd.DataFrame]:
+    from src.backtesting import compute_exceptions
+    from src.traffic_light import basel_traffic_light
+
+    rows = []
+    for name, v in var_series.items():
+        aligned = pd.concat([rp.dropna().tail(n_obs), v.dropna().tail(n_obs)], axis=1).dropna()
+        exc = compute_exceptions(aligned.iloc[:, 0], aligned.iloc[:, 1])
+        tl = basel_traffic_light(int(exc.sum()))
+        rows.append({
+            "model": name,
+            "obs": int(len(exc)),
+            "exceptions": tl.exceptions,
+            "zone": tl.zone,
+            "plus_factor": tl.plus_factor,
+            "multiplier_m": tl.multiplier_m,
+        })
+
+    df = pd.DataFrame(rows).set_index("model").sort_values(["zone", "exceptions"])
+    return {f"traffic_light_{n_obs}d_alpha{alpha_tag(alpha)}.csv": df}
+
+
+def es_backtest_section(
+    rp: pd.Series,
+    res_gt,
+    alpha: float = 0.975,
+    window: int = 250,
+    lam: float = 0.94,
+    n_sims: int = 2000,
+    seed: int = 42,
+) -> dict[str, pd.DataFrame]:
+    """
+    Rolling HS / Gaussian / FHS / GARCH-t ES forecasts and their Acerbi-Szekely Z1/Z2
+    and exceedance-residual backtests (simulated nulls).
+    """
+    from src.es_models import rolling_var_es
+    from src.es_backtesting import es_backtest
+
+    fc = rolling_var_es(rp, alpha=alpha, window=window, lam=lam, res_gt=res_gt)
+    bt = es_backtest(rp, fc, alpha=alpha, window=window, lam=lam, res_gt=res_gt, n_sims=n_sims, seed=seed)
+    tag = alpha_tag(alpha)
+    return {
+        f"es_forecasts_alpha{tag}.csv": fc.dropna(how="all"),
+        f"es_backtest_alpha{tag}.csv": bt,
+    }
+
+
+def ensemble_section(
+    rets: pd.DataFrame,
+    w: pd.Series,
+    alpha: float = 0.99,
+    window: int = 250,
+    lam: float = 0.94,
+    n_sims: int = 10_000,
+    mc_df: float = 6.0,
+    seed: int = 42,
+    garch_refit: int = 20,
+) -> dict[str, pd.DataFrame]:
+    """
+    Rolling forecasts of all nine VaR models and their cross-model spread.
+    """
+    from src.ensemble import rolling_model_ensemble
+
+    res = rolling_model_ensemble(rets, w, alpha=alpha, window=window, lam=lam, n_sims=n_sims,
+                                 mc_df=mc_df, seed=seed, garch_refit=garch_refit)
+    tag = alpha_tag(alpha)
+    return {
+        f"ensemble_var_alpha{tag}.csv": res.forecasts,
+        f"model_spread_alpha{tag}.csv": res.spread,
+    }
+
+
+# ============================================================
+# 3. 10-day horizon VaR (direct vs sqrt-time)
+# ============================================================
+
+def horizon_section(
+    rp: pd.Series,
+    alpha: float = 0.99,
+    horizon_days: int = 10,
+    window: int = 250,
+    stress_periods: Optional[dict] = None,
+) -> dict[str, pd.DataFrame]:
+    from src.backtesting import rolling_historical_var
+    from src.horizon_var import rolling_hs_var_horizon, horizon_log_return, scale_var_sqrt_time
+
+    ret_h = horizon_log_return(rp, horizon_days=horizon_days)
+    level = 100.0 * np.exp(rp.dropna().cumsum())
+
+    var_scaled = scale_var_sqrt_time(
+        rolling_historical_var(rp, alpha=alpha, window=window).shift(1), horizon_days=horizon_days
+    )
+    var_direct = rolling_hs_var_horizon(rp, alpha=alpha, horizon_days=horizon_days, window=window)
+
+    out = {}
+    rows = []
+    for label, v in [("direct", var_direct), ("scaled", var_scaled)]:
+        df = pd.concat(
+            [
+                level.rename("ClosingPrice"),
+                rp.rename("LogReturn"),
+                v.rename(f"VaR_{horizon_days}D"),
+                ret_h.rename(f"Ret_{horizon_days}D"),
+            ],
+            axis=1,
+        ).dropna()
+        df["Breach"] = -df[f"Ret_{horizon_days}D"] > df[f"VaR_{horizon_days}D"]
+        out[f"breach_table_portfolio_{label}{horizon_days}d_full.csv"] = df
+
+        periods = {"full": (None, None), **(stress_periods or {})}
+        for pname, (s, e) in periods.items():
+            sub = df.loc[s:e]
+            n = int(len(sub))
+            x = int(sub["Breach"].sum()) if n > 0 else 0
+            rows.append({
+                "method": label,
+                "period": pname,
+                "obs": n,
+                "breaches": x,
+                "breach_pct": 100.0 * x / n if n > 0 else float("nan"),
+            })
+
+    out[f"horizon_breach_summary_{horizon_days}d.csv"] = pd.DataFrame(rows)
+    return out
+
+
+# ============================================================
+# 4. Stress
+# ============================================================
+
+def stress_section(
+    rp: pd.Series,
+    rets_est: pd.DataFrame,
+    Sigma: np.ndarray,
+    w: pd.Series,
+    alpha: float = 0.99,
+    stress_periods: Optional[dict] = None,
+) -> dict[str, pd.DataFrame]:
+    from src.stress import (
+        hs_var_es, worst_days, worst_horizon, period_slice, portfolio_sigma_from_cov,
+        shock_loss_sigma, corr_from_cov, cov_from_corr, stress_correlations, stress_vols,
+    )
+
+    period_rows = []
+    for name, (s, e) in (stress_periods or {}).items():
+        r = period_slice(rp, s, e)
+        if len(r) < 30:
+            continue
+        var_p, es_p = hs_var_es(r, alpha=alpha)
+        worst_1d = float(r.min())
+        worst_10d = float(r.rolling(10).sum().min())
+        period_rows.append({
+            "period": name, "start": s, "end": e, "obs": int(len(r)),
+            f"HS_VaR_1D_{alpha_tag(alpha)}": var_p, f"HS_ES_1D_{alpha_tag(alpha)}": es_p,
+            "worst_1D_return": worst_1d, "worst_1D_loss": -worst_1d,
+            "worst_10D_return": worst_10d, "worst_10D_loss": -worst_10d,
+        })
+
+    wv = w.reindex(rets_est.columns).fillna(0.0).values
+    port_sigma = portfolio_sigma_from_cov(Sigma, wv)
+    Corr, vol = corr_from_cov(Sigma)
+
+    scen_rows = []
+    for n_sig in [3, 5]:
+        scen_rows.append({"scenario": f"Shock: -{n_sig}σ day",
+                          "loss_1D": shock_loss_sigma(port_sigma, n_sigma=float(n_sig)),
+                          "reference": "Parametric sigma shock"})
+    for mult in [1.5, 2.0]:
+        sig_s = portfolio_sigma_from_cov(cov_from_corr(stress_vols(vol, vol_mult=mult), Corr), wv)
+        scen_rows.append({"scenario": f"Vol shock: vols x{mult}",
+                          "loss_1D": shock_loss_sigma(sig_s, n_sigma=3.0),
+                          "reference": "3σ under shocked vols"})
+    for fac in [1.3, 1.8]:
+        sig_s = portfolio_sigma_from_cov(cov_from_corr(vol, stress_correlations(Corr, factor=fac, cap=0.99)), wv)
+        scen_rows.append({"scenario": f"Corr stress: off-diag x{fac} (cap 0.99)",
+                          "loss_1D": shock_loss_sigma(sig_s, n_sigma=3.0),
+                          "reference": "3σ under corr stress"})
+
+    return {
+        "stress_worst_days.csv": worst_days(rp, k=10),
+        "stress_worst_10d.csv": worst_horizon(rp, horizon_days=10, k=5),
+        "stress_period_replay.csv": pd.DataFrame(period_rows),
+        "stress_scenarios.csv": pd.DataFrame(scen_rows).sort_values("loss_1D"),
+    }
+
+
+def dcc_stress_section(
+    rets_est: pd.DataFrame,
+    Sigma: np.ndarray,
+    w: pd.Series,
+    dcc,
+) -> dict[str, pd.DataFrame]:
+    """
+    3σ loss under the DCC-GARCH correlation matrix of the date the average fitted
+    correlation peaked, with today's LW vols (kept apart from `stress` so the plain
+    stress tables never wait for, or fail with, the DCC fit).
+    """
+    from src.dcc import dcc_stressed_correlation
+    from src.stress import portfolio_sigma_from_cov, shock_loss_sigma, corr_from_cov, cov_from_corr
+
+    wv = w.reindex(rets_est.columns).fillna(0.0).values
+    _, vol = corr_from_cov(Sigma)
+    peak, R_peak = dcc_stressed_correlation(dcc)
+    R_peak = pd.DataFrame(R_peak, index=dcc.tickers, columns=dcc.tickers).reindex(
+        index=rets_est.columns, columns=rets_est.columns).values
+    sig_s = portfolio_sigma_from_cov(cov_from_corr(vol, R_peak), wv)
+    return {"stress_dcc_scenarios.csv": pd.DataFrame([{
+        "scenario": f"Corr stress: DCC peak ({pd.Timestamp(peak).date()})",
+        "loss_1D": shock_loss_sigma(sig_s, n_sigma=3.0),
+        "reference": "3σ under fitted peak correlation",
+    }])}
+
+
+# ============================================================
+# 5. FRTB: stressed calibration window, liquidity horizons
+# ============================================================
+
+def stressed_window_section(
+    rets: pd.DataFrame,
+    w: pd.Series,
+    alpha: float = 0.975,
+    window: int = 250,
+    top: int = 20,
+) -> dict[str, pd.DataFrame]:
+    """
+    Most stressed `window`-day periods for the current portfolio (HS ES ranking).
+    """
+    from src.stressed_window import stressed_window_search
+
+    res = stressed_window_search(rets, w, alpha=alpha, window=window, metric="ES")
+    return {f"stressed_windows_{window}d_alpha{alpha_tag(alpha)}.csv": res.ranked.head(top)}
+
+
+def liquidity_es_section(
+    rets: pd.DataFrame,
+    w: pd.Series,
+    alpha: float = 0.975,
+    liquidity_horizons: Optional[dict] = None,
+    default_horizon: int = 10,
+) -> dict[str, pd.DataFrame]:
+    """
+    Liquidity-horizon adjusted ES (FRTB cascade) from overlapping 10-day historical scenarios.
+    """
+    from src.frtb import assign_liquidity_horizons, horizon_scenarios, liquidity_adjusted_es
+
+    lh = assign_liquidity_horizons(list(rets.columns), liquidity_horizons, default=default_horizon)
+    res = liquidity_adjusted_es(horizon_scenarios(rets), w, lh, alpha=alpha)
+    df = res.breakdown.copy()
+    df.loc["total", "scaled_ES_j"] = res.es
+    return {f"liquidity_es_alpha{alpha_tag(alpha)}.csv": df}
+
+
+# ============================================================
+# 6. VaR / ES attribution
+# ============================================================
+
+def attribution_section(
+    rets: pd.DataFrame,
+    w: pd.Series,
+    mc_n_scen: pd.DataFrame,
+    mc_t_scen: pd.DataFrame,
+    alpha: float = 0.99,
+) -> dict[str, pd.DataFrame]:
+    """
+    Marginal / component / incremental VaR and ES per held name, computed on the
+    same data (HS, Gaussian) and scenario matrices (MC) as the portfolio numbers.
+    """
+    from src.attribution import hs_attribution, gaussian_attribution, scenario_attribution
+
+    results = {
+        "HS": hs_attribution(rets, w, alpha=alpha),
+        "Gaussian": gaussian_attribution(rets, w, alpha=alpha),
+        "MC-N": scenario_attribution(mc_n_scen, w, alpha=alpha),
+        "MC-t": scenario_attribution(mc_t_scen, w, alpha=alpha),
+    }
+    tables = []
+    for method, res in results.items():
+        t = res.table[res.table["weight"] != 0].copy()
+        t.insert(0, "method", method)
+        tables.append(t)
+    return {f"attribution_alpha{alpha_tag(alpha)}.csv": pd.concat(tables)}
+
+
+# ============================================================
+# 7. Initial margin proxy
+# ============================================================
+
+def im_section(
+    var_tables: dict,
+    res_gn=None,
+    res_gt=None,
+    alpha: float = 0.99,
+    mpor_days: int = 10,
+    method: str = "sqrt_time",
+    n_paths: int = 200_000,
+    seed: int = 42,
+) -> dict[str, pd.DataFrame]:
+    """
+    IM proxies from the 1-day VaR table. With a GARCH method the GARCH rows use the
+    MPOR-day GARCH VaR and the variance term structure of both fits is reported.
+    """
+    from src.margin import im_proxy_table
+
+    tbl = var_tables["var_es_table.csv"].xs(alpha, level="alpha")
+    fits = {"GARCH-N": res_gn, "GARCH-t": res_gt}
+    df = im_proxy_table(tbl["VaR_1d"].to_dict(), mpor_days=mpor_days, method=method,
+                        garch_fits=fits, alpha=alpha, n_paths=n_paths, seed=seed)
+    out = {f"im_proxy_table_{mpor_days}d_alpha{alpha_tag(alpha)}.csv": df}
+
+    if method != "sqrt_time":
+        from src.garch_model import garch_variance_term_structure
+
+        ts = pd.concat({name: garch_variance_term_structure(res, horizon=mpor_days) for name, res in fits.items()},
+                       names=["model"])
+        out[f"garch_variance_term_structure_{mpor_days}d.csv"] = ts
+    return out
+
+
+# ============================================================
+# 8. Pipeline wiring
+# ============================================================
+
+def _mc_scenarios(
+    rets_est: pd.DataFrame,
+    dist: str = "normal",
+    df: float = 6.0,
+    n_sims: int = 50_000,
+    seed: int = 42,
+    precision: Optional[str] = None,
+) -> pd.DataFrame:
+    from src.monte_carlo import mc_scenarios_normal, mc_scenarios_student_t
+
+    if dist == "normal":
+        return mc_scenarios_normal(rets_est, n_sims=n_sims, seed=seed, precision=precision)
+    return mc_scenarios_student_t(rets_est, df=df, n_sims=n_sims, seed=seed, precision=precision)
+
+
+def _dcc_fit(rets: pd.DataFrame, pairs: str = "adjacent") -> object:
+    from src.dcc import fit_dcc
+
+    return fit_dcc(rets, pairs=pairs)
+
+
+def build_risk_pack_pipeline(
+    cfg: dict,
+    max_workers: int = 1,
+    cache_dir: Optional[str] = None,
+    executor: str = "thread",
+    prewarm: Optional[list[str]] = None,
+) -> Pipeline:
+    """
+    Extend the standard risk pipeline with one stage per risk-pack section.
+    Data, portfolio and GARCH fits are computed once and shared in memory.
+    """
+    alphas = [float(a) for a in cfg["alphas"]]
+    alpha = alphas[0]
+    periods = {k: tuple(v) for k, v in cfg.get("stress_periods", {}).items()}
+    precision = resolve_dtype(cfg.get("precision")).name
+
+    p = build_risk_pipeline(
+        cfg["tickers"],
+        start=cfg["start"],
+        end=cfg["end"],
+        max_nan_frac=cfg["max_nan_frac"],
+        est_window=cfg["est_window"],
+        weight_cap=cfg["weight_cap"],
+        alpha=alpha,
+        n_sims=cfg["n_sims"],
+        mc_df=cfg["mc_df"],
+        seed=cfg["seed"],
+        precision=precision,
+        cache_dir=cache_dir,
+        max_workers=max_workers,
+        executor=executor,
+        prewarm=prewarm,
+    )
+
+    # MC scenario matrices are shared by the VaR table and attribution (kept in memory only)
+    p.add("mc_n_scen", _mc_scenarios, deps=["rets_est"], cache=False,
+          params={"dist": "normal", "n_sims": cfg["n_sims"], "seed": cfg["seed"], "precision": precision})
+    p.add("mc_t_scen", _mc_scenarios, deps=["rets_est"], cache=False,
+          params={"dist": "t", "df": cfg["mc_df"], "n_sims": cfg["n_sims"], "seed": cfg["seed"],
+                  "precision": precision})
+
+    p.add("var", var_es_section, deps=["port_ret", "weights"] + var_model_deps(cfg["models"]),
+          params={"alphas": alphas, "models": list(cfg["models"]), "lam": cfg["lam"]})
+    p.add("var_ci", var_ci_section, deps=["port_ret"],
+          params={"alphas": alphas, "models": list(cfg["models"]), "n_boot": cfg["bootstrap_samples"],
+                  "method": cfg["bootstrap_method"], "level": cfg["bootstrap_level"], "lam": cfg["lam"],
+                  "seed": cfg["seed"]})
+    p.add("attribution", attribution_section, deps=["returns", "weights", "mc_n_scen", "mc_t_scen"],
+          params={"alpha": alpha})
+    p.add("var_series", var_forecast_series, deps=["port_ret", "garch_n", "garch_t"],
+          params={"alpha": alpha, "window": cfg["backtest_window"], "lam": cfg["lam"]})
+    p.add("backtest", backtest_section, deps=["port_ret", "var_series"], params={"alpha": alpha})
+    p.add("traffic_light", traffic_light_section, deps=["port_ret", "var_series"],
+          params={"alpha": alpha, "n_obs": cfg["traffic_light_obs"]})
+    p.add("es_backtest", es_backtest_section, deps=["port_ret", "garch_t"],
+          params={"alpha": cfg["es_alpha"], "window": cfg["backtest_window"], "lam": cfg["lam"],
+                  "n_sims": cfg["es_backtest_sims"], "seed": cfg["seed"]})
+    p.add("ensemble", ensemble_section, deps=["returns", "weights"],
+          params={"alpha": alpha, "window": cfg["backtest_window"], "lam": cfg["lam"],
+                  "n_sims": cfg["ensemble_sims"], "mc_df": cfg["mc_df"], "seed": cfg["seed"],
+                  "garch_refit": cfg["garch_refit"]})
+    p.add("horizon", horizon_section, deps=["port_ret"],
+          params={"alpha": alpha, "horizon_days": cfg["horizon_days"],
+                  "window": cfg["backtest_window"], "stress_periods": periods})
+    p.add("dcc", _dcc_fit, deps=["returns"], params={"pairs": cfg["dcc_pairs"]})
+    p.add("stress", stress_section, deps=["port_ret", "rets_est", "cov", "weights"],
+          params={"alpha": alpha, "stress_periods": periods})
+    p.add("dcc_stress", dcc_stress_section, deps=["rets_est", "cov", "weights", "dcc"])
+    p.add("stressed_window", stressed_window_section, deps=["returns", "weights"],
+          params={"alpha": cfg["stressed_alpha"], "window": cfg["stressed_window"]})
+    p.add("liquidity_es", liquidity_es_section, deps=["returns", "weights"],
+          params={"alpha": cfg["es_alpha"], "liquidity_horizons": dict(cfg["liquidity_horizons"]),
+                  "default_horizon": cfg["default_liquidity_horizon"]})
+    p.add("im", im_section, deps=["var", "garch_n", "garch_t"],
+          params={"alpha": alpha, "mpor_days": cfg["mpor_days"], "method": cfg["im_method"],
+                  "n_paths": cfg["im_garch_paths"], "seed": cfg["seed"]})
+    return p
@@ -0,0 +1,175 @@
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+
+MOMENT_STATS = ("mean", "std", "skew", "excess_kurt")
+
+
+# ============================================================
+# 1. Compensated running power sums
+# ============================================================
+
+def _neumaier_add(s: np.ndarray, c: np.ndarray, v: np.ndarray) -> None:
+    """
+    s += v with Neumaier compensation (running error collected in c), in place.
+    """
+    t = s + v
+    c += np.where(np.abs(s) >= np.abs(v), (s - t) + v, (v - t) + s)
+    s[...] = t
+
+
+def rolling_power_sums(X: np.ndarray, windows: list[int]) -> np.ndarray:
+    """
+    Windowed sums of x, x^2, x^3, x^4 for every window length, shape (W x 4 x T x N).
+    Entry [k, p, t] covers rows t-windows[k]+1 .. t (NaN before the window is full).
+
+    One O(T) pass: each step adds the new row and removes the row leaving each window,
+    with compensated (Neumaier) updates so long series do not accumulate drift.
+    """
+    T, N = X.shape
+    wins = np.asarray(windows, dtype=int)
+    W = len(wins)
+
+    out = np.full((W, 4, T, N), np.nan)
+    S = np.zeros((W, 4, N))
+    C = np.zeros((W, 4, N))
+    powers = np.stack([X, X ** 2, X ** 3, X ** 4], axis=1)  # (T x 4 x N)
+    step = np.empty((W, 4, N))
+
+    for t in range(T):
+        # add row t to every window, remove row t - w from windows that are full
+        step[:] = powers[t]
+        leaving = t - wins
+        k = np.flatnonzero(leaving >= 0)
+        step[k] -= powers[leaving[k]]
+        _neumaier_add(S, C, step)
+
+        full = np.flatnonzero(t >= wins - 1)
+        out[full, :, t] = S[full] + C[full]
+    return out
+
+
+# ============================================================
+# 2. Rolling moments
+# ============================================================
+
+def _as_frame(data: Union[pd.Series, pd.DataFrame]) -> pd.DataFrame:
+    if isinstance(data, pd.Series):
+        return data.to_frame(data.name or "portfolio")
+    return data
+
+
+def rolling_moments(
+    data: Union[pd.Series, pd.DataFrame],
+    windows: list[int],
+) -> dict[str, pd.DataFrame]:
+    """
+    Rolling mean, std (ddof=1), skewness and excess kurtosis (population moments, as in
+    var_cornish_fisher) for several window lengths at once.
+
+    data: portfolio Series or (T x N) asset panel; rows with any NaN are dropped.
+    Returns {stat: DataFrame}, columns MultiIndex (window, asset); the row for date t
+    uses observations t-window+1 .. t (pandas rolling convention).
+    """
+    df = _as_frame(data).dropna(how="any")
+    X = df.values.astype(np.float64)
+    if len(X) == 0:
+        raise ValueError("no complete rows")
+
+    # shift by the first window's mean: moments are shift invariant and the power sums stay small
+    shift = X[: min(windows)].mean(axis=0)
+    P = rolling_power_sums(X - shift, windows)  # (W x 4 x T x N)
+
+    n = np.asarray(windows, dtype=float)[:, None, None]
+    m1 = P[:, 0] / n
+    e2, e3, e4 = P[:, 1] / n, P[:, 2] / n, P[:, 3] / n
+    m2 = np.maximum(e2 - m1 ** 2, 0.0)
+    m3 = e3 - 3 * m1 * e2 + 2 * m1 ** 3
+    m4 = e4 - 4 * m1 * e3 + 6 * m1 ** 2 * e2 - 3 * m1 ** 4
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stats = {
+            "mean": m1 + shift,
+            "std": np.sqrt(m2 * n / (n - 1)),
+            "skew": m3 / m2 ** 1.5,
+            "excess_kurt": m4 / m2 ** 2 - 3.0,
+        }
+
+    cols = pd.MultiIndex.from_product([list(windows), list(df.columns)], names=["window", "asset"])
+    out = {}
+    for name, arr in stats.items():
+        # (W x T x N) -> (T x W*N)
+        out[name] = pd.DataFrame(arr.transpose(1, 0, 2).reshape(len(df), -1), index=df.index, columns=cols)
+    return out
+
+
+# ============================================================
+# 3. Gaussian / Cornish-Fisher VaR and ES surfaces
+# ============================================================
+
+def _cf_quantile(z: float, S, K):
+    return (
+        z
+        + (1/6) * (z**2 - 1) * S
+        + (1/24) * (z**3 - 3*z) * K
+        - (1/36) * (2*z**3 - 5*z) * (S**2)
+    )
+
+
+def _cf_tail_mean(z: float, p: float, S, K):
+    """
+    E[g(Z) | Z <= z] for the Cornish-Fisher map g, Z ~ N(0,1), P(Z <= z) = p.
+
+    With J_k = int_{-inf}^z u^k phi(u) du:
+      J_0 = p,  J_1 = -phi(z),  J_k = -z^{k-1} phi(z) + (k-1) J_{k-2}
+    and g(u) = u + S/6 (u^2-1) + K/24 (u^3-3u) - S^2/36 (2u^3-5u).
+    """
+    from scipy.stats import norm
+
+    phi = norm.pdf(z)
+    J0 = p
+    J1 = -phi
+    J2 = -z * phi + J0
+    J3 = -z ** 2 * phi + 2 * J1
+    tail = (
+        J1
+        + (S / 6) * (J2 - J0)
+        + (K / 24) * (J3 - 3 * J1)
+        - (S ** 2 / 36) * (2 * J3 - 5 * J1)
+    )
+    return tail / p
+
+
+def rolling_parametric_var_es(
+    data: Union[pd.Series, pd.DataFrame],
+    windows: list[int],
+    alpha: float = 0.99,
+    forecast: bool = True,
+) -> pd.DataFrame:
+    """
+    Rolling Gaussian and Cornish-Fisher VaR / ES (positive numbers) for every window length
+    and every column, from one pass of rolling_moments.
+
+    forecast=True shifts by one day (VaR_t uses returns up to t-1, like rolling_gaussian_var).
+    Columns: MultiIndex (model, measure, window, asset).
+    """
+    from scipy.stats import norm
+
+    mom = rolling_moments(data, windows)
+    mu, sig = mom["mean"], mom["std"]
+    S, K = mom["skew"], mom["excess_kurt"]
+
+    p = 1 - alpha
+    z = norm.ppf(p)  # negative
+    k_es = norm.pdf(z) / p
+
+    parts = {
+        ("Gaussian", "VaR"): -(mu + z * sig),
+        ("Gaussian", "ES"): -(mu - sig * k_es),
+        ("Cornish-Fisher", "VaR"): -(mu + _cf_quantile(z, S, K) * sig),
+        ("Cornish-Fisher", "ES"): -(mu + _cf_tail_mean(z, p, S, K) * sig),
+    }
+    out = pd.concat(parts, axis=1, names=["model", "measure"])
+    return out.shift(1) if forecast else out
@@ -0,0 +1,583 @@
+import asyncio
+import datetime as dt
+import json
+import os
+import threading
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from http import HTTPStatus
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.tail_stats import tail_var_es
+
+
+SERVICE_MODELS = ("HS", "Gaussian", "Gaussian-LW", "EWMA", "GARCH-CCC", "MC-N", "MC-t")
+
+
+# ============================================================
+# 1. In-memory risk state
+# ============================================================
+
+@dataclass(frozen=True)
+class RiskState:
+    """
+    Everything a VaR query needs, computed once per load and never mutated
+    (a reload builds a new state and swaps the reference).
+    """
+    tickers: list[str]
+    as_of: pd.Timestamp
+    hs: np.ndarray           # (T x N) full return history (HS scenarios)
+    mu: np.ndarray           # full-sample mean
+    sigma: np.ndarray        # full-sample covariance (Gaussian, as var_parametric_gaussian)
+    mu_est: np.ndarray       # estimation-window mean
+    sigma_lw: np.ndarray     # Ledoit-Wolf covariance of the estimation window
+    sigma_ewma: np.ndarray   # EWMA covariance, same recursion as ewma_variance
+    sigma_garch: Optional[np.ndarray]  # CCC-GARCH: D R D from per-asset GARCH(1,1) fits
+    mc_n: np.ndarray         # (n_sims x N) Normal scenarios of the estimation window
+    mc_t: np.ndarray         # (n_sims x N) Student-t scenarios
+    load_seconds: float = 0.0
+    version: int = 0
+
+    def summary(self) -> dict:
+        return {
+            "version": self.version,
+            "as_of": str(self.as_of.date()),
+            "tickers": len(self.tickers),
+            "observations": len(self.hs),
+            "mc_sims": len(self.mc_n),
+            "garch": self.sigma_garch is not None,
+            "load_seconds": round(self.load_seconds, 3),
+        }
+
+
+def _ewma_covariance(X: np.ndarray, lam: float) -> np.ndarray:
+    """
+    Sigma_T = lam Sigma_{T-1} + (1-lam) r_{T-1} r_{T-1}', started at the sample covariance,
+    in closed form (one weighted cross-product). w' Sigma_T w equals ewma_variance of the
+    portfolio series at the last date.
+    """
+    T = len(X)
+    S0 = np.cov(X, rowvar=False, ddof=1)
+    k = np.arange(T - 1)
+    wts = (1 - lam) * lam ** (T - 2 - k)
+    return lam ** (T - 1) * S0 + (X[:-1] * wts[:, None]).T @ X[:-1]
+
+
+def _ccc_garch_covariance(returns: pd.DataFrame) -> np.ndarray:
+    """
+    Per-asset GARCH(1,1)-Normal conditional sigmas at the last date combined with the
+    correlation of the standardized residuals (constant conditional correlation).
+    """
+    from src.garch_model import fit_garch11
+
+    sig = np.empty(returns.shape[1])
+    Z = np.empty(returns.shape)
+    for i, c in enumerate(returns.columns):
+        res = fit_garch11(returns[c])
+        vol = np.asarray(res.conditional_volatility) / 100.0
+        sig[i] = vol[-1]
+        Z[:, i] = np.asarray(res.resid) / 100.0 / vol
+    R = np.corrcoef(Z, rowvar=False)
+    return R * np.outer(sig, sig)
+
+
+def load_risk_state(
+    returns: pd.DataFrame,
+    est_window: int = 504,
+    lam: float = 0.94,
+    n_sims: int = 50_000,
+    mc_df: float = 6.0,
+    seed: int = 42,
+    precision: Optional[str] = None,
+    garch: bool = True,
+) -> RiskState:
+    """
+    Build the service state from a clean (T x N) log-return panel.
+    MC scenarios, covariance and GARCH fits follow the risk pack, so a query for the
+    min-variance weights reproduces var_es_table.csv.
+    """
+    from src.covariance import ledoit_wolf_covariance
+    from src.monte_carlo import mc_scenarios_normal, mc_scenarios_student_t
+
+    t0 = time.perf_counter()
+    R = returns.dropna(how="any")
+    X = R.values.astype(np.float64)
+    est = R.tail(est_window)
+
+    state = RiskState(
+        tickers=list(R.columns),
+        as_of=R.index[-1],
+        hs=X,
+        mu=X.mean(axis=0),
+        sigma=np.cov(X, rowvar=False, ddof=1),
+        mu_est=est.values.astype(np.float64).mean(axis=0),
+        sigma_lw=ledoit_wolf_covariance(est),
+        sigma_ewma=_ewma_covariance(X, lam),
+        sigma_garch=_ccc_garch_covariance(R) if garch else None,
+        mc_n=mc_scenarios_normal(est, n_sims=n_sims, seed=seed, precision=precision).values,
+        mc_t=mc_scenarios_student_t(est, df=mc_df, n_sims=n_sims, seed=seed, precision=precision).values,
+    )
+    return replace(state, load_seconds=time.perf_counter() - t0)
+
+
+class PriceLoader:
+    """
+    Loader for RiskService: fetch prices through an ingestion source (yfinance, CSV,
+    HTTP stand-in, synthetic), clean returns and build the state. With end=None every
+    call reads up to today, so an end-of-day reload picks up the new close.
+    Picklable, so the service can run it in a separate process.
+    """
+
+    def __init__(self, cfg: dict, source=None, end: Optional[str] = None, garch: bool = True):
+        self.cfg = cfg
+        self.source = source
+        self.end = end
+        self.garch = garch
+
+    def __call__(self) -> RiskState:
+        from src.ingestion import ingest_prices
+        from src.returns import clean_returns, compute_log_returns
+
+        cfg = self.cfg
+        stop = self.end or (dt.date.today() + dt.timedelta(days=1)).isoformat()
+        prices, _ = ingest_prices(cfg["tickers"], cfg["start"], stop, source=self.source, checkpoint_dir=None)
+        rets = clean_returns(compute_log_returns(prices), max_nan_frac=cfg["max_nan_frac"])
+        return load_risk_state(
+            rets, est_window=cfg["est_window"], lam=cfg["lam"], n_sims=cfg["n_sims"],
+            mc_df=cfg["mc_df"], seed=cfg["seed"], precision=cfg.get("precision"), garch=self.garch,
+        )
+
+
+# ============================================================
+# 2. Batched portfolio risk
+# ============================================================
+
+def _tail_var_es_batch(P: np.ndarray, alpha: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Row-wise linear-interpolation quantile and tail mean of a (B x S) P&L matrix
+    (tail_stats.tail_var_es). Returns positive (VaR, ES) and the tail mask.
+    Rows are contiguous, so the partial sort runs along memory order.
+    """
+    var, es = tail_var_es(P, alpha, axis=1)
+    return var, es, P <= -var[:, None]
+
+
+def portfolio_risk(
+    state: RiskState,
+    W: np.ndarray,
+    alpha: float = 0.99,
+    models: Optional[list[str]] = None,
+    attribution: bool = False,
+) -> dict:
+    """
+    VaR / ES for a batch of portfolios W (B x N) in one pass per model: scenario models
+    cost one (B x N) @ (N x S) product and one row-wise partial sort, parametric models
+    one quadratic form. Returns {model: (VaR[B], ES[B])} and, with attribution=True,
+    per-asset Gaussian component VaR/ES and HS component ES (each summing to the total).
+    """
+    from scipy.special import ndtri  # norm.ppf without the rv_continuous overhead
+
+    models = list(SERVICE_MODELS) if models is None else list(models)
+    W = np.atleast_2d(np.asarray(W, dtype=np.float64))
+    z = float(ndtri(1 - alpha))
+    k_es = np.exp(-0.5 * z * z) / np.sqrt(2 * np.pi) / (1 - alpha)
+
+    out: dict = {}
+
+    def _gaussian(mu, S, name):
+        mu_p = W @ mu if mu is not None else np.zeros(len(W))
+        sig = np.sqrt(((W @ S) * W).sum(axis=1))
+        out[name] = (-(mu_p + z * sig), -(mu_p - sig * k_es))
+
+    tail_hs = None
+    for m in models:
+        if m == "HS":
+            var, es, tail_hs = _tail_var_es_batch(W @ state.hs.T, alpha)
+            out[m] = (var, es)
+        elif m == "Gaussian":
+            _gaussian(state.mu, state.sigma, m)
+        elif m == "Gaussian-LW":
+            _gaussian(state.mu_est, state.sigma_lw, m)
+        elif m == "EWMA":
+            _gaussian(state.mu, state.sigma_ewma, m)
+        elif m == "GARCH-CCC":
+            if state.sigma_garch is None:
+                raise ValueError("GARCH state not loaded (service started without GARCH)")
+            _gaussian(None, state.sigma_garch, m)
+        elif m in ("MC-N", "MC-t"):
+            scen = state.mc_n if m == "MC-N" else state.mc_t
+            P = (W.astype(scen.dtype, copy=False) @ scen.T).astype(np.float64, copy=False)
+            out[m] = _tail_var_es_batch(P, alpha)[:2]
+        else:
+            raise ValueError(f"Unknown model {m!r}; choose from {list(SERVICE_MODELS)}")
+
+    if attribution:
+        Sw = W @ state.sigma
+        sig = np.sqrt((Sw * W).sum(axis=1))[:, None]
+        attr = {
+            "Gaussian_component_VaR": W * -(state.mu + z * Sw / sig),
+            "Gaussian_component_ES": W * -(state.mu - Sw / sig * k_es),
+        }
+        if tail_hs is None:
+            tail_hs = _tail_var_es_batch(W @ state.hs.T, alpha)[2]
+        # HS: -w_i E[r_i | tail], the tail averages for all B portfolios as one product
+        tail_mean = (tail_hs.astype(np.float64) @ state.hs) / tail_hs.sum(axis=1)[:, None]
+        attr["HS_component_ES"] = W * -tail_mean
+        out["attribution"] = attr
+    return out
+
+
+def _parse_weights(spec, tickers: list[str], index: dict[str, int]) -> np.ndarray:
+    if isinstance(spec, dict):
+        unknown = [t for t in spec if t not in index]
+        if unknown:
+            raise ValueError(f"unknown tickers: {unknown[:5]}")
+        w = np.zeros(len(tickers))
+        for t, v in spec.items():
+            w[index[t]] = float(v)
+        return w
+    w = np.asarray(spec, dtype=np.float64)
+    if w.shape != (len(tickers),):
+        raise ValueError(f"weights list must have {len(tickers)} entries (state tickers order)")
+    return w
+
+
+def evaluate_requests(state: RiskState, requests: list[dict]) -> list[dict]:
+    """
+    Answer a micro-batch of parsed requests against one state snapshot. Requests are grouped
+    by (alpha, models, attribution) so each group is a single portfolio_risk call.
+    Per-request errors are returned in place instead of failing the batch.
+    """
+    index = {t: i for i, t in enumerate(state.tickers)}
+    results: list[dict] = [None] * len(requests)
+    groups: dict[tuple, list[tuple[int, np.ndarray]]] = {}
+
+    for i, req in enumerate(requests):
+        try:
+            w = _parse_weights(req["weights"], state.tickers, index)
+            models = tuple(req.get("models") or SERVICE_MODELS)
+            alpha = float(req.get("alpha", 0.99))
+            if not 0 < alpha < 1:
+                raise ValueError(f"alpha must be in (0, 1), got {alpha}")
+            key = (alpha, models, bool(req.get("attribution", False)))
+            groups.setdefault(key, []).append((i, w))
+        except (KeyError, TypeError, ValueError) as e:
+            results[i] = {"error": f"{type(e).__name__}: {e}"}
+
+    for (alpha, models, attribution), items in groups.items():
+        W = np.vstack([w for _, w in items])
+        try:
+            risk = portfolio_risk(state, W, alpha=alpha, models=list(models), attribution=attribution)
+        except ValueError as e:
+            for i, _ in items:
+                results[i] = {"error": f"ValueError: {e}"}
+            continue
+        for b, (i, w) in enumerate(items):
+            res = {
+                "as_of": str(state.as_of.date()),
+                "version": state.version,
+                "alpha": alpha,
+                "risk": {m: {"VaR": float(risk[m][0][b]), "ES": float(risk[m][1][b])} for m in models},
+            }
+            if attribution:
+                held = np.flatnonzero(w != 0)
+                res["attribution"] = {
+                    name: {state.tickers[j]: float(a[b, j]) for j in held}
+                    for name, a in risk["attribution"].items()
+                }
+            results[i] = res
+    return results
+
+
+# ============================================================
+# 3. Asyncio HTTP/JSON service
+# ============================================================
+
+def _seconds_until(hhmm: str) -> float:
+    h, m = (int(x) for x in hhmm.split(":"))
+    now = dt.datetime.now()
+    nxt = now.replace(hour=h, minute=m, second=0, microsecond=0)
+    if nxt <= now:
+        nxt += dt.timedelta(days=1)
+    return (nxt - now).total_seconds()
+
+
+def _lower_priority() -> None:
+    """
+    Loader-process initializer: yield the CPU to the query process (POSIX nice +10).
+    """
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+
+class RiskService:
+    """
+    Long-running VaR service: state is loaded once, queries are answered from memory.
+
+        POST /var     {"weights": {ticker: w} | [w...], "alpha": 0.99, "models": [...], "attribution": false}
+                      or {"portfolios": [<request>, ...]}
+        POST /reload  rebuild the state in the background and swap it in
+        GET  /health  state summary and request counters
+
+    Concurrent POST /var requests are queued and answered in micro-batches
+    (up to max_batch, waiting at most max_wait seconds for a batch to fill) against one
+    state snapshot. A reload (POST /reload, every `reload_every` seconds or daily at
+    `reload_at` "HH:MM") builds the new state on a loader thread while queries keep being
+    served from the old one, then swaps the reference between batches. With
+    load_in_process=True (needs a picklable loader such as PriceLoader) the load runs in
+    a child process at lower CPU priority, so GARCH fits and parsing neither hold the GIL
+    nor take CPU from queries on a busy machine.
+
+    Run in the foreground with serve_forever(), or in a background thread:
+
+        with RiskService(loader, port=0) as svc:
+            urlopen(svc.url + "/health")
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], RiskState],
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        max_batch: int = 64,
+        max_wait: float = 0.002,
+        reload_every: Optional[float] = None,
+        reload_at: Optional[str] = None,
+        state: Optional[RiskState] = None,
+        load_in_process: bool = False,
+    ):
+        self.loader = loader
+        self.host = host
+        self.port = port
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max_wait
+        self.reload_every = reload_every
+        self.reload_at = reload_at
+        self.state = state
+        self.stats = {"requests": 0, "batches": 0, "portfolios": 0, "reloads": 0, "errors": 0}
+
+        self._server = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._reload_lock: Optional[asyncio.Lock] = None
+        if load_in_process:
+            self._load_pool = ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn"),
+                                                  initializer=_lower_priority)
+        else:
+            self._load_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="risk-loader")
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    # ------------------------------
+    # State
+    # ------------------------------
+
+    async def reload(self) -> RiskState:
+        """
+        Build a fresh state off the event loop and swap it in; queries never wait for it.
+        """
+        async with self._reload_lock:
+            loop = asyncio.get_running_loop()
+            new = await loop.run_in_executor(self._load_pool, self.loader)
+            version = self.state.version + 1 if self.state is not None else 1
+            self.state = replace(new, version=version)
+            self.stats["reloads"] += 1
+            return self.state
+
+    async def _scheduled_reloads(self) -> None:
+        while True:
+            delay = self.reload_every if self.reload_every else _seconds_until(self.reload_at)
+            await asyncio.sleep(delay)
+            try:
+                await self.reload()
+            except Exception as e:  # keep serving the old state
+                print(f"[risk-service] reload failed: {type(e).__name__}: {e}")
+
+    # ------------------------------
+    # Micro-batching
+    # ------------------------------
+
+    async def _batcher(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            state = self.state  # one snapshot per batch; a concurrent reload swaps the next one
+            reqs = [r for r, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, evaluate_requests, state, reqs)
+            except Exception as e:
+                results = [{"error": f"{type(e).__name__}: {e}"} for _ in batch]
+            self.stats["batches"] += 1
+            self.stats["portfolios"] += len(batch)
+            for (_, fut), res in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(res)
+
+    async def query(self, request: dict) -> dict:
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, fut))
+        return await fut
+
+    # ------------------------------
+    # HTTP
+    # ------------------------------
+
+    async def _route(self, method: str, path: str, body: bytes) -> tuple[int, object]:
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok", **self.state.summary(), "stats": dict(self.stats)}
+        if method == "GET" and path == "/tickers":
+            return 200, {"tickers": self.state.tickers}
+        if method == "POST" and path == "/reload":
+            state = await self.reload()
+            return 200, {"status": "reloaded", **state.summary()}
+        if method == "POST" and path == "/var":
+            req = json.loads(body or b"{}")
+            t0 = time.perf_counter()
+            if "portfolios" in req:
+                res = await asyncio.gather(*(self.query(r) for r in req["portfolios"]))
+                payload = {"results": list(res)}
+                failed = all("error" in r for r in res) and len(res) > 0
+            else:
+                payload = await self.query(req)
+                failed = "error" in payload
+            payload["latency_ms"] = 1e3 * (time.perf_counter() - t0)
+            return (400 if failed else 200), payload
+        return 404, {"error": f"no route {method} {path}"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, path, _ = line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                self.stats["requests"] += 1
+                try:
+                    status, payload = await self._route(method, path, body)
+                except (ValueError, KeyError, TypeError) as e:
+                    status, payload = 400, {"error": f"{type(e).__name__}: {e}"}
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                if status >= 400:
+                    self.stats["errors"] += 1
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    # ------------------------------
+    # Lifecycle
+    # ------------------------------
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def open(self) -> None:
+        self._queue = asyncio.Queue()
+        self._reload_lock = asyncio.Lock()
+        if self.state is None:
+            await self.reload()
+        # warm-up query: first-call imports and the executor thread are paid before serving
+        n = len(self.state.tickers)
+        await asyncio.get_running_loop().run_in_executor(
+            None, evaluate_requests, self.state, [{"weights": [1.0 / n] * n, "attribution": True}])
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=256)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tasks = [asyncio.create_task(self._batcher())]
+        if self.reload_every or self.reload_at:
+            self._tasks.append(asyncio.create_task(self._scheduled_reloads()))
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _main(self, on_ready: Optional[Callable[[], None]] = None) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        await self.open()
+        if on_ready is not None:
+            on_ready()
+        try:
+            await self._stop.wait()
+        finally:
+            await self.close()
+
+    def serve_forever(self, on_ready: Optional[Callable[[], None]] = None) -> None:
+        try:
+            asyncio.run(self._main(on_ready))
+        finally:
+            self._load_pool.shutdown()
+
+    def start(self) -> "RiskService":
+        ready = threading.Event()
+        failed: list[BaseException] = []
+
+        def _run():
+            try:
+                asyncio.run(self._main(ready.set))
+            except BaseException as e:
+                failed.append(e)
+
+        self._thread = threading.Thread(target=_run, daemon=True)
+        self._thread.start()
+        while not ready.wait(0.1):
+            if not self._thread.is_alive():
+                raise RuntimeError("risk service failed to start") from (failed[0] if failed else None)
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join()
+        self._load_pool.shutdown()
+
+    def __enter__(self) -> "RiskService":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
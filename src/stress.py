@@ -1,18 +1,15 @@
 import numpy as np
 import pandas as pd
 
+from src.tail_stats import series_var_es
+
 
 def hs_var_es(port_ret: pd.Series, alpha: float = 0.99) -> tuple[float, float]:
     """
     Historical (empirical) VaR and ES for a return series.
     Returns positive numbers (loss magnitudes).
     """
-    r = port_ret.dropna()
-    q = r.quantile(1 - alpha)  # negative
-    var = -float(q)
-    tail = r[r <= q]
-    es = -float(tail.mean()) if len(tail) > 0 else float("nan")
-    return var, es
+    return series_var_es(port_ret, alpha)
 
 
 def worst_days(port_ret: pd.Series, k: int = 10) -> pd.DataFrame:
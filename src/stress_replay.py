@@ -0,0 +1,185 @@
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.tail_stats import tail_var_es
+
+
+class ReplayEngine:
+    """
+    Vectorized historical stress replay over every start date and window length.
+
+    Built once from a (T x P) panel of daily log returns (one column per portfolio):
+      C[t] = sum_{u<t} r_u   (cumulative log return, C[0] = 0)
+
+    Window [s, s+h) then has
+      cumulative return  C[s+h] - C[s]
+      max drawdown       max_{s<=i<=j<=s+h} C[i] - C[j]
+    and the HS VaR/ES of the h daily returns it contains.
+    Surfaces are (H x T x P) arrays indexed [h-1, s, p]; windows running past the
+    end of the sample are NaN.
+    """
+
+    def __init__(self, returns: Union[pd.Series, pd.DataFrame], max_horizon: int = 60):
+        if isinstance(returns, pd.Series):
+            returns = returns.to_frame(returns.name or "portfolio")
+        r = returns.dropna(how="any")
+
+        self.index = r.index
+        self.portfolios = list(r.columns)
+        self.max_horizon = int(max_horizon)
+        self.R = r.values.astype(np.float64)
+        T, P = self.R.shape
+
+        self.C = np.zeros((T + 1, P))
+        np.cumsum(self.R, axis=0, out=self.C[1:])
+
+    @classmethod
+    def from_weights(cls, returns: pd.DataFrame, weights: pd.DataFrame, max_horizon: int = 60) -> "ReplayEngine":
+        """
+        Many portfolios at once: weights is (tickers x portfolios).
+        """
+        W = weights.reindex(returns.columns).fillna(0.0)
+        return cls(returns.dropna(how="any") @ W, max_horizon=max_horizon)
+
+    def _horizons(self, horizons) -> list[int]:
+        hs = range(1, self.max_horizon + 1) if horizons is None else horizons
+        return [int(h) for h in hs]
+
+    # ------------------------------
+    # Surfaces
+    # ------------------------------
+
+    def window_returns(self, h: int) -> np.ndarray:
+        """
+        (T x P) cumulative log return of every length-h window, by start date (NaN past the end).
+        """
+        T, P = self.R.shape
+        out = np.full((T, P), np.nan)
+        out[:T - h + 1] = self.C[h:] - self.C[:T - h + 1]
+        return out
+
+    def cumulative_loss(self, horizons=None) -> np.ndarray:
+        """
+        (H x T x P) cumulative loss (= -cumulative log return) for every start date and horizon.
+        """
+        return np.stack([-self.window_returns(h) for h in self._horizons(horizons)])
+
+    def max_drawdown(self) -> np.ndarray:
+        """
+        (max_horizon x T x P) maximum drawdown inside every window, built incrementally:
+          M_h = max(M_{h-1}, C[s+h]),  D_h = max(D_{h-1}, M_h - C[s+h])
+        """
+        T, P = self.R.shape
+        H = self.max_horizon
+        Cpad = np.full((T + 1 + H, P), np.nan)
+        Cpad[:T + 1] = self.C
+
+        out = np.empty((H, T, P))
+        run_max = Cpad[:T].copy()
+        dd = np.zeros((T, P))
+        for h in range(1, H + 1):
+            level = Cpad[h:h + T]
+            np.maximum(run_max, level, out=run_max)  # NaN propagates past the end
+            np.maximum(dd, run_max - level, out=dd)
+            out[h - 1] = dd
+        return out
+
+    def window_var_es(self, alpha: float = 0.99, horizons=None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (H x T x P) HS VaR and ES of the daily returns inside every window
+        (linear interpolation, same convention as pandas quantile).
+        """
+        hs = self._horizons(horizons)
+        T, P = self.R.shape
+        var = np.full((len(hs), T, P), np.nan)
+        es = np.full((len(hs), T, P), np.nan)
+
+        for i, h in enumerate(hs):
+            win = sliding_window_view(self.R, h, axis=0)  # (T-h+1, P, h), no copy
+            var[i, :T - h + 1], es[i, :T - h + 1] = tail_var_es(win, alpha, axis=-1)
+        return var, es
+
+    def surface(self, values: np.ndarray, portfolio=None, horizons=None) -> pd.DataFrame:
+        """
+        One portfolio's (H x T) slice of a surface as a DataFrame: start dates x horizons.
+        """
+        p = 0 if portfolio is None else self.portfolios.index(portfolio)
+        hs = self._horizons(horizons)[: values.shape[0]]
+        return pd.DataFrame(values[:, :, p].T, index=self.index, columns=pd.Index(hs, name="horizon"))
+
+    # ------------------------------
+    # Worst windows
+    # ------------------------------
+
+    def worst_windows(self, horizon_days: int = 10, k: int = 5, portfolio=None) -> pd.DataFrame:
+        """
+        Worst k non-overlapping windows of length h (greedy on sorted window returns).
+        O(T log T) for the sort; each pick blocks the 2h-1 overlapping start dates.
+        """
+        h = int(horizon_days)
+        cols = self.portfolios if portfolio is None else [portfolio]
+        T = len(self.index)
+        n_win = T - h + 1
+
+        frames = []
+        for name in cols:
+            p = self.portfolios.index(name)
+            ret = self.C[h:, p] - self.C[:n_win, p]
+            blocked = np.zeros(n_win, dtype=bool)
+            picks = []
+            for s in np.argsort(ret, kind="stable"):
+                if blocked[s]:
+                    continue
+                picks.append(s)
+                blocked[max(0, s - h + 1):s + h] = True
+                if len(picks) == k:
+                    break
+
+            picks = np.array(picks, dtype=int)
+            frames.append(pd.DataFrame({
+                "portfolio": name,
+                "rank": np.arange(1, len(picks) + 1),
+                "start": self.index[picks],
+                "end": self.index[picks + h - 1],
+                f"Ret_{h}D": ret[picks],
+                f"Loss_{h}D": -ret[picks],
+            }))
+        return pd.concat(frames, ignore_index=True)
+
+    def summary(self, alpha: float = 0.99, horizons=None, portfolio=None) -> pd.DataFrame:
+        """
+        Per horizon: worst cumulative loss, deepest drawdown and the worst in-window HS VaR/ES.
+        """
+        p = 0 if portfolio is None else self.portfolios.index(portfolio)
+        hs = self._horizons(horizons)
+        loss = self.cumulative_loss(hs)[:, :, p]
+        dd = self.max_drawdown()[[h - 1 for h in hs], :, p]
+        var, es = self.window_var_es(alpha=alpha, horizons=hs)
+
+        rows = []
+        for i, h in enumerate(hs):
+            s = int(np.nanargmax(loss[i]))
+            rows.append({
+                "horizon": h,
+                "worst_loss": float(loss[i, s]),
+                "worst_loss_start": self.index[s],
+                "max_drawdown": float(np.nanmax(dd[i])),
+                "max_window_VaR": float(np.nanmax(var[i, :, p])),
+                "max_window_ES": float(np.nanmax(es[i, :, p])),
+            })
+        return pd.DataFrame(rows).set_index("horizon")
+
+
+def replay_all_windows(
+    port_ret: Union[pd.Series, pd.DataFrame],
+    alpha: float = 0.99,
+    max_horizon: int = 60,
+    horizons: Optional[list[int]] = None,
+) -> pd.DataFrame:
+    """
+    Convenience wrapper: worst-case summary for every horizon up to max_horizon.
+    """
+    return ReplayEngine(port_ret, max_horizon=max_horizon).summary(alpha=alpha, horizons=horizons)
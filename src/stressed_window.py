@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.tail_stats import sliding_var_es
+
+
+@dataclass(frozen=True)
+class StressedWindowResult:
+    start: pd.Timestamp
+    end: pd.Timestamp
+    stressed_var: float
+    stressed_es: float
+    ratio: float             # ES_F,C / ES_R,C (1.0 when searching on the full factor set)
+    ranked: pd.DataFrame     # every window, most stressed first
+
+
+def sliding_hs_var_es(
+    port_ret: pd.Series,
+    alpha: float = 0.975,
+    window: int = 250,
+) -> pd.DataFrame:
+    """
+    HS VaR/ES of every length-`window` window, indexed by window end date.
+
+    tail_stats.sliding_var_es: chunked row-wise partitions over a zero-copy sliding view
+    of the series, with the same interpolation and tail definition as hs_var_es.
+    """
+    r = port_ret.dropna()
+    x = r.values.astype(np.float64)
+    n = len(x)
+    if n < window:
+        raise ValueError("series shorter than window")
+
+    out_var, out_es = sliding_var_es(x, alpha, window)
+
+    idx = r.index[window - 1:]
+    return pd.DataFrame({
+        "start": r.index[: n - window + 1],
+        "end": idx,
+        "VaR": out_var,
+        "ES": out_es,
+    }, index=idx)
+
+
+def stressed_window_search(
+    returns: pd.DataFrame,
+    weights: pd.Series,
+    alpha: float = 0.975,
+    window: int = 250,
+    metric: Literal["VaR", "ES"] = "ES",
+    reduced_factors: Optional[list[str]] = None,
+    current_window: int = 250,
+) -> StressedWindowResult:
+    """
+    Find the `window`-day period that maximises HS VaR or ES of the current portfolio.
+
+    With reduced_factors (FRTB reduced set R), the search runs on the portfolio restricted
+    to R and the stressed figure is scaled by the full/reduced ratio on the current window:
+        ES_stressed = ES_R,S * max(1, ES_F,C / ES_R,C)
+    """
+    r = returns.dropna(how="any")
+    w = weights.reindex(r.columns).fillna(0.0)
+    rp_full = r @ w
+
+    if reduced_factors is not None:
+        keep = [c for c in r.columns if c in set(reduced_factors)]
+        rp_search = r[keep] @ w[keep]
+    else:
+        rp_search = rp_full
+
+    ranked = sliding_hs_var_es(rp_search, alpha=alpha, window=window)
+    ranked = ranked.sort_values(metric, ascending=False, kind="mergesort")
+    ranked.insert(0, "rank", np.arange(1, len(ranked) + 1))
+    best = ranked.iloc[0]
+
+    ratio = 1.0
+    if reduced_factors is not None:
+        cur_full = sliding_hs_var_es(rp_full.tail(current_window), alpha=alpha, window=current_window).iloc[-1]
+        cur_red = sliding_hs_var_es(rp_search.tail(current_window), alpha=alpha, window=current_window).iloc[-1]
+        ratio = max(1.0, float(cur_full[metric] / cur_red[metric]))
+
+    return StressedWindowResult(
+        start=best["start"],
+        end=best["end"],
+        stressed_var=float(best["VaR"]) * ratio,
+        stressed_es=float(best["ES"]) * ratio,
+        ratio=ratio,
+        ranked=ranked.reset_index(drop=True),
+    )
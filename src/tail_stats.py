@@ -0,0 +1,190 @@
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+Alphas = Union[float, Sequence[float]]
+
+
+# ============================================================
+# 1. Order-statistic positions (numpy "linear" quantile)
+# ============================================================
+
+def tail_index(n: int, alpha: float) -> tuple[int, int, float]:
+    """
+    (lo, hi, gamma) of the linear-interpolation (1 - alpha) quantile of n values:
+    virtual index (n - 1)(1 - alpha), as np.quantile / pandas Series.quantile.
+    """
+    virtual = (n - 1) * (1 - alpha)
+    lo = int(np.floor(virtual))
+    if virtual >= n - 1:
+        return n - 1, n - 1, 0.0
+    return lo, lo + 1, float(virtual - lo)
+
+
+def lerp(a, b, gamma: float):
+    """
+    numpy's quantile interpolation, bit for bit (it switches to b - d (1 - g) for g >= 0.5).
+    """
+    d = b - a
+    if gamma >= 0.5:
+        return b - d * (1 - gamma)
+    return a + d * gamma
+
+
+# ============================================================
+# 2. Kernel
+# ============================================================
+
+def _kth(n: int, alphas: list[float]) -> tuple[list[tuple[int, int, float]], list[int]]:
+    bad = [a for a in alphas if not 0 < a < 1]
+    if bad:
+        raise ValueError(f"alpha must be in (0, 1), got {bad}")
+    idx = [tail_index(n, a) for a in alphas]
+    return idx, sorted({k for lo, hi, _ in idx for k in (lo, hi)})
+
+
+def tail_quantile(P, alpha: Alphas = 0.99, axis: int = -1) -> np.ndarray:
+    """
+    (1 - alpha) quantile(s) along `axis` from one np.partition (all alphas share it).
+    Scalar alpha drops the alpha dimension; a sequence appends it last.
+    """
+    A = np.moveaxis(np.asarray(P), axis, -1)
+    alphas = [float(a) for a in np.atleast_1d(alpha)]
+    idx, kth = _kth(A.shape[-1], alphas)
+    part = np.partition(A, kth, axis=-1)
+    q = np.stack([lerp(part[..., lo], part[..., hi], g) for lo, hi, g in idx], axis=-1)
+    return q[..., 0] if np.ndim(alpha) == 0 else q
+
+
+def tail_var_es(P, alpha: Alphas = 0.99, axis: int = -1) -> tuple:
+    """
+    VaR and ES (positive numbers) of the P&L values along `axis`, for one or several
+    alphas, in one partition:
+
+      VaR = -q,  q = linear-interpolation (1 - alpha) quantile (as np.quantile)
+      ES  = -mean(P[P <= q])
+
+    After partitioning at every needed order statistic the values <= q are exactly the
+    first lo + 1 entries, so each ES is a prefix sum; only slices where the next order
+    statistic ties with q fall back to the full comparison. A 1-D input with scalar alpha
+    returns floats, otherwise arrays with the reduced axis removed (alphas appended last).
+    """
+    A = np.moveaxis(np.asarray(P), axis, -1)
+    n = A.shape[-1]
+    alphas = [float(a) for a in np.atleast_1d(alpha)]
+    idx, kth = _kth(n, alphas)
+    part = np.partition(A, kth, axis=-1)
+    csum = np.cumsum(part[..., :max(lo for lo, _, _ in idx) + 1], axis=-1, dtype=np.float64)
+
+    var = np.empty(A.shape[:-1] + (len(alphas),))
+    es = np.empty_like(var)
+    for k, (lo, hi, g) in enumerate(idx):
+        q = lerp(part[..., lo], part[..., hi], g)
+        e = csum[..., lo] / (lo + 1)
+        ties = part[..., hi] <= q if hi > lo else np.ones(A.shape[:-1], dtype=bool)
+        if np.any(ties):
+            At = A[ties]
+            tail = At <= np.asarray(q)[ties][..., None]
+            e = np.array(e, dtype=np.float64)
+            e[ties] = np.where(tail, At, 0.0).sum(axis=-1, dtype=np.float64) / tail.sum(axis=-1)
+        var[..., k] = -q
+        es[..., k] = -e
+
+    if np.ndim(alpha) == 0:
+        var, es = var[..., 0], es[..., 0]
+        if var.ndim == 0:
+            return float(var), float(es)
+    return var, es
+
+
+def series_var_es(port_ret: pd.Series, alpha: Alphas = 0.99) -> tuple:
+    """
+    HS VaR / ES of a return series (NaNs dropped, as pandas quantile does; NaN if empty).
+    """
+    x = np.asarray(port_ret.dropna(), dtype=np.float64)
+    if len(x) == 0:
+        if np.ndim(alpha) == 0:
+            return float("nan"), float("nan")
+        return np.full(len(alpha), np.nan), np.full(len(alpha), np.nan)
+    return tail_var_es(x, alpha)
+
+
+def sliding_var_es(
+    x: np.ndarray,
+    alpha: float,
+    window: int,
+    chunk: int = 2048,
+    es: bool = True,
+) -> tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    VaR / ES of every length-`window` slice x[i:i+window], chunked over a zero-copy
+    sliding view. es=False skips the tail means (quantile only).
+    """
+    win = sliding_window_view(np.asarray(x, dtype=np.float64), window)
+    var = np.empty(len(win))
+    out_es = np.empty(len(win)) if es else None
+    for s in range(0, len(win), chunk):
+        if es:
+            var[s:s + chunk], out_es[s:s + chunk] = tail_var_es(win[s:s + chunk], alpha, axis=1)
+        else:
+            var[s:s + chunk] = -tail_quantile(win[s:s + chunk], alpha, axis=1)
+    return var, out_es
+
+
+# ============================================================
+# 3. Cached asset-level scenario matrix
+# ============================================================
+
+@dataclass
+class ScenarioMatrix:
+    """
+    Asset-level scenario matrix (S x N: historical returns or MC draws) held once, so a
+    new weight vector costs one matrix-vector product plus one partition.
+    Portfolio P&L vectors are cached per weight vector (keyed by its bytes).
+    """
+    X: np.ndarray
+    tickers: list[str]
+    cache_size: int = 8
+    _pnl: dict = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_frame(cls, scenarios: pd.DataFrame, cache_size: int = 8) -> "ScenarioMatrix":
+        return cls(X=np.ascontiguousarray(scenarios.values), tickers=list(scenarios.columns),
+                   cache_size=cache_size)
+
+    @property
+    def n_scenarios(self) -> int:
+        return self.X.shape[0]
+
+    def weight_vector(self, weights: pd.Series) -> np.ndarray:
+        return weights.reindex(self.tickers).fillna(0.0).values.astype(np.float64)
+
+    def portfolio_pnl(self, weights: Union[pd.Series, np.ndarray]) -> np.ndarray:
+        """
+        (S,) float64 portfolio P&L for one weight vector (scenario dtype in the product,
+        as monte_carlo._portfolio_from_paths).
+        """
+        w = self.weight_vector(weights) if isinstance(weights, pd.Series) else np.asarray(weights, dtype=np.float64)
+        key = w.tobytes()
+        rp = self._pnl.get(key)
+        if rp is None:
+            rp = (self.X @ w.astype(self.X.dtype, copy=False)).astype(np.float64)
+            if len(self._pnl) >= self.cache_size:
+                self._pnl.pop(next(iter(self._pnl)))
+            self._pnl[key] = rp
+        return rp
+
+    def var_es(self, weights: Union[pd.Series, np.ndarray], alpha: Alphas = 0.99) -> tuple:
+        return tail_var_es(self.portfolio_pnl(weights), alpha)
+
+    def var_es_batch(self, W: np.ndarray, alpha: Alphas = 0.99) -> tuple[np.ndarray, np.ndarray]:
+        """
+        VaR / ES for a batch of weight vectors W (B x N): one (B x N) @ (N x S) product and
+        one row-wise partition.
+        """
+        P = (np.asarray(W, dtype=self.X.dtype) @ self.X.T).astype(np.float64)
+        return tail_var_es(P, alpha, axis=1)
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass(frozen=True)
@@ -48,3 +49,23 @@ def basel_traffic_light(exceptions: int) -> TrafficLightResult:
 
     m = 3.0 + plus
     return TrafficLightResult(exceptions=x, zone=zone, plus_factor=plus, multiplier_m=m)
+
+
+def basel_capital_charge(
+    var_latest: float,
+    var_avg_60d: float,
+    svar_latest: float,
+    svar_avg_60d: float,
+    multiplier_m: float = 3.0,
+    multiplier_s: Optional[float] = None,
+) -> float:
+    """
+    Basel 2.5 market risk capital with stressed VaR:
+
+      C = max(VaR_{t-1}, m_c * VaR_avg60) + max(sVaR_{t-1}, m_s * sVaR_avg60)
+
+    multiplier_m comes from basel_traffic_light; multiplier_s defaults to the same value.
+    sVaR inputs come from the stressed-window search (src.stressed_window).
+    """
+    m_s = multiplier_m if multiplier_s is None else multiplier_s
+    return float(max(var_latest, multiplier_m * var_avg_60d) + max(svar_latest, m_s * svar_avg_60d))
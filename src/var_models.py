@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
+
+from src.tail_stats import series_var_es
 
 
 def portfolio_returns(returns: pd.DataFrame, weights: pd.Series) -> pd.Series:
@@ -20,14 +21,15 @@ def var_historical(port_ret: pd.Series, alpha: float = 0.99) -> float:
     Historical Simulation VaR (positive number).
     VaR = -quantile_{1-alpha}(portfolio returns)
     """
-    q = port_ret.quantile(1 - alpha)
-    return float(-q)
+    return series_var_es(port_ret, alpha)[0]
 
 
 def var_parametric_gaussian(port_ret: pd.Series, alpha: float = 0.99) -> float:
     """
     Gaussian parametric VaR using mean and std of portfolio returns (positive number).
     """
+    from scipy.stats import norm
+
     mu = port_ret.mean()
     sigma = port_ret.std(ddof=1)
     z = norm.ppf(1 - alpha)  # negative
@@ -43,6 +45,8 @@ def var_cornish_fisher(port_ret: pd.Series, alpha: float = 0.99) -> float:
     z_cf = z + (1/6)(z^2-1)S + (1/24)(z^3-3z)K - (1/36)(2z^3-5z)S^2
     where S = skewness, K = excess kurtosis
     """
+    from scipy.stats import norm
+
     mu = port_ret.mean()
     sigma = port_ret.std(ddof=1)
 
@@ -0,0 +1,124 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.tail_stats import lerp, tail_index
+
+
+class WhatIfEvaluator:
+    """
+    Batch what-if evaluator for incremental VaR/ES of candidate trades.
+
+    Precomputed once:
+      - asset-level scenario P&L matrix X (S x N) and base portfolio P&L X w (sorted)
+      - Sigma w, w' Sigma w and w' mu for the Gaussian model
+
+    A candidate is a weight delta d (new weights = w + d). For a batch of K candidates:
+      - HS/MC: only scenarios that can still reach the new tail are re-priced.
+        Order statistics are 1-Lipschitz in the sup norm, so with
+        B = max_s |X_s d| <= |d| . max_s |X_s| no scenario with X_s w > q_hi + 2B can
+        enter the new tail; the tail is re-selected by partial selection on the rest.
+      - Gaussian: sigma'^2 = w'Sigma w + 2 d'Sigma w + d'Sigma d (quadratic-form update).
+    """
+
+    def __init__(
+        self,
+        scenarios: pd.DataFrame,
+        weights: pd.Series,
+        alpha: float = 0.99,
+        Sigma: Optional[np.ndarray] = None,
+        mu: Optional[np.ndarray] = None,
+        chunk_size: int = 256,
+    ):
+        from scipy.stats import norm
+
+        self.tickers = list(scenarios.columns)
+        self.alpha = float(alpha)
+        self.chunk_size = int(chunk_size)
+
+        self.X = np.asarray(scenarios.values, dtype=np.float64)
+        self.w = weights.reindex(self.tickers).fillna(0.0).values.astype(np.float64)
+        self.rp = self.X @ self.w
+        self.order = np.argsort(self.rp, kind="stable")
+        self.rp_sorted = self.rp[self.order]
+        self.abs_max = np.abs(self.X).max(axis=0)
+
+        # order statistics of the full sample (the chunk kernel only partitions a prefix)
+        self._lo, self._hi, self._frac = tail_index(len(self.rp), self.alpha)
+
+        # parametric state
+        self.mu = self.X.mean(axis=0) if mu is None else np.asarray(mu, dtype=np.float64)
+        self.Sigma = np.cov(self.X, rowvar=False) if Sigma is None else np.asarray(Sigma, dtype=np.float64)
+        self.Sw = self.Sigma @ self.w
+        self.wSw = float(self.w @ self.Sw)
+        self.mu_p = float(self.w @ self.mu)
+        self._z = norm.ppf(1 - self.alpha)
+        self._k_es = norm.pdf(self._z) / (1 - self.alpha)
+
+        self.base = self._evaluate_chunk(np.zeros((1, len(self.tickers))))[0]
+
+    # ------------------------------
+    # Kernels
+    # ------------------------------
+
+    def _hs_chunk(self, D: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        lo, hi, frac = self._lo, self._hi, self._frac
+        bound = float((np.abs(D) @ self.abs_max).max())
+        n_keep = int(np.searchsorted(self.rp_sorted, self.rp_sorted[hi] + 2.0 * bound, side="right"))
+        rows = self.order[:max(n_keep, hi + 1)]
+
+        P = self.rp[rows, None] + self.X[rows] @ D.T  # (|rows| x k)
+        part = np.partition(P, [lo, hi], axis=0)
+        q = lerp(part[lo], part[hi], frac)
+
+        tail = P <= q
+        es = -np.where(tail, P, 0.0).sum(axis=0) / tail.sum(axis=0)
+        return -q, es
+
+    def _gauss_chunk(self, D: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        dSd = np.einsum("kn,nm,km->k", D, self.Sigma, D)
+        var_p = np.clip(self.wSw + 2.0 * (D @ self.Sw) + dSd, 0.0, None)
+        sig = np.sqrt(var_p)
+        mu_p = self.mu_p + D @ self.mu
+        return -(mu_p + self._z * sig), -(mu_p - sig * self._k_es)
+
+    def _evaluate_chunk(self, D: np.ndarray) -> np.ndarray:
+        hs_var, hs_es = self._hs_chunk(D)
+        g_var, g_es = self._gauss_chunk(D)
+        return np.column_stack([hs_var, hs_es, g_var, g_es])
+
+    # ------------------------------
+    # Public API
+    # ------------------------------
+
+    def evaluate(self, deltas: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score a batch of candidate weight deltas.
+        deltas: (K x tickers) DataFrame, one row per candidate (missing tickers = 0).
+        Returns VaR/ES after the trade and the change vs the current book, per candidate.
+        """
+        D = deltas.reindex(columns=self.tickers).fillna(0.0).values.astype(np.float64)
+        out = np.empty((len(D), 4))
+        for s in range(0, len(D), self.chunk_size):
+            out[s:s + self.chunk_size] = self._evaluate_chunk(D[s:s + self.chunk_size])
+
+        df = pd.DataFrame(out, index=deltas.index, columns=["VaR_HS", "ES_HS", "VaR_Gauss", "ES_Gauss"])
+        for col, b in zip(df.columns.tolist(), self.base):
+            df[f"d{col}"] = df[col] - b
+        return df
+
+    def base_risk(self) -> dict:
+        return dict(zip(["VaR_HS", "ES_HS", "VaR_Gauss", "ES_Gauss"], map(float, self.base)))
+
+
+def single_name_trades(tickers: list[str], sizes: list[float]) -> pd.DataFrame:
+    """
+    Candidate grid: one trade per (ticker, size), e.g. sizes=[-0.01, 0.01] for +/-1% weight.
+    """
+    rows, idx = [], []
+    for t in tickers:
+        for s in sizes:
+            rows.append({t: float(s)})
+            idx.append(f"{t}:{s:+g}")
+    return pd.DataFrame(rows, index=idx, columns=tickers).fillna(0.0)
@@ -0,0 +1,46 @@
+from src.config import NIFTY50_TICKERS
+from src.data import download_price_data
+from src.returns import compute_log_returns, clean_returns
+from src.covariance import ledoit_wolf_covariance
+from src.portfolio import min_variance_weights
+from src.var_models import portfolio_returns, var_historical, var_parametric_gaussian
+from src.monte_carlo import mc_scenarios_student_t, mc_var_es_from_scenarios
+from src.attribution import hs_attribution, gaussian_attribution, scenario_attribution
+
+tickers = NIFTY50_TICKERS
+prices = download_price_data(tickers, "2016-01-01", "2023-12-31")
+prices = prices.dropna(axis=1, how="all")
+rets = clean_returns(compute_log_returns(prices), max_nan_frac=0.05)
+
+# weights from last 2y
+rets_est = rets.tail(504)
+Sigma = ledoit_wolf_covariance(rets_est)
+w = min_variance_weights(Sigma, tickers=list(rets_est.columns), weight_cap=0.05)
+rp = portfolio_returns(rets, w)
+
+alpha = 0.99
+
+# HS + Gaussian attribution on the full-sample panel (same data as the portfolio numbers)
+hs = hs_attribution(rets, w, alpha=alpha)
+ga = gaussian_attribution(rets, w, alpha=alpha)
+
+print("HS VaR (portfolio / attribution):", var_historical(rp, alpha), hs.var)
+print("Gaussian VaR (portfolio / attribution):", var_parametric_gaussian(rp, alpha), ga.var)
+assert abs(hs.var - var_historical(rp, alpha)) < 1e-10
+assert abs(ga.var - var_parametric_gaussian(rp, alpha)) < 1e-10
+
+# MC: one scenario matrix feeds both the portfolio number and the attribution
+sim = mc_scenarios_student_t(rets_est, df=6.0, n_sims=50_000, seed=42)
+mc_var, mc_es = mc_var_es_from_scenarios(sim, w, alpha=alpha)
+print("MC-t VaR/ES:", (mc_var, mc_es))
+mc = scenario_attribution(sim, w, alpha=alpha)
+assert abs(mc.var - mc_var) < 1e-10 and abs(mc.es - mc_es) < 1e-10
+
+for name, res in [("HS", hs), ("Gaussian", ga), ("MC-t", mc)]:
+    t = res.table[res.table["weight"] > 0]
+    print(f"\n=== {name} attribution (VaR={res.var:.5f}, ES={res.es:.5f}) ===")
+    print("Sum component VaR:", float(t["component_VaR"].sum()), "Sum component ES:", float(t["component_ES"].sum()))
+    print(t[["weight", "component_VaR", "pct_VaR", "incremental_VaR", "component_ES", "pct_ES"]].head(10))
+    # Euler allocation: components add up to the portfolio number
+    assert abs(res.table["component_VaR"].sum() - res.var) < 1e-10, name
+    assert abs(res.table["component_ES"].sum() - res.es) < 1e-10, name
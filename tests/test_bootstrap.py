@@ -0,0 +1,64 @@
+import time
+
+import numpy as np
+
+from src.config import NIFTY50_TICKERS
+from src.data import download_price_data
+from src.returns import compute_log_returns, clean_returns
+from src.covariance import ledoit_wolf_covariance
+from src.portfolio import min_variance_weights
+from src.var_models import portfolio_returns, var_historical, var_parametric_gaussian, var_cornish_fisher
+from src.es_models import es_historical, es_parametric_gaussian
+from src.fhs import fhs_var_es
+from src.bootstrap import bootstrap_indices, bootstrap_var_es
+
+
+def main():
+    prices = download_price_data(NIFTY50_TICKERS, "2016-01-01", "2023-12-31")
+    prices = prices.dropna(axis=1, how="all")
+    rets = clean_returns(compute_log_returns(prices), max_nan_frac=0.05)
+
+    rets_est = rets.tail(504)
+    Sigma = ledoit_wolf_covariance(rets_est)
+    w = min_variance_weights(Sigma, tickers=list(rets_est.columns), weight_cap=0.05)
+    rp = portfolio_returns(rets, w)
+
+    # Stationary bootstrap indices: consecutive runs within blocks, wrapping at the end
+    idx = bootstrap_indices(1000, 200, method="stationary", block_length=10, seed=1)
+    runs = (np.diff(idx, axis=1) % 1000 == 1).mean()
+    print(f"\nStationary bootstrap, L=10: share of in-block steps {runs:.3f} (expected ~0.9)")
+
+    alphas = [0.99, 0.975]
+    for method in ("iid", "stationary"):
+        t0 = time.perf_counter()
+        res = bootstrap_var_es(rp, alphas, n_boot=10_000, method=method)
+        print(f"\n=== {method} bootstrap: {res.n_boot:,} resamples, {time.perf_counter() - t0:.2f}s ===")
+        print(res.ci(0.90).round(5))
+
+    # point estimates are the existing model functions
+    pt = res.point
+    fhs_v, fhs_e = fhs_var_es(rp, alpha=0.99)
+    checks = {
+        ("HS", "VaR"): var_historical(rp, 0.99),
+        ("HS", "ES"): es_historical(rp, 0.99),
+        ("Gaussian", "VaR"): var_parametric_gaussian(rp, 0.99),
+        ("Gaussian", "ES"): es_parametric_gaussian(rp, 0.99),
+        ("Cornish-Fisher", "VaR"): var_cornish_fisher(rp, 0.99),
+        ("FHS", "VaR"): fhs_v,
+        ("FHS", "ES"): fhs_e,
+    }
+    for (model, measure), ref in checks.items():
+        assert abs(pt[(model, measure, 0.99)] - ref) < 1e-12, (model, measure)
+
+    print("\nPaired VaR differences (99%):")
+    print(res.differences("VaR", 0.99).round(5))
+
+    # Process pool over the same index matrix gives the same replicates
+    t0 = time.perf_counter()
+    pooled = bootstrap_var_es(rp, alphas, n_boot=10_000, method="stationary", max_workers=2)
+    print(f"\nProcess pool (2 workers): {time.perf_counter() - t0:.2f}s")
+    assert np.array_equal(pooled.samples.values, res.samples.values)
+
+
+if __name__ == "__main__":
+    main()
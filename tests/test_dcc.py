@@ -0,0 +1,83 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.config import NIFTY50_TICKERS
+from src.data import download_price_data
+from src.returns import compute_log_returns, clean_returns
+from src.covariance import ledoit_wolf_covariance
+from src.portfolio import min_variance_weights
+from src.var_models import portfolio_returns, var_parametric_gaussian
+from src.garch_model import fit_garch11_normal
+from src.monte_carlo import mc_var_es_from_scenarios
+from src.stress import corr_from_cov, cov_from_corr, portfolio_sigma_from_cov, stress_correlations
+from src.dcc import (
+    fit_dcc,
+    dcc_parametric_var,
+    dcc_mc_scenarios,
+    dcc_stressed_correlation,
+)
+
+prices = download_price_data(NIFTY50_TICKERS, "2016-01-01", "2023-12-31")
+prices = prices.dropna(axis=1, how="all")
+rets = clean_returns(compute_log_returns(prices), max_nan_frac=0.05)
+
+rets_est = rets.tail(504)
+Sigma = ledoit_wolf_covariance(rets_est)
+w = min_variance_weights(Sigma, tickers=list(rets_est.columns), weight_cap=0.05)
+rp = portfolio_returns(rets, w)
+
+# Two-step fit: batched univariate GARCH, then (a, b) by composite likelihood
+t0 = time.perf_counter()
+res = fit_dcc(rets)
+print(f"\nDCC fit on {rets.shape[1]} assets x {len(rets)} days: {time.perf_counter() - t0:.2f}s")
+print(f"a={res.a:.4f}  b={res.b:.4f}  a+b={res.a + res.b:.4f}  pairs={res.n_pairs}  CL={res.composite_loglik:.1f}")
+print(res.garch[["alpha", "beta", "persistence", "iterations"]].describe().T)
+
+# Batched variance-targeted fits vs arch (free omega) on a few names
+T = len(rets)
+for tk in list(rets.columns[:3]):
+    fit = fit_garch11_normal(rets[tk], mean="Zero")
+    ll_arch = fit.loglikelihood + 0.5 * T * np.log(1e4)  # arch works on percent returns
+    g = res.garch.loc[tk]
+    print(f"{tk:14s} arch a={fit.params['alpha[1]']:.4f} b={fit.params['beta[1]']:.4f} ll={ll_arch:.2f} | "
+          f"batch a={g['alpha']:.4f} b={g['beta']:.4f} ll={g['loglik']:.2f}")
+
+# Closed-form R_t vs the plain Q_t recursion
+Z = res.z
+Q = res.Qbar.copy()
+for t in range(1, len(Z) + 1):
+    Q = (1 - res.a - res.b) * res.Qbar + res.a * np.outer(Z[t - 1], Z[t - 1]) + res.b * Q
+d = np.sqrt(np.diag(Q))
+err = float(np.abs(Q / np.outer(d, d) - res.correlation()).max())
+print("Max |R_T+1 - recursion|:", err)
+assert err < 1e-10
+
+# Portfolio variance path (no N x N per date) vs w' Sigma_t w from the closed form
+pv = res.portfolio_variance(w)
+wv_all = w.reindex(res.tickers).fillna(0.0).values
+for date in list(rets.index[[0, len(rets) // 2, -1]]) + [None]:
+    ref = wv_all @ res.covariance(date) @ wv_all
+    got = pv.iloc[-1] if date is None else pv.loc[date]
+    assert abs(got - ref) < 1e-12 * ref, date
+
+# Time-varying VaR / ES vs the static LW Gaussian number
+var_es = dcc_parametric_var(res, w, alpha=0.99)
+print("\nDCC Gaussian VaR/ES (99%), last dates + forecast:")
+print(var_es.tail(3))
+print(f"Static Gaussian VaR: {var_parametric_gaussian(rp, 0.99):.4%}")
+print("DCC VaR range:", var_es["VaR"].describe()[["min", "50%", "max"]].to_dict())
+
+scen = dcc_mc_scenarios(res, n_sims=50_000, dist="t", df=6)
+print("MC-t (DCC Sigma_T+1) VaR/ES:", mc_var_es_from_scenarios(scen, w, alpha=0.99))
+
+# Peak-correlation stress vs the uniform multiplier
+avg = res.average_correlation()
+peak, R_peak = dcc_stressed_correlation(res)
+print(f"\nAverage correlation: latest {avg.iloc[-1]:.3f}, peak {avg.max():.3f} on {pd.Timestamp(peak).date()}")
+Corr, vol = corr_from_cov(Sigma)
+R_peak = pd.DataFrame(R_peak, index=res.tickers, columns=res.tickers).loc[rets_est.columns, rets_est.columns].values
+wv = w.reindex(rets_est.columns).fillna(0.0).values
+for name, C in (("LW", Corr), ("x1.3", stress_correlations(Corr, factor=1.3, cap=0.99)), ("DCC peak", R_peak)):
+    print(f"3σ loss, {name:8s}: {3 * portfolio_sigma_from_cov(cov_from_corr(vol, C), wv):.4%}")
@@ -0,0 +1,38 @@
+import time
+
+from src.config import NIFTY50_TICKERS
+from src.data import download_price_data
+from src.returns import compute_log_returns, clean_returns
+from src.diagnostics import (
+    ljung_box,
+    panel_diagnostics,
+    rolling_ljung_box,
+    rolling_panel_moments,
+)
+
+prices = download_price_data(NIFTY50_TICKERS, "2016-01-01", "2023-12-31")
+prices = prices.dropna(axis=1, how="all")
+rets = clean_returns(compute_log_returns(prices), max_nan_frac=0.05).dropna(how="any")
+
+# Every constituent at once: moments + JB, Ljung-Box (levels / squares), ARCH-LM
+t0 = time.perf_counter()
+diag = panel_diagnostics(rets, lags=[5, 10, 20], arch_lags=5)
+print(f"\nPanel diagnostics for {rets.shape[1]} assets ({time.perf_counter() - t0:.3f}s)")
+print(diag[["skew", "excess_kurt", "jb_p_value", "p_10", "sq_p_10", "arch_p_value"]].round(4))
+
+# Cross-check one column against the single-series statsmodels wrapper
+name = rets.columns[0]
+print(f"\n{name}: panel Q_10={diag.loc[name, 'Q_10']:.4f}  ljung_box={ljung_box(rets[name], 10)['lb_stat']:.4f}")
+
+# Rolling variants (running sums)
+t0 = time.perf_counter()
+rlb = rolling_ljung_box(rets ** 2, window=250, lags=10)
+rmom = rolling_panel_moments(rets, [250])
+print(f"\nRolling LB(r^2) + moments ({time.perf_counter() - t0:.3f}s)")
+print("Share of windows with ARCH effects (LB(r^2) p<0.05):")
+print((rlb["p_value"] < 0.05).mean().sort_values(ascending=False).head(10))
+print("\nLatest 250d JB p-values (lowest 5):")
+print(rmom["jb_p_value"][250].iloc[-1].sort_values().head())
+
+diag.to_csv("outputs/panel_diagnostics.csv")
+print("\nSaved: outputs/panel_diagnostics.csv")
@@ -0,0 +1,43 @@
+import time
+
+from src.config import NIFTY50_TICKERS
+from src.data import download_price_data
+from src.returns import compute_log_returns, clean_returns
+from src.covariance import ledoit_wolf_covariance
+from src.portfolio import min_variance_weights
+from src.var_models import portfolio_returns
+from src.backtesting import rolling_historical_var, compute_exceptions, kupiec_pof_test
+from src.ensemble import rolling_model_ensemble
+
+prices = download_price_data(NIFTY50_TICKERS, "2016-01-01", "2023-12-31")
+prices = prices.dropna(axis=1, how="all")
+rets = clean_returns(compute_log_returns(prices), max_nan_frac=0.05)
+
+rets_est = rets.tail(504)
+Sigma = ledoit_wolf_covariance(rets_est)
+w = min_variance_weights(Sigma, tickers=list(rets_est.columns), weight_cap=0.05)
+rp = portfolio_returns(rets, w)
+
+alpha = 0.99
+window = 250
+
+t0 = time.perf_counter()
+res = rolling_model_ensemble(rets, w, alpha=alpha, window=window, n_sims=10_000, garch_refit=20)
+print(f"\nNine-model rolling ensemble ({time.perf_counter() - t0:.2f}s)")
+print(res.forecasts.tail())
+
+# HS column must reproduce the existing rolling HS backtest series
+diff = (res.forecasts["HS"] - rolling_historical_var(rp, alpha=alpha, window=window)).abs().max()
+print("Max |HS - rolling_historical_var|:", diff)
+
+print("\n=== Kupiec POF per model ===")
+for name in res.forecasts.columns:
+    bt = kupiec_pof_test(compute_exceptions(rp, res.forecasts[name].dropna()), alpha=alpha)
+    print(f"{name:15s} exceptions={bt['x']:3d}/{bt['n']}  p={bt['p_value']:.3f}")
+
+print("\n=== Model spread (VaR max - min) ===")
+print(res.spread.describe())
+
+res.forecasts.to_csv("outputs/ensemble_var_alpha99.csv")
+res.spread.to_csv("outputs/model_spread_alpha99.csv")
+print("\nSaved: outputs/ensemble_var_alpha99.csv, outputs/model_spread_alpha99.csv")
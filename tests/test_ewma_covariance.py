@@ -0,0 +1,85 @@
+import time
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from src.config import NIFTY50_TICKERS
+from src.data import download_price_data
+from src.returns import compute_log_returns, clean_returns
+from src.covariance import ledoit_wolf_covariance
+from src.portfolio import min_variance_weights
+from src.var_models import portfolio_returns, var_ewma_parametric
+from src.volatility import ewma_variance
+from src.monte_carlo import mc_var_es_from_scenarios
+from src.ewma_covariance import (
+    ewma_covariance,
+    ewma_parametric_var,
+    ewma_mc_var_es,
+    ewma_mc_scenarios,
+)
+
+prices = download_price_data(NIFTY50_TICKERS, "2016-01-01", "2023-12-31")
+prices = prices.dropna(axis=1, how="all")
+rets = clean_returns(compute_log_returns(prices), max_nan_frac=0.05)
+
+rets_est = rets.tail(504)
+Sigma = ledoit_wolf_covariance(rets_est)
+w = min_variance_weights(Sigma, tickers=list(rets_est.columns), weight_cap=0.05)
+rp = portfolio_returns(rets, w)
+ew = pd.Series(1.0 / rets.shape[1], index=rets.columns)
+
+# Full path, upper-triangle storage in float32
+t0 = time.perf_counter()
+cov = ewma_covariance(rets, lam=0.94, precision="float32")
+print(f"\nTriangle storage {cov.data.shape} {cov.data.dtype}: {cov.data.nbytes / 1e6:.1f} MB "
+      f"(dense float64 would be {len(rets) * rets.shape[1] ** 2 * 8 / 1e6:.1f} MB), {time.perf_counter() - t0:.2f}s")
+
+# Portfolio-only storage: just w' Sigma_t w
+book = pd.DataFrame({"min_var": w, "equal": ew})
+pcov = ewma_covariance(rets, lam=0.94, storage="portfolio", weights=book)
+print("Portfolio storage:", pcov.data.shape, f"{pcov.data.nbytes / 1e3:.1f} kB")
+
+ref = ewma_variance(rp).values
+diff = np.abs(pcov.data[:, 0] - ref).max()
+print("Max |w'Sigma_t w - ewma_variance(port)|:", diff)
+assert diff < 1e-12 * ref.max()
+
+# float64 triangle vs the dense Sigma_t recursion, every date
+cov64 = ewma_covariance(rets, lam=0.94)
+X = rets.values
+S = np.cov(X, rowvar=False, ddof=1)
+err = 0.0
+for t in range(len(X)):
+    err = max(err, float(np.abs(cov64.cov(rets.index[t]) - S).max()))
+    S = 0.94 * S + 0.06 * np.outer(X[t], X[t])
+print("Max |triangle - dense recursion|:", err)
+assert err < 1e-12 * np.abs(S).max()
+assert np.allclose(cov64.portfolio_variance(w).values[:, 0], ref, rtol=1e-12, atol=0)
+assert np.allclose(cov64.next_cov, S, rtol=1e-12, atol=1e-18)
+
+# float32 storage: each stored entry is rounded to 2^-24 relative, so the error of
+# w' Sigma_t w is within 2^-24 |w|'|Sigma_t||w| of the float64 result
+diff32 = (cov.portfolio_variance(book) - pcov.portfolio_variance(book)).abs()
+bound = replace(cov64, data=np.abs(cov64.data)).portfolio_variance(book.abs()) * 2.0 ** -24
+print("Max |float32 triangle - float64 portfolio| variance:", diff32.max().max(),
+      "| max error / bound:", float((diff32 / bound).max().max()))
+assert (diff32 <= bound * (1 + 1e-6)).all().all()
+
+# Rolling parametric VaR / ES from Sigma_t
+var_es = ewma_parametric_var(cov, book, alpha=0.99)
+print("\nLatest EWMA VaR/ES (99%):")
+print(var_es.iloc[-1].unstack(0))
+d_var = float((var_es[("VaR", "min_var")] - var_ewma_parametric(rp, alpha=0.99)).abs().max())
+print("Max |VaR - var_ewma_parametric|:", d_var)
+assert d_var < 1e-9  # float32 variances under the square root
+
+# Rolling MC VaR on the last year (common random numbers), t innovations
+t0 = time.perf_counter()
+mc = ewma_mc_var_es(cov, w, alpha=0.99, n_sims=20_000, dist="t", df=6, dates=rets.index[-250:])
+print(f"\nRolling MC-t VaR, 250 dates ({time.perf_counter() - t0:.2f}s):")
+print(mc.describe().T[["mean", "min", "max"]])
+
+# Today's asset scenarios with the EWMA covariance, through the existing MC tooling
+scen = ewma_mc_scenarios(cov, n_sims=50_000, dist="normal")
+print("\nMC-N (EWMA Sigma_T+1) VaR/ES:", mc_var_es_from_scenarios(scen, w, alpha=0.99))
@@ -0,0 +1,67 @@
+import time
+
+import numpy as np
+
+from src.config import NIFTY50_TICKERS
+from src.data import download_price_data
+from src.returns import compute_log_returns, clean_returns
+from src.covariance import ledoit_wolf_covariance
+from src.portfolio import min_variance_weights
+from src.var_models import portfolio_returns
+from src.horizon_var import horizon_log_return
+from src.garch_model import (
+    fit_garch11_normal,
+    fit_garch11_t,
+    garch_params,
+    garch_var_series,
+    garch_var_series_t,
+    garch_variance_term_structure,
+    garch_horizon_var_es,
+)
+from src.margin import im_proxy_table
+
+prices = download_price_data(NIFTY50_TICKERS, "2016-01-01", "2023-12-31")
+prices = prices.dropna(axis=1, how="all")
+rets = clean_returns(compute_log_returns(prices), max_nan_frac=0.05)
+
+rets_est = rets.tail(504)
+Sigma = ledoit_wolf_covariance(rets_est)
+w = min_variance_weights(Sigma, tickers=list(rets_est.columns), weight_cap=0.05)
+rp = portfolio_returns(rets, w)
+
+alpha = 0.99
+mpor_days = 10
+
+res_gn = fit_garch11_normal(rp, mean="Zero")
+res_gt = fit_garch11_t(rp, mean="Zero")
+
+# Analytic variance term structure vs arch's own multi-step forecast
+for name, res in (("GARCH-N", res_gn), ("GARCH-t", res_gt)):
+    ts = garch_variance_term_structure(res, horizon=mpor_days)
+    arch_fc = res.forecast(horizon=mpor_days, reindex=False).variance.values[-1] / 1e4
+    g = garch_params(res)
+    print(f"\n=== {name}: persistence {g['persistence']:.4f} ===")
+    print(ts)
+    print("Max |analytic - arch forecast| (variance):", float(np.abs(ts["sigma_1d"].values ** 2 - arch_fc).max()))
+
+# Horizon Monte Carlo: paths vs analytic variance, timing
+for n_paths in (100_000, 500_000):
+    t0 = time.perf_counter()
+    v, e = garch_horizon_var_es(res_gt, horizon=mpor_days, alpha=alpha, n_paths=n_paths)
+    print(f"\nGARCH-t {mpor_days}d MC ({n_paths:,} paths, {time.perf_counter() - t0:.2f}s): VaR={v:.4%} ES={e:.4%}")
+
+var_1d = {
+    "GARCH-N": float(garch_var_series(res_gn, alpha=alpha).iloc[-1]),
+    "GARCH-t": float(garch_var_series_t(res_gt, alpha=alpha).iloc[-1]),
+}
+fits = {"GARCH-N": res_gn, "GARCH-t": res_gt}
+
+print("\n=== IM proxy: sqrt-of-time (default) ===")
+print(im_proxy_table(var_1d, mpor_days=mpor_days))
+for method in ("garch_analytic", "garch_mc"):
+    print(f"\n=== IM proxy: {method} ===")
+    print(im_proxy_table(var_1d, mpor_days=mpor_days, method=method, garch_fits=fits, alpha=alpha))
+
+# Realised 10-day losses for reference
+r10 = horizon_log_return(rp, horizon_days=mpor_days).dropna()
+print(f"\nEmpirical 10d 99% quantile loss (overlapping): {-np.quantile(r10, 1 - alpha):.4%}")
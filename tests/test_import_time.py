@@ -0,0 +1,58 @@
+import subprocess
+import sys
+from pathlib import Path
+
+# Cold-start benchmark: import every src module in a fresh interpreter and check that
+# the heavy optional libraries stay unloaded until a function actually needs them.
+
+HEAVY = (
+    "scipy.stats", "scipy.optimize", "scipy.signal", "sklearn", "arch",
+    "yfinance", "statsmodels", "matplotlib",
+)
+BUDGET_OVER_BASELINE = 0.25  # seconds on top of `import numpy, pandas`
+CLI_BUDGET = 0.10            # `nifty-risk --help` must not even load pandas
+
+PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import {module}
+dt = time.perf_counter() - t0
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(dt, ",".join(heavy))
+"""
+
+
+def cold_import(module: str, repeats: int = 3) -> tuple[float, str]:
+    best, heavy = float("inf"), ""
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).resolve().parents[1],
+        ).stdout.split()
+        best = min(best, float(out[0]))
+        heavy = out[1] if len(out) > 1 else ""
+    return best, heavy
+
+
+baseline, _ = cold_import("numpy, pandas")
+print(f"Baseline (numpy + pandas): {baseline:.3f}s\n")
+
+modules = sorted(p.stem for p in Path("src").glob("*.py") if p.stem != "__init__")
+rows = []
+for name in modules:
+    t, heavy = cold_import(f"src.{name}")
+    budget = CLI_BUDGET if name in ("cli", "config") else baseline + BUDGET_OVER_BASELINE
+    ok = t <= budget and not heavy
+    rows.append((name, t, heavy, ok))
+    print(f"src.{name:18s} {t:6.3f}s  {'ok ' if ok else 'SLOW'}  {heavy}")
+
+bad = [r for r in rows if not r[3]]
+assert not bad, f"modules over budget or loading heavy deps at import: {[r[0] for r in bad]}"
+
+# The lazy imports must still resolve when used
+from src.pipeline import DEFAULT_PREWARM, prewarm
+
+t, _ = cold_import("src.pipeline; src.pipeline.prewarm()")
+print(f"\nprewarm({', '.join(DEFAULT_PREWARM)}): {t:.2f}s in a fresh interpreter")
+prewarm()
+print("All modules within budget.")
@@ -0,0 +1,54 @@
+import time
+
+import numpy as np
+
+from src.config import NIFTY50_TICKERS
+from src.data import download_price_data
+from src.returns import compute_log_returns, clean_returns
+from src.covariance import ledoit_wolf_covariance
+from src.portfolio import min_variance_weights
+from src.var_models import portfolio_returns
+from src.backtesting import kupiec_pof_test
+from src.monte_carlo import mc_var_es_adaptive, mc_var_es_student_t, tail_standard_errors
+from src.mc_backtest import backtest_exceptions, rolling_mc_var_adaptive
+
+prices = download_price_data(NIFTY50_TICKERS, "2016-01-01", "2023-12-31")
+prices = prices.dropna(axis=1, how="all")
+rets = clean_returns(compute_log_returns(prices), max_nan_frac=0.05)
+
+rets_est = rets.tail(504)
+Sigma = ledoit_wolf_covariance(rets_est)
+w = min_variance_weights(Sigma, tickers=list(rets_est.columns), weight_cap=0.05)
+rp = portfolio_returns(rets, w)
+
+alpha = 0.99
+
+# Order-statistic standard errors vs the spread of repeated fixed-size estimates
+rng = np.random.default_rng(0)
+est = np.array([tail_standard_errors(rng.standard_t(5, 20_000), alpha) for _ in range(200)])
+print(f"\nt5, n=20k: sd(VaR) {est[:, 0].std():.4f} vs mean se {est[:, 2].mean():.4f} | "
+      f"sd(ES) {est[:, 1].std():.4f} vs mean se {est[:, 3].mean():.4f}")
+assert 0.8 < est[:, 2].mean() / est[:, 0].std() < 1.25 and 0.8 < est[:, 3].mean() / est[:, 1].std() < 1.25
+
+# One date: precision target instead of a fixed 50k
+v_fix, e_fix = mc_var_es_student_t(rets_est, w, df=6, alpha=alpha, n_sims=50_000)
+print(f"MC-t fixed 50k:    VaR {v_fix:.4%}  ES {e_fix:.4%}")
+for method in ("order_stat", "batch_means"):
+    t0 = time.perf_counter()
+    res = mc_var_es_adaptive(rets_est, w, alpha=alpha, dist="t", df=6, rel_tol=0.005, se_method=method)
+    print(f"MC-t {method:11s}: VaR {res.var:.4%} ± {res.var_se:.4%}  ES {res.es:.4%} ± {res.es_se:.4%}  "
+          f"n={res.n_sims:,} converged={res.converged} ({time.perf_counter() - t0:.2f}s)")
+    assert res.converged and abs(res.var - v_fix) < 4 * res.var_se + 0.005 * v_fix
+
+# Rolling: scenarios used per date follow the tail noise, not a fixed budget
+t0 = time.perf_counter()
+roll = rolling_mc_var_adaptive(rets, w, alpha=alpha, window=504, dist="t", df=6.0, rel_tol=0.03)
+print(f"\nRolling adaptive MC-t over {len(roll)} dates: {time.perf_counter() - t0:.2f}s, "
+      f"{roll['n_sims'].sum():,} scenarios in total, all converged: {roll['converged'].all()}")
+print(roll["n_sims"].describe()[["min", "50%", "max"]].to_dict())
+print("Most simulated dates:")
+print(roll.nlargest(5, "n_sims")[["VaR", "VaR_se", "n_sims"]])
+
+exc = backtest_exceptions(rp, roll["VaR"])
+kp = kupiec_pof_test(exc, alpha=alpha)
+print("Obs:", kp["n"], "Exceptions:", kp["x"], "Kupiec p-value:", round(kp["p_value"], 4))
@@ -0,0 +1,62 @@
+import time
+
+import numpy as np
+from scipy.stats import norm, t as student_t
+
+from src.config import NIFTY50_TICKERS
+from src.data import download_price_data
+from src.returns import compute_log_returns, clean_returns
+from src.covariance import ledoit_wolf_covariance
+from src.portfolio import min_variance_weights
+from src.monte_carlo import is_parameters, mc_var_es_is, mc_var_es_normal, mc_var_es_student_t
+
+prices = download_price_data(NIFTY50_TICKERS, "2016-01-01", "2023-12-31")
+prices = prices.dropna(axis=1, how="all")
+rets = clean_returns(compute_log_returns(prices), max_nan_frac=0.05)
+
+rets_est = rets.tail(504)
+Sigma = ledoit_wolf_covariance(rets_est)
+w = min_variance_weights(Sigma, tickers=list(rets_est.columns), weight_cap=0.05)
+
+alpha = 0.999
+p = 1 - alpha
+df = 6.0
+
+# Closed forms: the portfolio of the Normal / elliptical-t model is Normal / scaled t
+wv = w.reindex(rets_est.columns).fillna(0.0).values
+mu_p = float(rets_est.mean().values @ wv)
+sig_p = float(np.sqrt(wv @ rets_est.cov().values @ wv))
+z, q = norm.ppf(p), student_t.ppf(p, df)
+exact = {
+    "normal": (-(mu_p + z * sig_p), -(mu_p - sig_p * norm.pdf(z) / p)),
+    "t": (-(mu_p + q * sig_p), -(mu_p - sig_p * student_t.pdf(q, df) * (df + q ** 2) / ((df - 1) * p))),
+}
+
+n_plain, n_is, n_rep = 100_000, 10_000, 50
+for dist, plain in (("normal", mc_var_es_normal), ("t", mc_var_es_student_t)):
+    kw = {} if dist == "normal" else {"df": df}
+    params = is_parameters(alpha, dist, df)
+
+    t0 = time.perf_counter()
+    est_plain = np.array([plain(rets_est, w, alpha=alpha, n_sims=n_plain, seed=s, **kw) for s in range(n_rep)])
+    t1 = time.perf_counter()
+    est_is = np.array([mc_var_es_is(rets_est, w, alpha=alpha, dist=dist, df=df, n_sims=n_is, seed=s, params=params)
+                       for s in range(n_rep)])
+    t2 = time.perf_counter()
+
+    v0, e0 = exact[dist]
+    sd_plain, sd_is = est_plain.std(axis=0, ddof=1), est_is.std(axis=0, ddof=1)
+    print(f"\n=== {dist} at {alpha:.1%}: {params} ===")
+    print(f"exact            VaR {v0:.4%}  ES {e0:.4%}")
+    print(f"plain {n_plain:>7,}    VaR {est_plain[:, 0].mean():.4%} (sd {sd_plain[0]:.5%})  "
+          f"ES {est_plain[:, 1].mean():.4%} (sd {sd_plain[1]:.5%})  {(t1 - t0) / n_rep * 1e3:.0f} ms/run")
+    print(f"IS    {n_is:>7,}    VaR {est_is[:, 0].mean():.4%} (sd {sd_is[0]:.5%})  "
+          f"ES {est_is[:, 1].mean():.4%} (sd {sd_is[1]:.5%})  {(t2 - t1) / n_rep * 1e3:.0f} ms/run")
+
+    # scenarios plain MC would need to match the IS standard deviation
+    needed = n_plain * (sd_plain / sd_is) ** 2
+    print(f"plain-MC scenarios for IS precision: VaR {needed[0]:,.0f}, ES {needed[1]:,.0f} "
+          f"({needed[0] / n_is:.0f}x / {needed[1] / n_is:.0f}x the IS budget)")
+
+    assert abs(est_is[:, 0].mean() - v0) < 3 * sd_is[0] / np.sqrt(n_rep) + 1e-4 * v0
+    assert needed.min() >= 10 * n_is
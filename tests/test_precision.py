@@ -0,0 +1,99 @@
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.monte_carlo import mc_scenarios_normal, mc_var_es_normal, mc_var_es_student_t, _cov_factor, _tail_var_es
+from src.precision import set_default_precision
+
+
+# --------------------------
+# Synthetic panel (no download needed): 50 assets, 2y of daily returns
+# --------------------------
+n_assets = 50
+n_obs = 504
+n_sims = 1_000_000
+alpha_list = [0.99, 0.975, 0.999]
+
+rng = np.random.default_rng(0)
+A = rng.normal(0, 0.01, size=(n_assets, n_assets))
+Sigma_true = A @ A.T / n_assets + np.diag(rng.uniform(1e-5, 4e-4, n_assets))
+rets = pd.DataFrame(
+    rng.multivariate_normal(np.zeros(n_assets), Sigma_true, size=n_obs),
+    columns=[f"A{i}" for i in range(n_assets)],
+)
+w = pd.Series(1.0 / n_assets, index=rets.columns)
+
+
+# --------------------------
+# 1) Accuracy: identical draws, float64 vs float32 storage
+# --------------------------
+mu = rets.mean().values
+Sigma = rets.cov().values
+L = _cov_factor(Sigma)
+z64 = rng.standard_normal((n_sims, n_assets))
+u64 = rng.chisquare(6.0, size=n_sims)
+
+rows = []
+for dist in ["normal", "t"]:
+    sim64 = z64 @ L.T
+    if dist == "t":
+        sim64 *= np.sqrt(6.0 / u64)[:, None]
+    sim64 += mu
+    sim32 = sim64.astype(np.float32)
+    rp64 = sim64 @ w.values
+    rp32 = sim32 @ w.values.astype(np.float32)
+    del sim64, sim32
+
+    for alpha in alpha_list:
+        v64, e64 = _tail_var_es(rp64, alpha)
+        v32, e32 = _tail_var_es(rp32, alpha)
+        rows.append({
+            "dist": dist,
+            "alpha": alpha,
+            "VaR_f64": v64,
+            "VaR_f32": v32,
+            "dVaR_bp": 1e4 * (v32 - v64),
+            "ES_f64": e64,
+            "ES_f32": e32,
+            "dES_bp": 1e4 * (e32 - e64),
+        })
+
+acc = pd.DataFrame(rows)
+print("\n=== Float32 vs float64 on identical draws (1M scenarios) ===")
+print(acc.to_string(index=False))
+
+
+# --------------------------
+# 2) Memory + throughput of the full MC call
+# --------------------------
+perf = []
+for precision in ["float64", "float32"]:
+    for name, fn in [("MC-N", mc_var_es_normal), ("MC-t", mc_var_es_student_t)]:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        v, e = fn(rets, w, alpha=0.99, n_sims=n_sims, seed=42, precision=precision)
+        secs = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        perf.append({
+            "model": name,
+            "precision": precision,
+            "VaR_99": v,
+            "ES_99": e,
+            "seconds": secs,
+            "scen_per_sec_M": n_sims / secs / 1e6,
+            "peak_MB": peak / 2**20,
+        })
+
+perf = pd.DataFrame(perf)
+print("\n=== Memory / throughput (1M scenarios x 50 assets) ===")
+print(perf.to_string(index=False))
+
+# Process-wide default: precision=None (the default) follows set_default_precision
+set_default_precision("float32")
+assert (mc_scenarios_normal(rets, n_sims=1000).dtypes == np.float32).all()
+assert (mc_scenarios_normal(rets, n_sims=1000, precision="float64").dtypes == np.float64).all()
+set_default_precision("float64")
+assert (mc_scenarios_normal(rets, n_sims=1000).dtypes == np.float64).all()
@@ -0,0 +1,141 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import numpy as np
+import pandas as pd
+
+from src.config import RISK_PACK_DEFAULTS
+from src.covariance import ledoit_wolf_covariance
+from src.ingestion import HTTPSource, LocalPriceServer, SyntheticSource
+from src.monte_carlo import mc_scenarios_normal, mc_var_es_from_scenarios
+from src.portfolio import min_variance_weights
+from src.service import PriceLoader, RiskService
+from src.var_models import portfolio_returns, var_historical, var_parametric_gaussian, var_ewma_parametric
+from src.es_models import es_historical
+
+cfg = dict(RISK_PACK_DEFAULTS, n_sims=20_000)
+
+
+def post(url: str, payload: dict) -> dict:
+    req = Request(url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"})
+    with urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read())
+
+
+def main():
+    with LocalPriceServer(SyntheticSource(seed=3)) as prices_srv:
+        source = HTTPSource(prices_srv.url)
+
+        t0 = time.perf_counter()
+        loader = PriceLoader(cfg, source=source, end="2023-06-30")
+        with RiskService(loader, port=0, max_batch=64, max_wait=0.002, load_in_process=True) as svc:
+            state = svc.state
+            print(f"\nState loaded in {time.perf_counter() - t0:.2f}s:", state.summary())
+
+            # Min-variance weights as in the risk pack
+            rets = pd.DataFrame(state.hs, columns=state.tickers)
+            Sigma = ledoit_wolf_covariance(rets.tail(cfg["est_window"]))
+            w = min_variance_weights(Sigma, tickers=state.tickers, weight_cap=cfg["weight_cap"])
+            rp = portfolio_returns(rets, w)
+
+            res = post(svc.url + "/var", {"weights": w.to_dict(), "alpha": 0.99, "attribution": True})
+            print("\n=== Service vs. library (alpha=0.99) ===")
+            mc = mc_var_es_from_scenarios(mc_scenarios_normal(rets.tail(cfg["est_window"]), n_sims=cfg["n_sims"],
+                                                              seed=cfg["seed"]), w, alpha=0.99)
+            checks = {
+                "HS VaR": (res["risk"]["HS"]["VaR"], var_historical(rp, 0.99)),
+                "HS ES": (res["risk"]["HS"]["ES"], es_historical(rp, 0.99)),
+                "Gaussian VaR": (res["risk"]["Gaussian"]["VaR"], var_parametric_gaussian(rp, 0.99)),
+                "EWMA VaR": (res["risk"]["EWMA"]["VaR"], float(var_ewma_parametric(rp, 0.99).iloc[-1])),
+                "MC-N VaR": (res["risk"]["MC-N"]["VaR"], mc[0]),
+                "MC-N ES": (res["risk"]["MC-N"]["ES"], mc[1]),
+            }
+            for k, (a, b) in checks.items():
+                print(f"{k:14s} service={a:.6f}  library={b:.6f}  diff={abs(a - b):.2e}")
+                assert abs(a - b) < 1e-10, k
+            attr = res["attribution"]
+            print("Sum Gaussian component VaR:", sum(attr["Gaussian_component_VaR"].values()),
+                  "| HS component ES:", sum(attr["HS_component_ES"].values()))
+            print(pd.DataFrame(res["risk"]).T)
+
+            # alpha outside (0, 1) is a per-request error (HTTP 400), not a meaningless VaR
+            bad_alphas = (1.5, 1.0, 0.0, -0.2)
+            for bad in bad_alphas:
+                try:
+                    post(svc.url + "/var", {"weights": w.to_dict(), "alpha": bad})
+                    raise AssertionError(f"alpha={bad} accepted")
+                except HTTPError as e:
+                    assert e.code == 400 and "alpha must be in (0, 1)" in json.loads(e.read())["error"]
+
+            # Random long-only portfolios
+            rng = np.random.default_rng(0)
+            n_req = 2000
+            W = rng.dirichlet(np.ones(len(state.tickers)), size=n_req)
+
+            def one(i):
+                t = time.perf_counter()
+                r = post(svc.url + "/var", {"weights": W[i].tolist(), "models": ["HS", "Gaussian-LW", "MC-N", "MC-t"]})
+                return time.perf_counter() - t, r["latency_ms"], r["version"], time.perf_counter()
+
+            # Single client: end-to-end latency of one query
+            seq = np.array([one(i)[0] for i in range(200)]) * 1e3
+            print("\n=== Single client, 200 requests ===")
+            print(f"latency ms: p50={np.percentile(seq, 50):.1f}  p99={np.percentile(seq, 99):.1f}")
+            assert np.percentile(seq, 50) < 50
+
+            # 32 concurrent clients (closed loop, so latency ~ clients / throughput)
+            def clients(n, reload=None):
+                with ThreadPoolExecutor(max_workers=33) as ex:
+                    t0 = time.perf_counter()
+                    rel = ex.submit(reload) if reload else None
+                    out = list(ex.map(one, range(n)))
+                    wall = time.perf_counter() - t0
+                    return out, wall, rel.result() if rel else None
+
+            def report(title, out, wall):
+                lat = np.array([o[0] for o in out]) * 1e3
+                server = np.array([o[1] for o in out])
+                print(f"\n=== {title}: {len(out)} requests, 32 clients, {wall:.2f}s ({len(out) / wall:.0f} req/s) ===")
+                print(f"latency ms: p50={np.percentile(lat, 50):.1f}  p95={np.percentile(lat, 95):.1f}  "
+                      f"p99={np.percentile(lat, 99):.1f}  max={lat.max():.1f}")
+                print(f"server-side ms: p50={np.percentile(server, 50):.1f}  p99={np.percentile(server, 99):.1f}")
+                return lat
+
+            # Steady state (~50 ms p50, ~140 ms p99 measured on one core)
+            lat = report("Steady state", *clients(n_req)[:2])
+            assert np.percentile(lat, 50) < 150 and np.percentile(lat, 99) < 300
+
+            # Hot reload halfway. The load runs in a spawned, niced process (load_in_process=True),
+            # so queries keep being answered from the old state until the swap; latency during the
+            # load depends on the machine's spare cores and is reported, not asserted
+            window = {}
+
+            def reload_later():
+                time.sleep(0.5)
+                svc.loader = PriceLoader(cfg, source=source, end="2023-12-31")  # six more months of closes
+                window["start"] = time.perf_counter()
+                res = post(svc.url + "/reload", {})
+                window["end"] = time.perf_counter()
+                return res
+
+            out, wall, reloaded = clients(n_req, reload=reload_later)
+            lat = report("With reload", out, wall)
+            versions = pd.Series([o[2] for o in out]).value_counts().sort_index()
+            health = json.loads(urlopen(svc.url + "/health").read())
+            print("answers per state version:", versions.to_dict())
+            print("reload:", reloaded)
+            print("stats:", health["stats"], "| portfolios per batch:",
+                  round(health["stats"]["portfolios"] / health["stats"]["batches"], 1))
+            done = np.array([o[3] for o in out])
+            during = (done > window["start"]) & (done < window["end"])
+            print(f"answered while the reload ran: {during.sum()}")
+            assert during.sum() > 0 and {o[2] for o, d in zip(out, during) if d} == {1}
+            assert reloaded["version"] == 2 and reloaded["as_of"] > state.summary()["as_of"]
+            assert health["stats"]["errors"] == len(bad_alphas)
+
+
+if __name__ == "__main__":  # the reload runs in a spawned process
+    main()
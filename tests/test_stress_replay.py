@@ -0,0 +1,40 @@
+import os
+
+from src.config import NIFTY50_TICKERS
+from src.data import download_price_data
+from src.returns import compute_log_returns, clean_returns
+from src.covariance import ledoit_wolf_covariance
+from src.portfolio import min_variance_weights
+from src.var_models import portfolio_returns
+from src.stress_replay import ReplayEngine
+
+prices = download_price_data(NIFTY50_TICKERS, "2016-01-01", "2023-12-31")
+prices = prices.dropna(axis=1, how="all")
+rets = clean_returns(compute_log_returns(prices), max_nan_frac=0.05)
+
+rets_est = rets.tail(504)
+Sigma = ledoit_wolf_covariance(rets_est)
+w = min_variance_weights(Sigma, tickers=list(rets_est.columns), weight_cap=0.05)
+rp = portfolio_returns(rets, w)
+
+alpha = 0.99
+
+# Build cumulative-sum structure once; every start date x horizon (1-60d) is then a slice
+engine = ReplayEngine(rp, max_horizon=60)
+
+summary = engine.summary(alpha=alpha)
+print("\n=== Worst loss / drawdown / in-window HS VaR-ES by horizon ===")
+print(summary.loc[[1, 5, 10, 20, 40, 60]])
+
+for h in [1, 10, 20]:
+    print(f"\n=== Worst 5 non-overlapping {h}D windows ===")
+    print(engine.worst_windows(horizon_days=h, k=5))
+
+loss_10d = engine.surface(engine.cumulative_loss(), horizons=range(1, 61))[10]
+print("\nCOVID-window 10D losses by start date:")
+print(loss_10d.loc["2020-02-15":"2020-03-31"].sort_values(ascending=False).head())
+
+os.makedirs("outputs", exist_ok=True)
+summary.to_csv("outputs/stress_replay_by_horizon.csv")
+engine.worst_windows(horizon_days=10, k=10).to_csv("outputs/stress_worst_10d_nonoverlap.csv", index=False)
+print("\nSaved: outputs/stress_replay_by_horizon.csv, outputs/stress_worst_10d_nonoverlap.csv")
@@ -0,0 +1,52 @@
+from src.config import NIFTY50_TICKERS
+from src.data import download_price_data
+from src.returns import compute_log_returns, clean_returns
+from src.covariance import ledoit_wolf_covariance
+from src.portfolio import min_variance_weights
+from src.var_models import portfolio_returns
+from src.backtesting import rolling_historical_var
+from src.stress import hs_var_es
+from src.stressed_window import sliding_hs_var_es, stressed_window_search
+from src.traffic_light import basel_capital_charge
+import numpy as np
+
+prices = download_price_data(NIFTY50_TICKERS, "2016-01-01", "2023-12-31")
+prices = prices.dropna(axis=1, how="all")
+rets = clean_returns(compute_log_returns(prices), max_nan_frac=0.05)
+
+rets_est = rets.tail(504)
+Sigma = ledoit_wolf_covariance(rets_est)
+w = min_variance_weights(Sigma, tickers=list(rets_est.columns), weight_cap=0.05)
+rp = portfolio_returns(rets, w)
+
+# Full scan of every 250-day window (FRTB ES at 97.5%)
+res = stressed_window_search(rets, w, alpha=0.975, window=250, metric="ES")
+print("\n=== Stressed window (full factor set) ===")
+print("Window:", res.start.date(), "->", res.end.date())
+print("Stressed VaR:", res.stressed_var, "Stressed ES:", res.stressed_es)
+print(res.ranked.head(10))
+
+# Every window agrees with a direct HS VaR/ES on that slice
+sw = sliding_hs_var_es(rp, alpha=0.975, window=250)
+for i in range(0, len(sw), 97):
+    v, e = hs_var_es(rp.dropna().iloc[i:i + 250], alpha=0.975)
+    assert v == sw["VaR"].iloc[i] and e == sw["ES"].iloc[i], i
+
+# Reduced factor set: 10 largest positions, scaled by ES_F,C / ES_R,C
+reduced = list(w.sort_values(ascending=False).head(10).index)
+res_r = stressed_window_search(rets, w, alpha=0.975, window=250, metric="ES", reduced_factors=reduced)
+print("\n=== Stressed window (reduced set, 10 names) ===")
+print("Window:", res_r.start.date(), "->", res_r.end.date(), "ratio:", round(res_r.ratio, 3))
+print("Stressed ES:", res_r.stressed_es)
+
+# Feed the capital calculation (99% 1-day VaR / sVaR scaled to 10 days)
+res_99 = stressed_window_search(rets, w, alpha=0.99, window=250, metric="VaR")
+var_hs = rolling_historical_var(rp, alpha=0.99, window=250).dropna()
+cap = basel_capital_charge(
+    var_latest=float(var_hs.iloc[-1]) * np.sqrt(10),
+    var_avg_60d=float(var_hs.tail(60).mean()) * np.sqrt(10),
+    svar_latest=res_99.stressed_var * np.sqrt(10),
+    svar_avg_60d=res_99.stressed_var * np.sqrt(10),
+    multiplier_m=3.0,
+)
+print("\nBasel 2.5 capital charge (VaR + sVaR, 10D):", cap)
@@ -0,0 +1,88 @@
+import time
+
+import numpy as np
+
+from src.config import NIFTY50_TICKERS
+from src.data import download_price_data
+from src.returns import compute_log_returns, clean_returns
+from src.covariance import ledoit_wolf_covariance
+from src.portfolio import min_variance_weights
+from src.var_models import portfolio_returns, var_historical
+from src.es_models import es_historical
+from src.monte_carlo import mc_scenarios_student_t
+from src.tail_stats import ScenarioMatrix, series_var_es, sliding_var_es, tail_var_es
+
+prices = download_price_data(NIFTY50_TICKERS, "2016-01-01", "2023-12-31")
+prices = prices.dropna(axis=1, how="all")
+rets = clean_returns(compute_log_returns(prices), max_nan_frac=0.05)
+
+rets_est = rets.tail(504)
+Sigma = ledoit_wolf_covariance(rets_est)
+w = min_variance_weights(Sigma, tickers=list(rets_est.columns), weight_cap=0.05)
+rp = portfolio_returns(rets, w)
+
+alphas = [0.95, 0.975, 0.99]
+
+# One partition for all alphas vs pandas quantile + mask per alpha
+var, es = series_var_es(rp, alphas)
+for k, a in enumerate(alphas):
+    q = rp.quantile(1 - a)
+    assert var[k] == -q, (a, var[k], -q)
+    assert abs(es[k] + rp[rp <= q].mean()) < 1e-14
+    assert var[k] == var_historical(rp, a) and abs(es[k] - es_historical(rp, a)) < 1e-14
+print("\nHS VaR/ES:", {a: (round(float(v), 6), round(float(e), 6)) for a, v, e in zip(alphas, var, es)})
+
+n_rep = 200
+t0 = time.perf_counter()
+for _ in range(n_rep):
+    for a in alphas:
+        q = rp.quantile(1 - a)
+        -rp[rp <= q].mean()
+t1 = time.perf_counter()
+for _ in range(n_rep):
+    series_var_es(rp, alphas)
+t2 = time.perf_counter()
+print(f"3 alphas, {len(rp)} days: pandas {(t1 - t0) / n_rep * 1e6:.0f}us, kernel {(t2 - t1) / n_rep * 1e6:.0f}us")
+
+# Sliding windows vs explicit per-window quantile
+x = rp.values
+v_win, e_win = sliding_var_es(x, 0.99, window=250)
+for i in (0, 500, len(x) - 250):
+    seg = x[i:i + 250]
+    q = np.quantile(seg, 1 - 0.99)
+    assert v_win[i] == -q and abs(e_win[i] + seg[seg <= q].mean()) < 1e-14
+
+# Ties: the prefix mean must fall back to the full comparison
+P = np.round(np.random.default_rng(0).standard_normal((50, 1000)), 1)
+v, e = tail_var_es(P, 0.99, axis=1)
+q = np.quantile(P, 1 - 0.99, axis=1)
+ref = np.array([row[row <= qi].mean() for row, qi in zip(P, q)])
+assert np.array_equal(v, -q) and np.allclose(e, -ref, rtol=0, atol=1e-14)
+
+# Cached asset-level scenario matrix: many weight vectors over one MC-t set
+scen = mc_scenarios_student_t(rets_est, df=6, n_sims=50_000)
+sm = ScenarioMatrix.from_frame(scen)
+rng = np.random.default_rng(1)
+W = rng.dirichlet(np.ones(len(sm.tickers)), 500)
+
+t0 = time.perf_counter()
+ref = np.array([tail_var_es(scen.values @ wi, 0.99) for wi in W])
+t1 = time.perf_counter()
+bv, be = sm.var_es_batch(W, 0.99)
+t2 = time.perf_counter()
+assert np.allclose(bv, ref[:, 0], rtol=1e-12) and np.allclose(be, ref[:, 1], rtol=1e-12)
+print(f"500 portfolios x 50k scenarios: loop {t1 - t0:.2f}s, batch {t2 - t1:.2f}s")
+
+v1 = sm.var_es(w, alphas)
+t0 = time.perf_counter()
+v2 = sm.var_es(w, alphas)  # cached P&L: one partition only
+print(f"MC-t VaR/ES (3 alphas), cached weights: {(time.perf_counter() - t0) * 1e3:.2f}ms")
+assert np.array_equal(v1[0], v2[0]) and np.array_equal(v1[1], v2[1])
+
+# alpha outside (0, 1) is rejected rather than returning a meaningless quantile
+for bad in (0.0, 1.0, 1.5, -0.2):
+    try:
+        tail_var_es(rng.standard_normal(1000), bad)
+        raise AssertionError(f"alpha={bad} accepted")
+    except ValueError:
+        pass